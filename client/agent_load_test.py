@@ -0,0 +1,648 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""UE CMS 서버 부하 테스트 도구
+
+client_tray.py(UECMSTrayClient)와 같은 Socket.IO 프로토콜을 쓰는 가상 에이전트 N개를 띄우고
+REST API로 프리셋 실행/정지를 반복해 서버의 전송 성능을 측정합니다.
+
+- 에이전트: register_client, 하트비트(바이너리 hb 또는 JSON heartbeat), process_status,
+  execution_result, stop_command_completed, connection_check_response
+- 측정: 노드 간 전송 편차(dispatch skew), 이벤트 지연 백분위, DB 쓰기 속도, 서버 CPU/메모리
+- 결과는 JSON으로 출력합니다 (stdout 또는 --output). 진행 상황은 stderr로 출력합니다.
+
+가상 에이전트는 IP로 식별되므로 실제 노드와 겹치지 않는 대역(--ip-prefix)을 사용하며,
+테스트가 끝나면 만든 프리셋/그룹/클라이언트를 삭제합니다 (--keep으로 유지 가능).
+
+사용 예:
+    python agent_load_test.py --server http://127.0.0.1:8000 --agents 200 --runs 10
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import statistics
+import struct
+import sys
+import time
+import zlib
+from collections import Counter
+from datetime import datetime
+
+import aiohttp
+import socketio
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# client_tray.py와 같은 바이너리 하트비트 프레임 (서버 utils/heartbeatCodec.js)
+HEARTBEAT_FORMAT = '>BBIII'
+HEARTBEAT_VERSION = 1
+HEARTBEAT_FLAG_RUNNING = 0x01
+
+PROCESS_NAME = 'LoadTestProcess.exe'
+
+
+def log(message):
+    """진행 상황 출력 (JSON 결과와 섞이지 않도록 stderr 사용)"""
+    print(message, file=sys.stderr, flush=True)
+
+
+def summarize(values):
+    """지연/편차 값 목록의 요약 통계 (밀리초)"""
+    if not values:
+        return {'count': 0}
+    ordered = sorted(values)
+
+    def percentile(p):
+        # nearest-rank
+        index = max(0, min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1))
+        return round(ordered[index], 3)
+
+    return {
+        'count': len(ordered),
+        'min': round(ordered[0], 3),
+        'mean': round(statistics.fmean(ordered), 3),
+        'p50': percentile(50),
+        'p90': percentile(90),
+        'p99': percentile(99),
+        'max': round(ordered[-1], 3)
+    }
+
+
+class Dispatch:
+    """REST 요청 한 번(실행 또는 정지)에 대한 에이전트별 수신 기록"""
+
+    def __init__(self, kind, run, expected):
+        self.kind = kind
+        self.run = run
+        self.expected = expected
+        self.sent_at = None
+        self.rest_ms = None
+        self.rest_status = None
+        self.received = {}
+        self.duplicates = 0
+        self.done = asyncio.Event()
+
+    def record(self, agent_name, at):
+        if agent_name in self.received:
+            self.duplicates += 1
+            return
+        self.received[agent_name] = at
+        if len(self.received) >= self.expected:
+            self.done.set()
+
+    def result(self):
+        times = sorted(self.received.values())
+        latencies = [(t - self.sent_at) * 1000 for t in times] if self.sent_at else []
+        return {
+            'run': self.run,
+            'restStatus': self.rest_status,
+            'restMs': round(self.rest_ms, 3) if self.rest_ms is not None else None,
+            'received': len(times),
+            'missing': self.expected - len(times),
+            'duplicates': self.duplicates,
+            'skewMs': round((times[-1] - times[0]) * 1000, 3) if times else None,
+            'latencies': latencies
+        }
+
+
+class SimulatedAgent:
+    """UECMSTrayClient의 Socket.IO 동작을 흉내 내는 가상 에이전트 (실제 프로세스는 실행하지 않음)"""
+
+    def __init__(self, harness, index):
+        self.harness = harness
+        self.index = index
+        self.client_name = f"{harness.args.name_prefix}-{index + 1:04d}"
+        prefix = harness.args.ip_prefix
+        self.ip_address = f"{prefix}.{index // 250}.{index % 250 + 1}"
+        self.client_id = None
+        self.heartbeat_protocol = 'json'
+        self.heartbeat_seq = 0
+        self.sent_process_digest = None
+        self.running_processes = []
+        self.registered = asyncio.Event()
+        self.register_sent_at = None
+        self.heartbeat_task = None
+
+        self.sio = socketio.AsyncClient(reconnection=False)
+        self.sio.on('connect', self.on_connect)
+        self.sio.on('disconnect', self.on_disconnect)
+        self.sio.on('registration_success', self.on_registration_success)
+        self.sio.on('registration_failed', self.on_registration_failed)
+        self.sio.on('execute_command', self.on_execute_command)
+        self.sio.on('stop_command', self.on_stop_command)
+        self.sio.on('connection_check', self.on_connection_check)
+        self.sio.on('process_status_request', self.on_process_status_request)
+
+    async def emit(self, event, data):
+        self.harness.sent[event] += 1
+        await self.sio.emit(event, data)
+
+    async def connect(self, server_url):
+        try:
+            await self.sio.connect(server_url, transports=['websocket'])
+        except Exception as e:
+            self.harness.errors[f"connect: {e}"] += 1
+            self.registered.set()
+
+    async def disconnect(self):
+        if self.heartbeat_task:
+            self.heartbeat_task.cancel()
+        if self.sio.connected:
+            await self.sio.disconnect()
+
+    async def on_connect(self):
+        self.register_sent_at = time.perf_counter()
+        await self.emit('register_client', {
+            'name': self.client_name,
+            'clientType': 'python',
+            'ip_address': self.ip_address
+        })
+
+    async def on_disconnect(self):
+        self.harness.received['disconnect'] += 1
+
+    async def on_registration_success(self, data):
+        data = data or {}
+        self.harness.received['registration_success'] += 1
+        if self.register_sent_at is not None:
+            self.harness.register_latencies.append((time.perf_counter() - self.register_sent_at) * 1000)
+
+        self.client_id = data.get('clientId', self.client_id)
+        heartbeat = data.get('heartbeat') or {}
+        use_binary = (not self.harness.args.json_heartbeat
+                      and heartbeat.get('protocol') == 'binary'
+                      and heartbeat.get('version') == HEARTBEAT_VERSION)
+        self.heartbeat_protocol = 'binary' if use_binary and self.client_id is not None else 'json'
+        self.sent_process_digest = None
+        self.registered.set()
+
+        if not self.heartbeat_task:
+            self.heartbeat_task = asyncio.create_task(self.heartbeat_loop())
+
+    async def on_registration_failed(self, data):
+        self.harness.received['registration_failed'] += 1
+        self.harness.errors[f"registration_failed: {(data or {}).get('reason')}"] += 1
+        self.registered.set()
+
+    def process_digest(self, processes):
+        return zlib.crc32('\n'.join(sorted(processes)).encode('utf-8')) & 0xffffffff
+
+    async def send_process_status(self):
+        processes = sorted(self.running_processes)
+        digest = self.process_digest(processes)
+        await self.emit('process_status', {
+            'clientName': self.client_name,
+            'processes': processes,
+            'running_process_count': len(processes),
+            'running_processes': processes,
+            'digest': digest,
+            'timestamp': datetime.now().isoformat()
+        })
+        self.sent_process_digest = digest
+
+    async def send_heartbeat(self):
+        if self.heartbeat_protocol == 'binary':
+            # 프로세스 목록이 바뀌었으면 전체 상태를 먼저 전송 (client_tray.py와 동일)
+            digest = self.process_digest(self.running_processes)
+            if digest != self.sent_process_digest:
+                await self.send_process_status()
+            self.heartbeat_seq = (self.heartbeat_seq + 1) & 0xffffffff
+            flags = HEARTBEAT_FLAG_RUNNING if self.running_processes else 0
+            await self.emit('hb', struct.pack(HEARTBEAT_FORMAT, HEARTBEAT_VERSION, flags,
+                                              self.client_id, self.heartbeat_seq, digest))
+        else:
+            await self.emit('heartbeat', {
+                'clientName': self.client_name,
+                'ip_address': self.ip_address,
+                'timestamp': datetime.now().isoformat()
+            })
+
+    async def heartbeat_loop(self):
+        interval = self.harness.args.heartbeat_interval
+        # 모든 에이전트가 같은 순간에 보내지 않도록 시작 시점을 분산
+        await asyncio.sleep(random.uniform(0, interval))
+        while self.sio.connected:
+            try:
+                await self.send_heartbeat()
+            except Exception as e:
+                self.harness.errors[f"heartbeat: {e}"] += 1
+            await asyncio.sleep(interval)
+
+    def is_target(self, data):
+        client_name = data.get('client_name', '') or data.get('clientName', '')
+        return not client_name or client_name.upper() == self.client_name.upper()
+
+    async def on_execute_command(self, data):
+        received_at = time.perf_counter()
+        data = data or {}
+        self.harness.received['execute_command'] += 1
+        if not self.is_target(data):
+            self.harness.errors['execute_command: 이름 불일치'] += 1
+            return
+        self.harness.record('execute', self.client_name, received_at)
+
+        if self.harness.args.exec_delay > 0:
+            await asyncio.sleep(self.harness.args.exec_delay / 1000)
+        self.running_processes = [PROCESS_NAME]
+        await self.emit('client_status_update', {
+            'clientName': self.client_name,
+            'status': 'running',
+            'timestamp': datetime.now().isoformat()
+        })
+        await self.emit('execution_result', {
+            'clientName': self.client_name,
+            'presetId': data.get('presetId'),
+            'command': data.get('command', ''),
+            'commandId': data.get('commandId'),
+            'result': {
+                'success': True,
+                'pid': 10000 + self.index,
+                'process_name': PROCESS_NAME,
+                'timestamp': datetime.now().isoformat()
+            },
+            'timestamp': datetime.now().isoformat()
+        })
+
+    async def on_stop_command(self, data):
+        received_at = time.perf_counter()
+        data = data or {}
+        self.harness.received['stop_command'] += 1
+        if not self.is_target(data):
+            self.harness.errors['stop_command: 이름 불일치'] += 1
+            return
+        self.harness.record('stop', self.client_name, received_at)
+
+        self.running_processes = []
+        await self.emit('client_status_update', {
+            'clientName': self.client_name,
+            'status': 'online',
+            'timestamp': datetime.now().isoformat()
+        })
+        await self.emit('stop_command_completed', {
+            'clientName': self.client_name,
+            'commandId': data.get('commandId'),
+            'timestamp': datetime.now().isoformat()
+        })
+
+    async def on_connection_check(self, data):
+        data = data or {}
+        self.harness.received['connection_check'] += 1
+        if not self.is_target(data):
+            return
+        await self.emit('connection_check_response', {
+            'clientName': self.client_name,
+            'status': 'online',
+            'timestamp': datetime.now().isoformat()
+        })
+
+    async def on_process_status_request(self, data):
+        self.harness.received['process_status_request'] += 1
+        await self.send_process_status()
+
+
+class ServerSampler:
+    """서버 프로세스 CPU/메모리 샘플링 (--server-pid, psutil 필요)"""
+
+    def __init__(self, pid, interval=1.0):
+        self.process = psutil.Process(pid)
+        self.interval = interval
+        self.cpu = []
+        self.rss = []
+        self.task = None
+
+    def start(self):
+        self.process.cpu_percent(None)
+        self.task = asyncio.create_task(self.loop())
+
+    async def loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.cpu.append(self.process.cpu_percent(None))
+                self.rss.append(self.process.memory_info().rss / (1024 * 1024))
+            except psutil.Error:
+                return
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+
+    def result(self):
+        return {
+            'source': 'psutil',
+            'samples': len(self.cpu),
+            'cpuPercent': summarize(self.cpu),
+            'rssMb': summarize(self.rss)
+        }
+
+
+class LoadTest:
+    def __init__(self, args):
+        self.args = args
+        self.server_url = args.server.rstrip('/')
+        self.agents = []
+        self.sent = Counter()
+        self.received = Counter()
+        self.errors = Counter()
+        self.register_latencies = []
+        self.loop_lag = []
+        self.dispatches = {'execute': [], 'stop': []}
+        self.current = {}
+        self.created = {'clientIds': [], 'groupId': None, 'presetId': None}
+
+    def record(self, kind, agent_name, received_at):
+        dispatch = self.current.get(kind)
+        if dispatch is None:
+            self.errors[f"{kind}: 요청 없이 수신"] += 1
+            return
+        dispatch.record(agent_name, received_at)
+
+    async def api(self, session, method, path, body=None):
+        async with session.request(method, f"{self.server_url}/api{path}", json=body) as response:
+            try:
+                data = await response.json(content_type=None)
+            except (json.JSONDecodeError, aiohttp.ContentTypeError):
+                data = None
+            return response.status, data
+
+    async def measure_loop_lag(self):
+        """부하 도구 자신의 이벤트 루프 지연 (크면 측정된 편차에 도구 지연이 섞임)"""
+        interval = 0.1
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(interval)
+            self.loop_lag.append(max(0.0, (time.perf_counter() - started - interval) * 1000))
+
+    async def connect_agents(self):
+        self.agents = [SimulatedAgent(self, i) for i in range(self.args.agents)]
+        log(f"🔌 가상 에이전트 {len(self.agents)}개 연결 중 (초당 {self.args.connect_rate}개)")
+
+        tasks = []
+        delay = 1 / self.args.connect_rate if self.args.connect_rate > 0 else 0
+        for agent in self.agents:
+            tasks.append(asyncio.create_task(agent.connect(self.server_url)))
+            if delay:
+                await asyncio.sleep(delay)
+        await asyncio.gather(*tasks)
+
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(agent.registered.wait() for agent in self.agents)),
+                timeout=self.args.timeout
+            )
+        except asyncio.TimeoutError:
+            pass
+
+        registered = [agent for agent in self.agents if agent.client_id is not None]
+        log(f"✅ 등록 완료: {len(registered)}/{len(self.agents)}")
+        return registered
+
+    async def create_preset(self, session, agents):
+        ids = [agent.client_id for agent in agents]
+        self.created['clientIds'] = ids
+        stamp = datetime.now().strftime('%Y%m%d%H%M%S')
+
+        status, group = await self.api(session, 'POST', '/groups', {
+            'name': f"{self.args.name_prefix}-GROUP-{stamp}",
+            'description': '부하 테스트용 그룹',
+            'client_ids': ids
+        })
+        if status != 201 or not group:
+            raise RuntimeError(f"그룹 생성 실패: {status} {group}")
+        self.created['groupId'] = group['id']
+
+        status, preset = await self.api(session, 'POST', '/presets', {
+            'name': f"{self.args.name_prefix}-PRESET-{stamp}",
+            'description': '부하 테스트용 프리셋',
+            'target_group_id': group['id'],
+            'client_commands': {str(agent.client_id): f"{PROCESS_NAME} -loadtest -node={agent.index}" for agent in agents}
+        })
+        if status != 201 or not preset:
+            raise RuntimeError(f"프리셋 생성 실패: {status} {preset}")
+        self.created['presetId'] = preset['id']
+        log(f"📋 그룹 {group['id']} / 프리셋 {preset['id']} 생성 (대상 {len(ids)}개)")
+
+    async def dispatch(self, session, kind, run, expected):
+        dispatch = Dispatch(kind, run, expected)
+        self.current[kind] = dispatch
+        self.dispatches[kind].append(dispatch)
+
+        dispatch.sent_at = time.perf_counter()
+        status, _ = await self.api(session, 'POST', f"/presets/{self.created['presetId']}/{kind}")
+        dispatch.rest_ms = (time.perf_counter() - dispatch.sent_at) * 1000
+        dispatch.rest_status = status
+
+        try:
+            await asyncio.wait_for(dispatch.done.wait(), timeout=self.args.timeout)
+        except asyncio.TimeoutError:
+            pass
+        # 늦게 온 중복 수신도 세기 위해 잠시 유지한 뒤 해제
+        await asyncio.sleep(0.2)
+        self.current.pop(kind, None)
+
+        result = dispatch.result()
+        log(f"  {'▶️' if kind == 'execute' else '⏹️'} {kind} #{run}: HTTP {status}, "
+            f"수신 {result['received']}/{expected}, 편차 {result['skewMs']}ms")
+        return result
+
+    async def cleanup(self, session):
+        for agent in self.agents:
+            await agent.disconnect()
+        if self.args.keep:
+            log("ℹ️ --keep: 테스트 데이터를 유지합니다")
+            return
+
+        if self.created['presetId']:
+            await self.api(session, 'DELETE', f"/presets/{self.created['presetId']}")
+        if self.created['groupId']:
+            await self.api(session, 'DELETE', f"/groups/{self.created['groupId']}")
+        for client_id in self.created['clientIds']:
+            await self.api(session, 'DELETE', f"/clients/{client_id}")
+        log("🧹 테스트 프리셋/그룹/클라이언트 삭제 완료")
+
+    async def server_stats(self, session):
+        _, health = await self.api(session, 'GET', '/health')
+        _, db_health = await self.api(session, 'GET', '/health/db')
+        return {
+            'at': time.perf_counter(),
+            'process': (health or {}).get('process'),
+            'db': db_health or {}
+        }
+
+    def db_result(self, before, after):
+        elapsed = after['at'] - before['at']
+        first = before['db'].get('connections') or {}
+        last = after['db'].get('connections') or {}
+
+        def rate(key):
+            if key not in first or key not in last or elapsed <= 0:
+                return None
+            return round((last[key] - first[key]) / elapsed, 3)
+
+        statements = (after['db'].get('statements') or {}).get('total') or {}
+        return {
+            'durationSec': round(elapsed, 3),
+            'driver': last.get('driver'),
+            'writes': last.get('writes', 0) - first.get('writes', 0) if last else None,
+            'writesPerSec': rate('writes'),
+            'readsPerSec': rate('reads'),
+            'transactionsPerSec': rate('transactions'),
+            'rollbacks': last.get('rollbacks', 0) - first.get('rollbacks', 0) if last else None,
+            'statementHitRate': statements.get('hitRate')
+        }
+
+    def process_result(self, before, after):
+        """/api/health의 process 항목(cpuUsage 누적값)으로 평균 CPU 사용률 계산"""
+        first, last = before.get('process'), after.get('process')
+        if not first or not last:
+            return None
+        elapsed = after['at'] - before['at']
+        cpu_micros = (last['cpuUsage']['user'] + last['cpuUsage']['system']
+                      - first['cpuUsage']['user'] - first['cpuUsage']['system'])
+        return {
+            'source': 'api/health',
+            'cpuPercent': round(cpu_micros / 1e6 / elapsed * 100, 2) if elapsed > 0 else None,
+            'rssMb': round(last['memoryUsage']['rss'] / (1024 * 1024), 2),
+            'heapUsedMb': round(last['memoryUsage']['heapUsed'] / (1024 * 1024), 2),
+            'rssGrowthMb': round((last['memoryUsage']['rss'] - first['memoryUsage']['rss']) / (1024 * 1024), 2)
+        }
+
+    def dispatch_summary(self, results):
+        return {
+            'runs': len(results),
+            'restMs': summarize([r['restMs'] for r in results if r['restMs'] is not None]),
+            'eventLatencyMs': summarize([latency for r in results for latency in r['latencies']]),
+            'dispatchSkewMs': summarize([r['skewMs'] for r in results if r['skewMs'] is not None]),
+            'missing': sum(r['missing'] for r in results),
+            'duplicates': sum(r['duplicates'] for r in results),
+            'perRun': [{k: v for k, v in r.items() if k != 'latencies'} for r in results]
+        }
+
+    async def run(self):
+        started_at = datetime.now().isoformat()
+        lag_task = asyncio.create_task(self.measure_loop_lag())
+        sampler = None
+        if self.args.server_pid:
+            if PSUTIL_AVAILABLE:
+                sampler = ServerSampler(self.args.server_pid)
+                sampler.start()
+            else:
+                log("⚠️ psutil을 사용할 수 없어 --server-pid 샘플링을 건너뜁니다")
+
+        execute_results, stop_results = [], []
+        timeout = aiohttp.ClientTimeout(total=self.args.timeout)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            before = await self.server_stats(session)
+            try:
+                registered = await self.connect_agents()
+                if registered:
+                    await self.create_preset(session, registered)
+                    for run in range(1, self.args.runs + 1):
+                        execute_results.append(await self.dispatch(session, 'execute', run, len(registered)))
+                        await asyncio.sleep(self.args.hold)
+                        stop_results.append(await self.dispatch(session, 'stop', run, len(registered)))
+                        await asyncio.sleep(self.args.pause)
+            except Exception as e:
+                self.errors[f"run: {e}"] += 1
+                log(f"❌ 부하 테스트 중 오류: {e}")
+            finally:
+                after = await self.server_stats(session)
+                await self.cleanup(session)
+
+        lag_task.cancel()
+        if sampler:
+            await sampler.stop()
+
+        server = {'health': self.process_result(before, after)}
+        if sampler:
+            server['sampled'] = sampler.result()
+
+        return {
+            'startedAt': started_at,
+            'config': {
+                'server': self.server_url,
+                'agents': self.args.agents,
+                'runs': self.args.runs,
+                'hold': self.args.hold,
+                'heartbeatInterval': self.args.heartbeat_interval,
+                'heartbeatProtocol': 'json' if self.args.json_heartbeat else 'binary'
+            },
+            'connect': {
+                'agents': len(self.agents),
+                'registered': len([a for a in self.agents if a.client_id is not None]),
+                'registerLatencyMs': summarize(self.register_latencies)
+            },
+            'execute': self.dispatch_summary(execute_results),
+            'stop': self.dispatch_summary(stop_results),
+            'events': {'sent': dict(self.sent), 'received': dict(self.received)},
+            'db': self.db_result(before, after),
+            'server': server,
+            'harness': {'loopLagMs': summarize(self.loop_lag)},
+            'errors': dict(self.errors)
+        }
+
+
+def check_thresholds(report, args):
+    """회귀 판정 - 실패 사유 목록 (비어 있으면 통과)"""
+    failures = []
+    if report['connect']['registered'] < report['connect']['agents']:
+        failures.append(f"등록 실패 {report['connect']['agents'] - report['connect']['registered']}개")
+    for kind in ('execute', 'stop'):
+        if report[kind]['missing'] > 0:
+            failures.append(f"{kind} 미수신 {report[kind]['missing']}건")
+        if report[kind]['duplicates'] > 0:
+            failures.append(f"{kind} 중복 수신 {report[kind]['duplicates']}건")
+    skew = report['execute']['dispatchSkewMs'].get('p99')
+    if args.max_skew_ms is not None and skew is not None and skew > args.max_skew_ms:
+        failures.append(f"execute 편차 p99 {skew}ms > {args.max_skew_ms}ms")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='UE CMS 서버 부하 테스트 (가상 client_tray 에이전트)')
+    parser.add_argument('--server', '-s', default='http://127.0.0.1:8000', help='서버 URL')
+    parser.add_argument('--agents', '-n', type=int, default=100, help='가상 에이전트 수 (기본값: 100)')
+    parser.add_argument('--runs', '-r', type=int, default=5, help='프리셋 실행/정지 반복 횟수 (기본값: 5)')
+    parser.add_argument('--hold', type=float, default=2.0, help='실행 후 정지까지 대기 시간(초)')
+    parser.add_argument('--pause', type=float, default=1.0, help='정지 후 다음 실행까지 대기 시간(초)')
+    parser.add_argument('--heartbeat-interval', type=float, default=5.0, help='하트비트 주기(초, client_tray.py와 동일한 5초)')
+    parser.add_argument('--json-heartbeat', action='store_true', help='바이너리 대신 JSON heartbeat 이벤트 사용')
+    parser.add_argument('--exec-delay', type=float, default=0, help='명령 수신 후 실행 결과 전송까지 지연(ms)')
+    parser.add_argument('--connect-rate', type=float, default=50, help='초당 연결할 에이전트 수 (0이면 한꺼번에)')
+    parser.add_argument('--timeout', type=float, default=30, help='등록/수신 대기 시간(초)')
+    parser.add_argument('--name-prefix', default='LOADTEST', help='가상 에이전트 이름 접두어')
+    parser.add_argument('--ip-prefix', default='10.250', help='가상 에이전트 IP 앞 두 자리 (x.y.0.1부터 할당)')
+    parser.add_argument('--server-pid', type=int, help='서버 프로세스 PID (psutil로 CPU/메모리 샘플링)')
+    parser.add_argument('--max-skew-ms', type=float, help='execute 편차 p99 허용값(ms), 넘으면 종료 코드 1')
+    parser.add_argument('--keep', action='store_true', help='테스트 후 프리셋/그룹/클라이언트를 삭제하지 않음')
+    parser.add_argument('--output', '-o', help='결과 JSON 파일 경로 (기본값: stdout)')
+    args = parser.parse_args()
+
+    if args.agents < 1 or args.agents > 250 * 256:
+        parser.error('--agents는 1 이상 64000 이하여야 합니다')
+
+    report = asyncio.run(LoadTest(args).run())
+    report['failures'] = check_thresholds(report, args)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        log(f"💾 결과 저장: {args.output}")
+    else:
+        print(output)
+
+    if report['failures']:
+        log(f"❌ 실패: {', '.join(report['failures'])}")
+        sys.exit(1)
+    log("✅ 부하 테스트 통과")
+
+
+if __name__ == '__main__':
+    main()
@@ -10,6 +10,9 @@ import subprocess
 import sys
 import os
 import threading
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, deque
 from datetime import datetime
 import logging
 import tkinter as tk
@@ -17,6 +20,8 @@ from tkinter import messagebox
 import queue
 import psutil
 import argparse
+import struct
+import zlib
 
 # pystray를 선택적으로 import
 try:
@@ -27,6 +32,30 @@ except ImportError:
     PYTRAY_AVAILABLE = False
     print("⚠️ pystray 모듈을 사용할 수 없습니다. 기본 모드로 실행됩니다.")
 
+# 바이너리 하트비트 프레임 (서버 utils/heartbeatCodec.js와 동일한 빅엔디안 14바이트 구조)
+# 버전(u8), 플래그(u8), client_id(u32), 시퀀스(u32), 프로세스 목록 digest(u32)
+HEARTBEAT_FORMAT = '>BBIII'
+HEARTBEAT_VERSION = 1
+HEARTBEAT_FLAG_RUNNING = 0x01
+
+# 서버 명령 ID(commandId) 중복 확인 기록 (개수 / 보관 시간(초))
+COMMAND_DEDUP_SIZE = 1024
+COMMAND_DEDUP_TTL = 600
+
+# 시계 동기화 (ping/pong 표본 수 / 연결 직후 연달아 모으는 표본 수)
+CLOCK_SYNC_SAMPLES = 8
+CLOCK_SYNC_BURST = 5
+# 예약 실행 시각 직전 이 시간(초)부터는 sleep 대신 바쁜 대기 (sleep 해상도 보정)
+LAUNCH_SPIN_WINDOW = 0.02
+
+# 실행한 프로세스의 준비 확인 (확인 간격 / 포트 연결 대기 / 기본 제한 시간, 초)
+READY_POLL_INTERVAL = 0.2
+READY_CONNECT_TIMEOUT = 0.2
+READY_DEFAULT_TIMEOUT = 120
+
+# 실행 직후 프로세스 트리를 다시 기록하는 시점(초) - 런처가 자식을 띄우고 바로 끝나도 자식을 놓치지 않도록
+TREE_CAPTURE_DELAYS = (0.1, 0.4, 1.5)
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -40,6 +69,301 @@ logging.basicConfig(
 print("=== client_tray.py 시작 ===")
 
 try:
+    class ProcessExitWatcher:
+        """실행한 프로세스의 종료를 폴링 없이 감지합니다.
+
+        Popen 핸들마다 대기 스레드 하나가 wait()에서 블로킹하다가 프로세스가 끝나는 즉시
+        콜백을 호출합니다. 실행 직후 몇 번은 짧게 기다리며 on_tick으로 프로세스 트리를 기록합니다.
+        셸/런처가 먼저 끝나고 자식이 남은 경우 watch_tree로 남은 프로세스의 종료를 기다립니다.
+        대기 스레드는 데몬이라 에이전트 종료를 막지 않습니다.
+        """
+
+        def __init__(self, on_exit, on_tick=None):
+            self.on_exit = on_exit
+            self.on_tick = on_tick
+            self.waiters = {}
+            self.lock = threading.Lock()
+
+        def watch(self, key, process):
+            """프로세스 종료 대기를 시작합니다."""
+            self._start(key, process.pid, self._wait, (key, process))
+
+        def watch_tree(self, key, pid, procs):
+            """루트(pid)가 끝난 뒤 남은 프로세스들(psutil.Process)이 모두 끝나면 on_exit(key, pid, None)을 호출합니다."""
+            self._start(key, pid, self._wait_tree, (key, pid, procs))
+
+        def _start(self, key, pid, target, args):
+            waiter = threading.Thread(
+                target=target,
+                args=args,
+                name=f'ue-cms-waiter-{pid}',
+                daemon=True
+            )
+            with self.lock:
+                self.waiters[pid] = waiter
+            waiter.start()
+
+        def _wait(self, key, process):
+            returncode = None
+            try:
+                for delay in TREE_CAPTURE_DELAYS:
+                    try:
+                        returncode = process.wait(timeout=delay)
+                        break
+                    except subprocess.TimeoutExpired:
+                        if self.on_tick:
+                            self.on_tick(key)
+                else:
+                    returncode = process.wait()
+            except Exception as e:
+                logging.error(f"프로세스 종료 대기 중 오류: {key} - {e}")
+            finally:
+                with self.lock:
+                    self.waiters.pop(process.pid, None)
+
+            self._notify(key, process.pid, returncode)
+
+        def _wait_tree(self, key, pid, procs):
+            try:
+                psutil.wait_procs(procs)
+            except Exception as e:
+                logging.error(f"프로세스 종료 대기 중 오류: {key} - {e}")
+            finally:
+                with self.lock:
+                    self.waiters.pop(pid, None)
+
+            self._notify(key, pid, None)
+
+        def _notify(self, key, pid, returncode):
+            try:
+                self.on_exit(key, pid, returncode)
+            except Exception as e:
+                logging.error(f"프로세스 종료 처리 중 오류: {key} - {e}")
+
+        def count(self):
+            """대기 중인 프로세스 수를 반환합니다."""
+            with self.lock:
+                return len(self.waiters)
+
+    class CommandDeduplicator:
+        """최근에 받은 서버 명령 ID를 기억해 같은 명령을 한 번만 실행합니다.
+
+        재연결 후 서버가 응답을 받지 못한 명령을 다시 보내면, 이미 실행한 명령은 실행하지 않고
+        기록해 둔 응답만 다시 보냅니다. 기록은 개수와 시간으로 제한됩니다.
+        """
+
+        def __init__(self, max_entries=COMMAND_DEDUP_SIZE, ttl=COMMAND_DEDUP_TTL):
+            self.max_entries = max_entries
+            self.ttl = ttl
+            self.entries = OrderedDict()  # command_id -> {'at': 수신 시각, 'reply': (event, data) 또는 None}
+            self.lock = threading.Lock()
+
+        def claim(self, command_id):
+            """처음 받은 명령이면 (True, None), 중복이면 (False, 기록된 응답 또는 None)을 반환합니다."""
+            now = time.monotonic()
+            with self.lock:
+                # 오래된 기록 정리 (OrderedDict는 수신 순서)
+                while self.entries:
+                    oldest_id, oldest = next(iter(self.entries.items()))
+                    if now - oldest['at'] <= self.ttl and len(self.entries) < self.max_entries:
+                        break
+                    del self.entries[oldest_id]
+
+                entry = self.entries.get(command_id)
+                if entry is not None:
+                    return False, entry['reply']
+                self.entries[command_id] = {'at': now, 'reply': None}
+                return True, None
+
+        def complete(self, command_id, event, data):
+            """명령 처리 응답을 기록합니다. (중복 수신 시 다시 전송)"""
+            with self.lock:
+                entry = self.entries.get(command_id)
+                if entry is not None:
+                    entry['reply'] = (event, data)
+
+    class ClockSync:
+        """ping/pong으로 서버 시계와의 차이를 추정하고 서버 시각 기준 예약 실행 시각까지 대기합니다.
+
+        에이전트 시계는 시작 시각 + perf_counter 경과 시간으로, 벽시계 조정에 영향을 받지 않고
+        해상도가 높습니다. 최근 표본 중 왕복 시간이 가장 짧은 표본의 시계 차이를 사용합니다. (NTP 방식)
+        """
+
+        def __init__(self, samples=CLOCK_SYNC_SAMPLES):
+            self.epoch_base = time.time()
+            self.perf_base = time.perf_counter()
+            self.samples = deque(maxlen=samples)  # (왕복 시간 ms, 시계 차이 ms)
+            self.lock = threading.Lock()
+
+        def now_ms(self):
+            """에이전트 시계의 현재 시각 (epoch 밀리초)"""
+            return (self.epoch_base + (time.perf_counter() - self.perf_base)) * 1000
+
+        def ping_payload(self):
+            """ping에 보낼 송신 시각(t0)과 현재 추정값 (서버가 기록)"""
+            estimate = self.estimate()
+            return {
+                't0': self.now_ms(),
+                'offset': estimate[0] if estimate else None,
+                'rtt': estimate[1] if estimate else None
+            }
+
+        def add_sample(self, data):
+            """pong(t0, t1, t2)으로 표본을 추가합니다. 이전 서버의 pong이면 None을 반환합니다."""
+            t3 = self.now_ms()
+            t0, t1, t2 = data.get('t0'), data.get('t1'), data.get('t2')
+            if t0 is None or t1 is None or t2 is None:
+                return None
+            rtt = (t3 - t0) - (t2 - t1)
+            offset = ((t1 - t0) + (t2 - t3)) / 2
+            with self.lock:
+                self.samples.append((rtt, offset))
+            return offset, rtt
+
+        def sample_count(self):
+            with self.lock:
+                return len(self.samples)
+
+        def estimate(self):
+            """(시계 차이 ms, 왕복 시간 ms) - 표본이 없으면 None"""
+            with self.lock:
+                if not self.samples:
+                    return None
+                rtt, offset = min(self.samples)
+            return offset, rtt
+
+        def wait_until(self, launch_at):
+            """서버 시각 launch_at(epoch 밀리초)까지 대기하고 실제 실행 시각(서버 시계 기준)을 반환합니다.
+
+            동기화 전이면 기다리지 않습니다. 이미 지난 시각이면 바로 반환하고 late로 표시합니다.
+            """
+            estimate = self.estimate()
+            if estimate is None:
+                return {'launchAt': launch_at, 'launchedAt': None, 'synced': False}
+            offset, rtt = estimate
+            
+            deadline = self.perf_base + ((launch_at - offset) / 1000 - self.epoch_base)
+            remaining = deadline - time.perf_counter()
+            if remaining > LAUNCH_SPIN_WINDOW:
+                time.sleep(remaining - LAUNCH_SPIN_WINDOW)
+            while time.perf_counter() < deadline:
+                pass
+            
+            launched_at = self.now_ms() + offset
+            return {
+                'launchAt': launch_at,
+                'launchedAt': launched_at,
+                'delayMs': launched_at - launch_at,
+                'clockRtt': rtt,
+                'late': remaining < 0
+            }
+
+    class ReadinessProbe:
+        """실행한 프로세스가 준비되었는지 확인합니다. (설정한 조건 중 하나라도 만족하면 준비)
+
+        - port: 해당 포트에 연결되면 준비 (host 생략 시 127.0.0.1)
+        - window: 실행한 프로세스 트리의 보이는 창 제목에 문자열이 포함되면 준비 (Windows)
+        - log + marker: 로그 파일에 실행 이후 marker가 기록되면 준비
+        """
+
+        def __init__(self, spec, timeout=None):
+            self.port = spec.get('port')
+            self.host = spec.get('host') or '127.0.0.1'
+            self.window = spec.get('window')
+            self.log_path = os.path.expandvars(spec['log']) if spec.get('log') else None
+            self.marker = spec.get('marker')
+            self.timeout = (timeout / 1000) if timeout else READY_DEFAULT_TIMEOUT
+            self.started_at = time.monotonic()
+            
+            # 이전 실행이 남긴 로그는 보지 않도록 실행 전 파일 끝에서 시작
+            self.log_offset = 0
+            self.log_tail = ''
+            if self.log_path and self.marker:
+                try:
+                    self.log_offset = os.path.getsize(self.log_path)
+                except OSError:
+                    self.log_offset = 0
+            
+            if self.window and sys.platform != 'win32':
+                logging.warning("창 제목 준비 확인은 Windows에서만 지원됩니다.")
+
+        def elapsed_ms(self):
+            return (time.monotonic() - self.started_at) * 1000
+
+        def expired(self):
+            return time.monotonic() - self.started_at > self.timeout
+
+        def check(self, pids=None):
+            """준비되었으면 확인 방법('port:7777' 등), 아니면 None을 반환합니다."""
+            if self.port and self.port_open():
+                return f'port:{self.port}'
+            if self.window and self.window_open(pids):
+                return 'window'
+            if self.log_path and self.marker and self.log_marker_found():
+                return 'log'
+            return None
+
+        def port_open(self):
+            try:
+                with socket.create_connection((self.host, int(self.port)), timeout=READY_CONNECT_TIMEOUT):
+                    return True
+            except OSError:
+                return False
+
+        def window_open(self, pids):
+            if sys.platform != 'win32':
+                return False
+            import ctypes
+            from ctypes import wintypes
+            
+            user32 = ctypes.windll.user32
+            title = self.window.lower()
+            found = []
+            
+            def callback(hwnd, lparam):
+                if not user32.IsWindowVisible(hwnd):
+                    return True
+                if pids is not None:
+                    pid = wintypes.DWORD()
+                    user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+                    if pid.value not in pids:
+                        return True
+                length = user32.GetWindowTextLengthW(hwnd)
+                buffer = ctypes.create_unicode_buffer(length + 1)
+                user32.GetWindowTextW(hwnd, buffer, length + 1)
+                if title in buffer.value.lower():
+                    found.append(hwnd)
+                    return False
+                return True
+            
+            enum_proc = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)(callback)
+            user32.EnumWindows(enum_proc, 0)
+            return bool(found)
+
+        def log_marker_found(self):
+            try:
+                size = os.path.getsize(self.log_path)
+            except OSError:
+                return False
+            # 로그가 새로 만들어졌거나 교체된 경우 처음부터
+            if size < self.log_offset:
+                self.log_offset = 0
+                self.log_tail = ''
+            if size == self.log_offset:
+                return False
+            
+            with open(self.log_path, 'r', encoding='utf-8', errors='replace') as f:
+                f.seek(self.log_offset)
+                chunk = f.read()
+                self.log_offset = f.tell()
+            
+            # 읽기 경계에 걸친 marker도 찾도록 이전 끝부분을 붙여 검색
+            text = self.log_tail + chunk
+            if self.marker in text:
+                return True
+            self.log_tail = text[-len(self.marker):]
+            return False
+
     class UECMSTrayClient:
         def __init__(self, server_url="http://localhost:8000"):
             # 기본 서버 URL 설정 (start()에서 config 파일 로드)
@@ -47,16 +371,25 @@ try:
             
             self.client_name = self.get_computer_name()
             self.client_id = None
-            self.sio = socketio.Client()
+            self.sio = self.create_socket_client()
+            
+            # 하트비트 프로토콜 (registration_success에서 서버가 binary를 안내하면 전환)
+            self.heartbeat_protocol = 'json'
+            self.heartbeat_seq = 0
+            self.sent_process_digest = None
+            self.heartbeat_thread = None
             self.running = False
             self.current_preset_id = None
+            self.command_dedup = CommandDeduplicator()
+            self.clock = ClockSync()
             
             # 실제 네트워크 IP 캐시
             self.cached_ip = None
             
             # 프로세스 모니터링을 위한 변수들
             self.running_processes = {}
-            self.process_monitor_thread = None
+            self.process_lock = threading.Lock()
+            self.process_watcher = ProcessExitWatcher(self.handle_process_exit, self.refresh_process_tree)
             
             # 트레이 아이콘 관련
             self.icon = None
@@ -70,17 +403,7 @@ try:
             
             # Socket.io 이벤트 핸들러 등록
             print("🔧 Socket.io 이벤트 핸들러 등록 중...")
-            self.sio.on('connect', self.on_connect)
-            self.sio.on('disconnect', self.on_disconnect)
-            self.sio.on('registration_failed', self.on_registration_failed)
-            self.sio.on('execute_command', self.on_execute_command)
-            self.sio.on('connection_check', self.on_connection_check)
-            self.sio.on('stop_command', self.on_stop_command)
-            self.sio.on('heartbeat_response', self.on_heartbeat_response)
-            self.sio.on('pong', self.on_pong)
-            
-            # 모든 이벤트를 받기 위한 범용 핸들러 추가
-            self.sio.on('*', self.on_any_event)
+            self.register_socket_handlers()
             print("✅ Socket.io 이벤트 핸들러 등록 완료")
             
             logging.info(f"UE CMS 클라이언트 초기화 완료: {self.client_name}")
@@ -88,6 +411,73 @@ try:
             
             self.tk_event_queue = queue.Queue()
         
+        def create_socket_client(self):
+            """Socket.io 클라이언트를 생성합니다."""
+            return socketio.Client()
+        
+        def socket_handlers(self):
+            """이벤트별 핸들러 표 - 이벤트마다 핸들러는 하나만 등록됩니다."""
+            return {
+                'connect': self.on_connect,
+                'disconnect': self.on_disconnect,
+                'registration_failed': self.on_registration_failed,
+                'registration_success': self.on_registration_success,
+                'execute_command': self.on_execute_command,
+                'stop_command': self.on_stop_command,
+                'connection_check': self.on_connection_check,
+                'heartbeat_response': self.on_heartbeat_response,
+                'process_status_request': self.on_process_status_request,
+                'pong': self.on_pong,
+            }
+        
+        def register_socket_handlers(self):
+            """Socket.io 이벤트 핸들러를 등록합니다."""
+            for event, handler in self.socket_handlers().items():
+                self.sio.on(event, handler)
+            
+            # 표에 없는 이벤트는 로그만 남김 (명령을 다시 실행하지 않음)
+            self.sio.on('*', self.on_any_event)
+        
+        def accept_command(self, data, event):
+            """commandId가 있는 명령은 한 번만 처리합니다.
+
+            이미 처리한 명령이면 기록된 응답을 다시 보내고 False를 반환합니다.
+            commandId가 없는 명령(이전 서버)은 항상 처리합니다.
+            """
+            command_id = data.get('commandId')
+            if not command_id:
+                return True
+            
+            is_new, reply = self.command_dedup.claim(command_id)
+            if is_new:
+                return True
+            
+            print(f"♻️ 중복 명령 무시: {event} ({command_id})")
+            logging.info(f"중복 명령 무시: {event} ({command_id})")
+            if reply and self.sio.connected:
+                self.emit_event(*reply)
+            return False
+        
+        def complete_command(self, command_id, event, data):
+            """명령 응답을 전송하고 중복 수신에 대비해 기록합니다.
+
+            연결이 끊겨 전송하지 못해도 응답은 기록하므로, 재연결 후 서버가 다시 보낸 명령에 기록된 응답으로 답합니다.
+            """
+            if command_id:
+                data['commandId'] = command_id
+                self.command_dedup.complete(command_id, event, data)
+            if self.sio.connected:
+                self.emit_event(event, data)
+        
+        def emit_event(self, event, data):
+            """서버로 이벤트를 전송합니다. (비동기 모드에서는 이벤트 루프로 전달)"""
+            self.sio.emit(event, data)
+        
+        def send_clock_ping(self):
+            """시계 동기화 ping을 전송합니다."""
+            if self.sio.connected:
+                self.emit_event('ping', self.clock.ping_payload())
+        
         def get_computer_name(self):
             """컴퓨터의 실제 호스트명을 가져옵니다."""
             try:
@@ -520,14 +910,75 @@ try:
             """현재 실행 중인 프로세스 상태를 서버에 전송합니다."""
             try:
                 if self.sio.connected:
-                    self.sio.emit('process_status', {
-                        'clientName': self.client_name,
-                        'processes': list(self.running_processes.keys()),
-                        'timestamp': datetime.now().isoformat()
-                    })
+                    payload = self.process_status_payload()
+                    self.emit_event('process_status', payload)
+                    self.sent_process_digest = payload['digest']
             except Exception as e:
                 logging.error(f"프로세스 상태 전송 실패: {e}")
         
+        def process_status_payload(self):
+            """전체 프로세스 상태 메시지를 만듭니다."""
+            with self.process_lock:
+                processes = sorted(self.running_processes.keys())
+            return {
+                'clientName': self.client_name,
+                'processes': processes,
+                'running_process_count': len(processes),
+                'running_processes': processes,
+                'digest': self.process_digest(processes),
+                'timestamp': datetime.now().isoformat()
+            }
+        
+        def process_digest(self, processes):
+            """실행 중인 프로세스 목록의 digest(CRC32)를 계산합니다."""
+            return zlib.crc32('\n'.join(sorted(processes)).encode('utf-8')) & 0xffffffff
+        
+        def build_heartbeat_frame(self):
+            """바이너리 하트비트 프레임을 만듭니다.
+
+            프로세스 목록이 마지막으로 보낸 상태와 다르면 전체 상태를 먼저 전송합니다.
+            """
+            with self.process_lock:
+                processes = list(self.running_processes.keys())
+            digest = self.process_digest(processes)
+            if digest != self.sent_process_digest:
+                self.send_current_process_status()
+            
+            self.heartbeat_seq = (self.heartbeat_seq + 1) & 0xffffffff
+            flags = HEARTBEAT_FLAG_RUNNING if processes else 0
+            return struct.pack(HEARTBEAT_FORMAT, HEARTBEAT_VERSION, flags, self.client_id, self.heartbeat_seq, digest)
+        
+        def use_binary_heartbeat(self):
+            """서버가 바이너리 하트비트를 지원하고 client_id를 받았는지 확인합니다."""
+            return self.heartbeat_protocol == 'binary' and self.client_id is not None
+        
+        def on_registration_success(self, data):
+            """등록 성공 시 client_id와 하트비트 프로토콜을 기록하고 하트비트를 시작합니다."""
+            data = data or {}
+            print(f"✅ 클라이언트 등록 성공! 하트비트 시작")
+            logging.info(f"클라이언트 등록 성공 - 하트비트 시작: {data}")
+            
+            self.client_id = data.get('clientId', self.client_id)
+            heartbeat = data.get('heartbeat') or {}
+            if heartbeat.get('protocol') == 'binary' and heartbeat.get('version') == HEARTBEAT_VERSION:
+                self.heartbeat_protocol = 'binary'
+            else:
+                self.heartbeat_protocol = 'json'
+            
+            # 새 연결에서는 전체 프로세스 상태를 다시 전송
+            self.sent_process_digest = None
+            logging.info(f"하트비트 프로토콜: {self.heartbeat_protocol} (client_id: {self.client_id})")
+            
+            self.start_heartbeat()
+            
+            # 시계 동기화 시작 (표본이 모일 때까지 pong을 받는 즉시 다음 ping 전송)
+            self.send_clock_ping()
+        
+        def on_process_status_request(self, data):
+            """서버가 프로세스 목록 digest 불일치를 알리면 전체 상태를 다시 전송합니다."""
+            logging.info("프로세스 상태 요청 수신 - 전체 상태 전송")
+            self.send_current_process_status()
+        
         def on_disconnect(self):
             """Socket.io 연결 해제 시 호출됩니다."""
             print(f"🔌 서버와의 연결이 해제되었습니다: {self.client_name}")
@@ -556,7 +1007,9 @@ try:
             reconnect_thread.start()
         
         def start_heartbeat(self):
-            """하트비트 전송을 시작합니다."""
+            """하트비트 전송을 시작합니다. (이미 실행 중이면 무시)"""
+            if self.heartbeat_thread and self.heartbeat_thread.is_alive():
+                return
             print(f"💓 하트비트 시작: {self.client_name}")
             logging.info(f"하트비트 시작: {self.client_name}")
             
@@ -577,24 +1030,23 @@ try:
                             time.sleep(5)
                             continue
                         
-                        # 하트비트 전송 (서버 오류 수정 후 복원)
-                        heartbeat_data = {
-                            'clientName': self.client_name,
-                            'ip_address': self.get_cached_ip(),
-                            'timestamp': datetime.now().isoformat()
-                        }
-                        self.sio.emit('heartbeat', heartbeat_data)
+                        # 하트비트 전송 (서버가 지원하면 바이너리 프레임)
+                        if self.use_binary_heartbeat():
+                            self.sio.emit('hb', self.build_heartbeat_frame())
+                        else:
+                            heartbeat_data = {
+                                'clientName': self.client_name,
+                                'ip_address': self.get_cached_ip(),
+                                'timestamp': datetime.now().isoformat()
+                            }
+                            self.sio.emit('heartbeat', heartbeat_data)
+                        self.sio.emit('ping', self.clock.ping_payload())
                         print(f"💓 하트비트 전송: {self.client_name}")
                         logging.info(f"하트비트 전송: {self.client_name}")
                         
-                        # 프로세스 상태도 함께 확인 (10초마다)
-                        if hasattr(self, '_heartbeat_count'):
-                            self._heartbeat_count += 1
-                        else:
-                            self._heartbeat_count = 1
-                        
-                        if self._heartbeat_count % 2 == 0:  # 10초마다 (5초 * 2)
-                            self.check_process_status()
+                        # 런처가 나중에 띄운 자식 프로세스도 정지 대상에 포함
+                        if self.running_processes:
+                            self.refresh_process_trees()
                         
                         time.sleep(5)  # 5초마다 하트비트
                     except Exception as e:
@@ -606,8 +1058,8 @@ try:
                         time.sleep(5)  # 오류 시 5초 후 재시도
             
             import threading
-            heartbeat_thread = threading.Thread(target=heartbeat_loop, daemon=True)
-            heartbeat_thread.start()
+            self.heartbeat_thread = threading.Thread(target=heartbeat_loop, daemon=True)
+            self.heartbeat_thread.start()
         
         def on_registration_failed(self, data):
             """클라이언트 등록 실패 시 호출됩니다."""
@@ -619,7 +1071,7 @@ try:
             """명령 실행 요청을 받았을 때 호출됩니다."""
             try:
                 command = data.get('command', '')
-                preset_id = data.get('preset_id')
+                preset_id = data.get('presetId', data.get('preset_id'))
                 # 두 가지 필드명 모두 처리
                 client_name = data.get('client_name', '') or data.get('clientName', '')
                 
@@ -629,42 +1081,133 @@ try:
                     logging.info(f"클라이언트 이름 불일치로 명령 무시: {client_name} != {self.client_name}")
                     return  # 다른 클라이언트용 명령이면 무시
                 
+                if not self.accept_command(data, 'execute_command'):
+                    return
+                
                 print(f"📋 명령 실행 요청: {command}")
                 logging.info(f"명령 실행 요청: {command}")
                 
-                # 명령 실행을 별도 스레드에서 처리
-                def execute_command_async():
-                    try:
-                        result = self.execute_command(command)
-                        
-                        # 결과 전송
-                        self.sio.emit('execution_result', {
-                            'clientName': self.client_name,
-                            'presetId': preset_id,
-                            'command': command,
-                            'result': result,
-                            'timestamp': datetime.now().isoformat()
-                        })
-                        
-                        print(f"✅ 명령 실행 완료: {result.get('success', False)}")
-                        
-                    except Exception as e:
-                        logging.error(f"명령 실행 중 오류: {e}")
-                        self.sio.emit('execution_result', {
-                            'clientName': self.client_name,
-                            'presetId': preset_id,
-                            'command': command,
-                            'result': {'success': False, 'error': str(e)},
-                            'timestamp': datetime.now().isoformat()
-                        })
-                
-                # 별도 스레드에서 명령 실행
-                command_thread = threading.Thread(target=execute_command_async, daemon=True)
-                command_thread.start()
+                self.dispatch_command(command, preset_id, data.get('commandId'), data.get('launchAt'),
+                                      data.get('ready'), data.get('readyTimeout'))
                 
             except Exception as e:
                 logging.error(f"명령 실행 요청 처리 중 오류: {e}")
         
+        def dispatch_command(self, command, preset_id, command_id=None, launch_at=None, ready=None, ready_timeout=None):
+            """명령 실행을 소켓 수신 스레드 밖으로 넘깁니다."""
+            # 별도 스레드에서 명령 실행
+            command_thread = threading.Thread(
+                target=self.run_command_request,
+                args=(command, preset_id, command_id, launch_at, ready, ready_timeout),
+                daemon=True
+            )
+            command_thread.start()
+        
+        def run_command_request(self, command, preset_id, command_id=None, launch_at=None, ready=None, ready_timeout=None):
+            """명령을 실행하고 결과를 서버에 전송합니다. (블로킹)
+
+            launch_at(서버 시각)이 있으면 그 시각까지 기다렸다 실행하고 실제 실행 시각을 함께 보고합니다.
+            ready(준비 확인 조건)가 있으면 실행 후 준비될 때까지 확인해 command_ready로 보고합니다.
+            """
+            try:
+                launch = self.clock.wait_until(launch_at) if launch_at is not None else None
+                probe = ReadinessProbe(ready, ready_timeout) if ready else None
+                result = self.execute_command(command)
+                if launch:
+                    result['launch'] = launch
+                    if launch['launchedAt'] is not None:
+                        print(f"⏱️ 예약 실행: 예약 시각 대비 {launch['delayMs']:+.2f}ms{' (늦게 수신)' if launch['late'] else ''}")
+                
+                # 결과 전송
+                self.complete_command(command_id, 'execution_result', {
+                    'clientName': self.client_name,
+                    'presetId': preset_id,
+                    'command': command,
+                    'result': result,
+                    'timestamp': datetime.now().isoformat()
+                })
+                
+                print(f"✅ 명령 실행 완료: {result.get('success', False)}")
+                
+                if probe and result.get('success'):
+                    self.watch_ready(probe, command_id, preset_id, result.get('process_name'), result.get('pid'))
+                
+            except Exception as e:
+                logging.error(f"명령 실행 중 오류: {e}")
+                self.complete_command(command_id, 'execution_result', {
+                    'clientName': self.client_name,
+                    'presetId': preset_id,
+                    'command': command,
+                    'result': {'success': False, 'error': str(e)},
+                    'timestamp': datetime.now().isoformat()
+                })
+        
+        def poll_ready(self, probe, process_name, pid):
+            """준비 확인 한 번 - 끝났으면 (True, 준비 여부, 확인 방법 또는 오류), 아니면 (False, False, None)
+
+            실행한 셸/런처(pid)는 바로 끝날 수 있으므로 살아 있는지는 기록된 프로세스 트리나 같은 이름의 프로세스로 판단합니다.
+            """
+            live_pids = self.live_command_pids(process_name, pid)
+            
+            method = probe.check(live_pids if probe.window else None)
+            if method:
+                return True, True, method
+            if not live_pids:
+                return True, False, '준비 전에 프로세스가 종료되었습니다.'
+            if probe.expired():
+                return True, False, '준비 확인 시간 초과'
+            return False, False, None
+        
+        def live_command_pids(self, process_name, pid):
+            """실행한 명령에서 아직 실행 중인 프로세스 pid 집합 (기록된 트리, 없으면 같은 이름의 프로세스)"""
+            pids = set()
+            with self.process_lock:
+                process_info = self.running_processes.get(process_name)
+                # 같은 이름으로 다시 실행돼 항목이 바뀌었으면 이 명령의 트리가 아님
+                tracked = process_info if process_info and process_info['pid'] == pid else None
+            if tracked:
+                self.refresh_process_tree(process_name)
+                pids.update(proc.pid for proc in self.live_tree_processes(tracked))
+                try:
+                    root = psutil.Process(pid)
+                    if root.status() != psutil.STATUS_ZOMBIE:
+                        pids.add(pid)
+                except psutil.Error:
+                    pass
+            if not pids:
+                pids.update(proc.pid for proc in self.find_processes_by_name(process_name))
+            return pids
+        
+        def watch_ready(self, probe, command_id, preset_id, process_name, pid):
+            """준비될 때까지 확인하고 결과를 보고합니다. (명령 실행 스레드에서 블로킹)"""
+            while self.running:
+                done, ready, detail = self.poll_ready(probe, process_name, pid)
+                if done:
+                    self.report_ready(probe, command_id, preset_id, ready, detail)
+                    return
+                time.sleep(READY_POLL_INTERVAL)
+        
+        def report_ready(self, probe, command_id, preset_id, ready, detail):
+            """준비 확인 결과를 서버에 전송합니다."""
+            elapsed_ms = round(probe.elapsed_ms(), 1)
+            if ready:
+                print(f"🟢 프로세스 준비 완료: {detail} ({elapsed_ms:.0f}ms)")
+                logging.info(f"프로세스 준비 완료: {detail} ({elapsed_ms:.0f}ms)")
+            else:
+                print(f"⚠️ 프로세스 준비 확인 실패: {detail}")
+                logging.warning(f"프로세스 준비 확인 실패: {detail}")
+            
+            self.emit_event('command_ready', {
+                'clientName': self.client_name,
+                'presetId': preset_id,
+                'commandId': command_id,
+                'ready': ready,
+                'method': detail if ready else None,
+                'error': None if ready else detail,
+                'elapsedMs': elapsed_ms,
+                'timestamp': datetime.now().isoformat()
+            })
+        
         def on_connection_check(self, data):
             """연결 확인 요청을 받았을 때 호출됩니다."""
             try:
@@ -690,7 +1233,7 @@ try:
                         'timestamp': datetime.now().isoformat()
                     }
                     
-                    self.sio.emit('connection_check_response', response_data)
+                    self.emit_event('connection_check_response', response_data)
                     logging.info(f"연결 확인 응답 전송: {self.client_name}")
                 else:
                     logging.warning(f"소켓이 연결되지 않음 - 연결 확인 응답 건너뜀: {self.client_name}")
@@ -713,156 +1256,272 @@ try:
                     logging.info(f"클라이언트 이름 불일치로 정지 명령 무시: {client_name} != {self.client_name}")
                     return  # 다른 클라이언트용 명령이면 무시
                 
+                if not self.accept_command(data, 'stop_command'):
+                    return
+                
                 print(f"🛑 정지 명령 수신: {self.client_name}")
                 logging.info(f"정지 명령 수신: {self.client_name}")
                 
                 # 실행 중인 모든 프로세스 정지
                 self.stop_running_processes()
                 
-                # 정지 완료 응답 전송
+                # 정지 완료 응답 전송 (연결이 끊겼어도 중복 수신 응답용으로 기록)
+                self.complete_command(data.get('commandId'), 'stop_command_completed', {
+                    'clientName': self.client_name,
+                    'timestamp': datetime.now().isoformat()
+                })
                 if self.sio.connected:
-                    self.sio.emit('stop_command_completed', {
-                        'clientName': self.client_name,
-                        'timestamp': datetime.now().isoformat()
-                    })
-                    
                     print(f"✅ 정지 완료 응답 전송: {self.client_name}")
                 
             except Exception as e:
                 logging.error(f"정지 명령 처리 중 오류: {e}")
         
-        def add_running_process(self, process_name, pid, command):
-            """실행 중인 프로세스를 추가합니다."""
-            self.running_processes[process_name] = {
-                'pid': pid,
-                'command': command,
-                'start_time': datetime.now()
-            }
-            logging.info(f"프로세스 추가: {process_name} (PID: {pid})")
+        def add_running_process(self, process_name, process, command):
+            """실행 중인 프로세스를 추가하고 종료 감시를 시작합니다."""
+            with self.process_lock:
+                self.running_processes[process_name] = {
+                    'name': process_name,
+                    'pid': process.pid,
+                    'process': process,
+                    'command': command,
+                    'tree': {},
+                    'start_time': datetime.now()
+                }
+            self.process_watcher.watch(process_name, process)
+            self.refresh_process_tree(process_name)
+            logging.info(f"프로세스 추가: {process_name} (PID: {process.pid})")
         
         def remove_running_process(self, process_name):
             """실행 중인 프로세스를 제거합니다."""
-            if process_name in self.running_processes:
-                del self.running_processes[process_name]
-                logging.info(f"프로세스 제거: {process_name}")
+            with self.process_lock:
+                if process_name in self.running_processes:
+                    del self.running_processes[process_name]
+                    logging.info(f"프로세스 제거: {process_name}")
         
-        def check_process_status(self):
-            """실행 중인 프로세스 상태를 확인합니다."""
-            if not self.running_processes:
-                return  # 실행 중인 프로세스가 없으면 체크하지 않음
-            
-            processes_to_remove = []
-            print(f"🔍 프로세스 상태 확인 중... (총 {len(self.running_processes)}개)")
+        def refresh_process_tree(self, process_name):
+            """실행한 명령의 프로세스 트리(자식 프로세스 포함)를 기록합니다.
+
+            실행 직후 몇 번, 하트비트마다, 루트 종료 시점에 호출됩니다.
+            셸이나 런처가 먼저 끝나도 이미 기록된 자식 프로세스는 정지 대상으로 남습니다.
+            psutil.Process는 생성 시각을 함께 보관하므로 PID가 재사용돼도 다른 프로세스를 죽이지 않습니다.
+            """
+            with self.process_lock:
+                process_info = self.running_processes.get(process_name)
+                if not process_info:
+                    return
+                tree = process_info['tree']
+                roots = [process_info['pid']] + list(tree.keys())
             
-            for process_name, process_info in self.running_processes.items():
+            found = {}
+            for pid in roots:
                 try:
-                    pid = process_info['pid']
-                    proc = psutil.Process(pid)
-                    
+                    proc = tree.get(pid) or psutil.Process(pid)
                     if not proc.is_running():
-                        processes_to_remove.append(process_name)
-                        print(f"❌ 프로세스 종료 감지: {process_name} (PID: {pid})")
-                        logging.info(f"프로세스 종료 감지: {process_name} (PID: {pid})")
-                        
-                    # 비정상 종료 시 서버에 알림
-                    if self.sio.connected:
-                        status_data = {
-                            'clientName': self.client_name,
-                            'status': 'online',
-                            'reason': f'프로세스 비정상 종료: {process_name}',
-                            'timestamp': datetime.now().isoformat()
-                        }
-                        print(f"📡 서버로 상태 업데이트 전송: {status_data}")
-                        self.sio.emit('client_status_update', status_data)
-                        print(f"🔄 비정상 종료 감지 - 상태를 'online'으로 변경: {self.client_name}")
-                        logging.info(f"비정상 종료 감지 - 상태를 'online'으로 변경: {self.client_name}")
-                    else:
-                        print(f"❌ 소켓 연결 안됨 - 상태 업데이트 전송 실패")
-                        logging.warning(f"소켓 연결 안됨 - 상태 업데이트 전송 실패")
-                except psutil.NoSuchProcess:
-                    processes_to_remove.append(process_name)
-                    print(f"❌ 프로세스 존재하지 않음: {process_name} (PID: {pid})")
-                    logging.info(f"프로세스 존재하지 않음: {process_name} (PID: {pid})")
-                    
-                    # 비정상 종료 시 서버에 알림
-                    if self.sio.connected:
-                        status_data = {
-                            'clientName': self.client_name,
-                            'status': 'online',
-                            'reason': f'프로세스 비정상 종료: {process_name}',
-                            'timestamp': datetime.now().isoformat()
-                        }
-                        print(f"📡 서버로 상태 업데이트 전송: {status_data}")
-                        self.sio.emit('client_status_update', status_data)
-                        print(f"🔄 비정상 종료 감지 - 상태를 'online'으로 변경: {self.client_name}")
-                        logging.info(f"비정상 종료 감지 - 상태를 'online'으로 변경: {self.client_name}")
-                    else:
-                        print(f"❌ 소켓 연결 안됨 - 상태 업데이트 전송 실패")
-                        logging.warning(f"소켓 연결 안됨 - 상태 업데이트 전송 실패")
-                        
-                except Exception as e:
-                    print(f"❌ 프로세스 상태 확인 중 오류: {process_name} - {e}")
-                    logging.error(f"프로세스 상태 확인 중 오류: {e}")
-            
-            # 종료된 프로세스 제거
-            for process_name in processes_to_remove:
-                self.remove_running_process(process_name)
-                print(f"🗑️ 프로세스 목록에서 제거: {process_name}")
+                        continue
+                    found[proc.pid] = proc
+                    for child in proc.children(recursive=True):
+                        found.setdefault(child.pid, child)
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    continue
             
-            if processes_to_remove:
-                print(f"📊 프로세스 상태 확인 완료: {len(processes_to_remove)}개 종료됨")
-            else:
-                print(f"📊 프로세스 상태 확인 완료: 모든 프로세스 정상 실행 중")
+            with self.process_lock:
+                process_info = self.running_processes.get(process_name)
+                if process_info:
+                    process_info['tree'].update(found)
+        
+        def refresh_process_trees(self):
+            """실행 중인 모든 명령의 프로세스 트리를 갱신합니다. (하트비트마다 호출)"""
+            with self.process_lock:
+                process_names = list(self.running_processes.keys())
+            for process_name in process_names:
+                self.refresh_process_tree(process_name)
         
-        def start_process_monitor(self):
-            """프로세스 모니터링을 시작합니다."""
-            print("🔄 프로세스 모니터링 시작")
-            logging.info("프로세스 모니터링 시작")
+        def live_tree_processes(self, process_info):
+            """기록된 프로세스 트리 중 아직 실행 중인 프로세스 목록 (루트 제외)"""
+            alive = []
+            for pid, proc in list(process_info['tree'].items()):
+                if pid == process_info['pid']:
+                    continue
+                try:
+                    if proc.is_running() and proc.status() != psutil.STATUS_ZOMBIE:
+                        alive.append(proc)
+                except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                    continue
+                except psutil.AccessDenied:
+                    alive.append(proc)
+            return alive
+        
+        def find_processes_by_name(self, process_name):
+            """이름이 같은 실행 중인 프로세스 목록 (대소문자 무시, 에이전트 자신 제외)
+
+            트리를 기록하기 전에 런처가 끝나 자식을 찾을 수 없을 때 이름으로 찾기 위한 대체 수단입니다.
+            """
+            if not process_name:
+                return []
+            target = process_name.lower()
+            own_pid = os.getpid()
+            found = []
+            for proc in psutil.process_iter(['name']):
+                try:
+                    name = proc.info['name']
+                    if proc.pid != own_pid and name and name.lower() == target and proc.status() != psutil.STATUS_ZOMBIE:
+                        found.append(proc)
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    continue
+            return found
+        
+        def terminate_process_trees(self, processes, timeout=0.5):
+            """기록된 프로세스 트리들을 한꺼번에 종료합니다.
+
+            모든 프로세스에 terminate를 보낸 뒤 함께 대기하고, 기한 안에 끝나지 않은 프로세스만 kill합니다.
+            반환값은 끝까지 종료되지 않은 프로세스 목록입니다.
+            """
+            targets = {}
+            for process_info in processes.values():
+                for pid, proc in process_info.get('tree', {}).items():
+                    targets.setdefault(pid, proc)
+                # 루트 프로세스와 아직 기록되지 않은 자식도 포함
+                root_alive = False
+                try:
+                    root = targets.get(process_info['pid']) or psutil.Process(process_info['pid'])
+                    if root.is_running() and root.status() != psutil.STATUS_ZOMBIE:
+                        root_alive = True
+                    targets.setdefault(root.pid, root)
+                    for child in root.children(recursive=True):
+                        targets.setdefault(child.pid, child)
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    pass
+                # 루트가 끝났고 기록된 자식도 없으면 (트리 기록 전에 런처가 끝난 경우) 이름으로 찾아 정지
+                if not root_alive and not self.live_tree_processes(process_info):
+                    for proc in self.find_processes_by_name(process_info.get('name')):
+                        targets.setdefault(proc.pid, proc)
             
-            # 메인 스레드에서 직접 실행
-            def monitor_loop():
-                while self.running:
+            procs = []
+            for proc in targets.values():
+                try:
+                    if proc.is_running():
+                        proc.terminate()
+                        procs.append(proc)
+                except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                    continue
+                except psutil.AccessDenied as e:
+                    logging.warning(f"프로세스 종료 권한 없음: PID {proc.pid} - {e}")
+            
+            alive = self.wait_processes_gone(procs, timeout)
+            if alive:
+                print(f"⚠️ {len(alive)}개 프로세스가 응답하지 않아 강제 종료합니다")
+                for proc in alive:
                     try:
-                        self.check_process_status()
-                        time.sleep(10)  # 10초마다 체크
-                    except Exception as e:
-                        logging.error(f"프로세스 모니터링 중 오류: {e}")
-                        time.sleep(5)
+                        proc.kill()
+                    except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                        continue
+                    except psutil.AccessDenied as e:
+                        logging.warning(f"프로세스 강제 종료 권한 없음: PID {proc.pid} - {e}")
+                alive = self.wait_processes_gone(alive, timeout)
+            
+            for proc in alive:
+                logging.error(f"프로세스 종료 실패: PID {proc.pid}")
+            return alive
+        
+        def wait_processes_gone(self, procs, timeout):
+            """기한까지 프로세스 종료를 기다리고 살아 있는 프로세스 목록을 반환합니다.
+
+            부모가 먼저 종료돼 회수되지 않은 좀비 프로세스도 종료된 것으로 봅니다.
+            """
+            deadline = time.monotonic() + timeout
+            alive = list(procs)
+            while alive:
+                remaining = []
+                for proc in alive:
+                    try:
+                        if proc.is_running() and proc.status() != psutil.STATUS_ZOMBIE:
+                            remaining.append(proc)
+                    except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                        continue
+                    except psutil.AccessDenied:
+                        remaining.append(proc)
+                alive = remaining
+                if not alive or time.monotonic() >= deadline:
+                    break
+                time.sleep(0.02)
+            return alive
+        
+        def handle_process_exit(self, process_name, pid, returncode):
+            """감시 중인 프로세스가 종료되면 즉시 호출됩니다. (대기 스레드에서 실행)
+
+            셸(shell=True)이나 런처가 먼저 끝난 경우, 기록된 자식이나 같은 이름의 프로세스가 남아 있으면
+            항목을 유지하고 남은 프로세스가 모두 끝날 때 다시 확인합니다.
+            """
+            with self.process_lock:
+                process_info = self.running_processes.get(process_name)
+                # 정지 명령으로 이미 정리됐거나 같은 이름으로 다시 실행된 경우는 무시
+                if not process_info or process_info['pid'] != pid:
+                    return
+                if returncode is not None:
+                    process_info['returncode'] = returncode
             
-            # 별도 스레드로 실행
-            self.process_monitor_thread = threading.Thread(target=monitor_loop, daemon=True)
-            self.process_monitor_thread.start()
-            print("✅ 프로세스 모니터링 스레드 시작됨")
-            print("✅ 프로세스 모니터링 스레드 시작됨")
-            logging.info("프로세스 모니터링 스레드 시작됨")
+            self.refresh_process_tree(process_name)
+            survivors = self.live_tree_processes(process_info) or self.find_processes_by_name(process_name)
+            
+            with self.process_lock:
+                if self.running_processes.get(process_name) is not process_info:
+                    return
+                if survivors:
+                    process_info['tree'].update({proc.pid: proc for proc in survivors})
+                else:
+                    del self.running_processes[process_name]
+                remaining = len(self.running_processes)
+            
+            if survivors:
+                if returncode is not None:
+                    print(f"↪️ 런처 종료, 프로세스 {len(survivors)}개 계속 실행: {process_name} (PID: {pid})")
+                    logging.info(f"런처 종료 후 계속 실행: {process_name} (PID: {pid}) - {[proc.pid for proc in survivors]}")
+                self.process_watcher.watch_tree(process_name, pid, survivors)
+                return
+            returncode = process_info.get('returncode')
+            
+            print(f"❌ 프로세스 종료 감지: {process_name} (PID: {pid}, 종료 코드: {returncode})")
+            logging.info(f"프로세스 종료 감지: {process_name} (PID: {pid}, 종료 코드: {returncode})")
+            
+            # 비정상 종료 시 서버에 알림
+            if self.sio.connected:
+                status_data = {
+                    'clientName': self.client_name,
+                    'status': 'running' if remaining > 0 else 'online',
+                    'reason': f'프로세스 비정상 종료: {process_name}',
+                    'exit_code': returncode,
+                    'timestamp': datetime.now().isoformat()
+                }
+                self.emit_event('client_status_update', status_data)
+                logging.info(f"비정상 종료 감지 - 상태 업데이트 전송: {status_data['status']}")
+            else:
+                logging.warning(f"소켓 연결 안됨 - 상태 업데이트 전송 실패")
         
         def stop_running_processes(self):
             """실행 중인 모든 프로세스를 정지합니다."""
-            print(f"🛑 실행 중인 프로세스 정지 중... ({len(self.running_processes)}개)")
+            # 종료 감시 콜백이 비정상 종료로 보고하지 않도록 목록을 먼저 비움
+            with self.process_lock:
+                processes = dict(self.running_processes)
+                self.running_processes.clear()
             
-            for process_name, process_info in self.running_processes.items():
-                try:
-                    print(f"🔧 taskkill 명령어로 강제 종료 시도: {process_name}")
-                    result = subprocess.run(
-                        ['taskkill', '/F', '/IM', process_name],
-                        capture_output=True,
-                        text=True,
-                        timeout=10
-                    )
-                    if result.returncode == 0:
-                        print(f"✅ taskkill로 프로세스 종료 성공: {process_name}")
-                    else:
-                        print(f"❌ taskkill 실패: {process_name} - {result.stderr}")
-                except Exception as e:
-                    print(f"❌ taskkill 실행 중 오류: {e}")
+            print(f"🛑 실행 중인 프로세스 정지 중... ({len(processes)}개)")
+            
+            started = time.monotonic()
+            try:
+                alive = self.terminate_process_trees(processes)
+                if alive:
+                    print(f"❌ 종료되지 않은 프로세스: {[proc.pid for proc in alive]}")
+            except Exception as e:
+                print(f"❌ 프로세스 정지 중 오류: {e}")
+                logging.error(f"프로세스 정지 중 오류: {e}")
             
-            # 프로세스 목록 초기화
-            self.running_processes.clear()
-            print("✅ 모든 프로세스 정지 완료")
+            elapsed = time.monotonic() - started
+            print(f"✅ 모든 프로세스 정지 완료 ({elapsed:.2f}초)")
+            logging.info(f"프로세스 정지 완료: {len(processes)}개, {elapsed:.2f}초")
             
             # 상태를 online으로 되돌리기
             if self.sio.connected:
-                self.sio.emit('client_status_update', {
+                self.emit_event('client_status_update', {
                     'clientName': self.client_name,
                     'status': 'online',
                     'timestamp': datetime.now().isoformat()
@@ -888,12 +1547,12 @@ try:
                 
                 # 실행된 프로세스 정보 저장
                 if process_name:
-                    self.add_running_process(process_name, process.pid, command)
+                    self.add_running_process(process_name, process, command)
                     print(f"✅ 프로세스 시작됨: {process_name} (PID: {process.pid})")
                     
                     # 클라이언트 상태를 running으로 변경
                     if self.sio.connected:
-                        self.sio.emit('client_status_update', {
+                        self.emit_event('client_status_update', {
                             'clientName': self.client_name,
                             'status': 'running',
                             'timestamp': datetime.now().isoformat()
@@ -968,28 +1627,10 @@ try:
                 logging.error(f"프로세스 이름 추출 실패: {e}")
                 return None
         
-        def on_any_event(self, event, data):
-            """모든 소켓 이벤트를 받아서 로그로 출력합니다."""
+        def on_any_event(self, event, data=None):
+            """핸들러 표에 없는 소켓 이벤트를 로그로 출력합니다."""
             print(f"📡 [소켓 이벤트] 수신: {event} - 데이터: {data}")
             logging.info(f"소켓 이벤트 수신: {event} - 데이터: {data}")
-            
-            # execute_command 이벤트가 수신되면 특별히 로깅
-            if event == 'execute_command':
-                print(f"🚨 [중요] execute_command 이벤트 수신됨!")
-                logging.info(f"[중요] execute_command 이벤트 수신됨!")
-                # 즉시 명령 실행
-                self.on_execute_command(data)
-            
-            # connection_check 이벤트를 특별히 처리
-            elif event == 'connection_check':
-                print(f"🔍 [소켓 이벤트] connection_check 이벤트 감지!")
-                self.on_connection_check(data)
-            
-            # registration_success 이벤트 처리 (등록 성공 후 하트비트 시작)
-            elif event == 'registration_success':
-                print(f"✅ [소켓 이벤트] 클라이언트 등록 성공! 하트비트 시작")
-                logging.info("클라이언트 등록 성공 - 하트비트 시작")
-                self.start_heartbeat()
         
         def on_heartbeat_response(self, data):
             """하트비트 응답을 받았을 때 호출됩니다."""
@@ -1014,11 +1655,21 @@ try:
                 logging.error(f"하트비트 응답 처리 중 오류: {e}")
         
         def on_pong(self, data):
-            """pong 응답을 받았을 때 호출됩니다."""
+            """pong 응답을 받았을 때 호출됩니다. (시계 동기화 표본 추가)"""
             try:
-                timestamp = data.get('timestamp', '')
-                print(f"🏓 [pong] 서버 응답 수신: {timestamp}")
-                logging.info(f"pong 응답 수신: {timestamp}")
+                sample = self.clock.add_sample(data or {})
+                if sample is None:
+                    logging.info(f"pong 응답 수신: {data.get('timestamp', '')}")
+                    return
+                
+                offset, rtt = sample
+                logging.debug(f"시계 동기화 표본: 차이 {offset:+.2f}ms, 왕복 {rtt:.2f}ms")
+                if self.clock.sample_count() < CLOCK_SYNC_BURST:
+                    self.send_clock_ping()
+                elif self.clock.sample_count() == CLOCK_SYNC_BURST:
+                    offset, rtt = self.clock.estimate()
+                    print(f"⏱️ 서버 시계 동기화: 차이 {offset:+.2f}ms (왕복 {rtt:.2f}ms)")
+                    logging.info(f"서버 시계 동기화: 차이 {offset:+.2f}ms (왕복 {rtt:.2f}ms)")
             except Exception as e:
                 logging.error(f"pong 응답 처리 중 오류: {e}")
         
@@ -1047,11 +1698,6 @@ try:
                     # 초기 트레이 아이콘 업데이트 (빨간색으로 시작)
                     self.update_tray_icon()
                 
-                # 프로세스 모니터링 시작
-                print("🔄 프로세스 모니터링 시작 시도...")
-                self.start_process_monitor()
-                print("✅ 프로세스 모니터링 시작 완료")
-                
                 # Socket.io 연결
                 if self.connect_socket():
                     print("✅ Socket.io 연결 성공")
@@ -1165,10 +1811,15 @@ try:
                     # 개발 환경
                     config_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
                 
-                config = {
+                # 기존 설정(클라이언트 이름, 에이전트 모드 등)은 유지
+                config = {}
+                if os.path.exists(config_file):
+                    with open(config_file, 'r', encoding='utf-8') as f:
+                        config = json.load(f)
+                config.update({
                     'server_url': server_url,
                     'saved_at': datetime.now().isoformat()
-                }
+                })
                 with open(config_file, 'w', encoding='utf-8') as f:
                     json.dump(config, f, ensure_ascii=False, indent=2)
                 print(f"✅ 서버 설정 저장됨: {server_url}")
@@ -1220,6 +1871,303 @@ try:
             if self.root:
                 self.root.after(100, self.process_tk_events)
 
+    class AsyncUECMSTrayClient(UECMSTrayClient):
+        """asyncio 이벤트 루프 하나로 동작하는 에이전트 모드
+
+        소켓 통신, 하트비트, 재연결을 모두 같은 루프의 태스크로 실행하고
+        psutil/subprocess 같은 블로킹 작업은 크기가 고정된 스레드 풀에서 처리합니다.
+        명령이 몰려도 스레드 수는 (메인 + 트레이 + 워커 수 + 실행 중인 프로세스별 대기 스레드)를
+        넘지 않습니다.
+        """
+
+        def __init__(self, server_url="http://localhost:8000", max_workers=4):
+            self.max_workers = max_workers
+            self.loop = None
+            self.executor = None
+            self._stop_event = None
+            self._tasks = set()
+            self._heartbeat_task = None
+            super().__init__(server_url)
+
+        def create_socket_client(self):
+            """asyncio용 Socket.io 클라이언트를 생성합니다."""
+            # 연결이 한 번 수립된 뒤의 재연결은 AsyncClient 내장 재연결에 맡김
+            return socketio.AsyncClient(
+                reconnection=True,
+                reconnection_delay=1,
+                reconnection_delay_max=5
+            )
+
+        def spawn(self, coro):
+            """이벤트 루프에 태스크를 등록하고 끝날 때까지 참조를 유지합니다."""
+            task = self.loop.create_task(coro)
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            return task
+
+        async def run_blocking(self, func, *args):
+            """블로킹 함수를 워커 스레드 풀에서 실행합니다."""
+            return await self.loop.run_in_executor(self.executor, func, *args)
+
+        def emit_event(self, event, data):
+            """루프 스레드/워커 스레드 어디에서 호출해도 루프에서 전송되도록 합니다."""
+            if self.loop is None or self.loop.is_closed():
+                return
+            try:
+                current_loop = asyncio.get_running_loop()
+            except RuntimeError:
+                current_loop = None
+
+            if current_loop is self.loop:
+                self.spawn(self._emit(event, data))
+            else:
+                asyncio.run_coroutine_threadsafe(self._emit(event, data), self.loop)
+
+        async def _emit(self, event, data):
+            try:
+                if self.sio.connected:
+                    await self.sio.emit(event, data)
+            except Exception as e:
+                logging.error(f"이벤트 전송 실패 ({event}): {e}")
+
+        async def connect_socket(self):
+            """
+            Socket.io 연결을 설정합니다.
+            """
+            try:
+                print(f"🔌 Socket.io 연결 시도: {self.server_url}")
+                logging.info(f"Socket.io 연결 시도: {self.server_url}")
+
+                await self.sio.connect(
+                    self.server_url,
+                    transports=['websocket', 'polling'],
+                    wait_timeout=10
+                )
+
+                print(f"✅ Socket.io 연결 설정 완료")
+                logging.info("Socket.io 연결 설정 완료")
+                return True
+            except Exception as e:
+                print(f"❌ Socket.io 연결 실패: {e}")
+                logging.error(f"Socket.io 연결 실패: {e}")
+                return False
+
+        async def _connection_loop(self):
+            """최초 연결이 될 때까지 재시도합니다. 이후 끊김은 AsyncClient가 재연결합니다."""
+            while self.running and not self.sio.connected:
+                if await self.connect_socket():
+                    break
+                await asyncio.sleep(5)
+            self.update_tray_icon()
+
+        async def on_connect(self):
+            """Socket.io 연결 시 호출됩니다."""
+            print(f"🔌 서버에 연결되었습니다: {self.client_name}")
+            logging.info("서버에 연결되었습니다")
+
+            self.update_tray_icon()
+
+            # 클라이언트 등록 (지연 후 실행)
+            self.spawn(self._register_after_delay())
+
+        async def _register_after_delay(self):
+            try:
+                await asyncio.sleep(2)  # 2초 대기 (서버 준비 시간)
+
+                if self.sio.connected:
+                    registration_data = {
+                        'name': self.client_name,
+                        'clientType': 'python',
+                        'ip_address': await self.run_blocking(self.get_cached_ip)
+                    }
+                    await self.sio.emit('register_client', registration_data)
+                    print(f"📝 클라이언트 등록 요청 전송 완료: {self.client_name}")
+                    logging.info(f"클라이언트 등록 요청 전송: {self.client_name}")
+                else:
+                    logging.warning("소켓이 연결되지 않아 등록 요청을 보낼 수 없음")
+            except Exception as e:
+                print(f"❌ 클라이언트 등록 요청 실패: {e}")
+                logging.error(f"클라이언트 등록 요청 실패: {e}")
+
+        async def on_disconnect(self):
+            """Socket.io 연결 해제 시 호출됩니다."""
+            print(f"🔌 서버와의 연결이 해제되었습니다: {self.client_name}")
+            logging.info("서버와의 연결이 해제되었습니다")
+
+            # 재연결은 AsyncClient 내장 재연결이 처리
+            self.update_tray_icon()
+
+        def start_heartbeat(self):
+            """하트비트 태스크를 시작합니다. (이미 실행 중이면 무시)"""
+            if self._heartbeat_task and not self._heartbeat_task.done():
+                return
+            print(f"💓 하트비트 시작: {self.client_name}")
+            logging.info(f"하트비트 시작: {self.client_name}")
+            self._heartbeat_task = self.spawn(self._heartbeat_loop())
+
+        async def _heartbeat_loop(self):
+            # 첫 번째 하트비트 전송 전에 3초 대기 (서버 준비 시간)
+            await asyncio.sleep(3)
+
+            while self.running:
+                try:
+                    if self.sio.connected:
+                        if self.use_binary_heartbeat():
+                            # 프로세스 목록이 바뀌었으면 전체 상태를 하트비트보다 먼저 전송
+                            payload = self.process_status_payload()
+                            if payload['digest'] != self.sent_process_digest:
+                                await self._emit('process_status', payload)
+                                self.sent_process_digest = payload['digest']
+                            await self.sio.emit('hb', self.build_heartbeat_frame())
+                        else:
+                            await self.sio.emit('heartbeat', {
+                                'clientName': self.client_name,
+                                'ip_address': self.cached_ip or await self.run_blocking(self.get_cached_ip),
+                                'timestamp': datetime.now().isoformat()
+                            })
+                        await self.sio.emit('ping', self.clock.ping_payload())
+                        logging.info(f"하트비트 전송: {self.client_name}")
+                    else:
+                        logging.warning("하트비트 전송 건너뜀: 소켓이 연결되지 않음")
+
+                    # 런처가 나중에 띄운 자식 프로세스도 정지 대상에 포함
+                    if self.running_processes:
+                        await self.run_blocking(self.refresh_process_trees)
+                except Exception as e:
+                    logging.error(f"하트비트 전송 오류: {e}")
+
+                await asyncio.sleep(5)  # 5초마다 하트비트
+
+        def dispatch_command(self, command, preset_id, command_id=None, launch_at=None, ready=None, ready_timeout=None):
+            """명령 실행을 워커 스레드 풀에 넘깁니다."""
+            self.loop.run_in_executor(self.executor, self.run_command_request, command, preset_id, command_id,
+                                      launch_at, ready, ready_timeout)
+
+        def watch_ready(self, probe, command_id, preset_id, process_name, pid):
+            """준비 확인은 루프의 태스크로 넘겨 워커 스레드를 점유하지 않습니다."""
+            asyncio.run_coroutine_threadsafe(
+                self._watch_ready(probe, command_id, preset_id, process_name, pid), self.loop
+            )
+
+        async def _watch_ready(self, probe, command_id, preset_id, process_name, pid):
+            while self.running:
+                done, ready, detail = await self.run_blocking(self.poll_ready, probe, process_name, pid)
+                if done:
+                    self.report_ready(probe, command_id, preset_id, ready, detail)
+                    return
+                await asyncio.sleep(READY_POLL_INTERVAL)
+
+        async def on_stop_command(self, data):
+            """정지 명령을 받았을 때 호출됩니다. (프로세스 트리 종료는 워커 스레드에서 실행)"""
+            await self.run_blocking(super().on_stop_command, data)
+
+        async def on_any_event(self, event, data=None):
+            """명시적 핸들러가 없는 소켓 이벤트를 처리합니다."""
+            logging.info(f"소켓 이벤트 수신: {event} - 데이터: {data}")
+
+        def start(self):
+            """
+            클라이언트를 시작합니다.
+            """
+            try:
+                print("=========================================")
+                print(" Launching Switchboard Plus v2.0 Client (async)")
+                print("=========================================")
+                print(f"🚀 Starting client with computer name: {self.client_name}")
+                print(f"서버: {self.server_url}")
+                print(f"워커 스레드: {self.max_workers}개")
+
+                # 트레이 아이콘은 pystray 특성상 자체 스레드가 필요
+                self.create_tray_icon()
+                if self.icon and PYTRAY_AVAILABLE:
+                    tray_thread = threading.Thread(target=self.run_tray_icon, daemon=True)
+                    tray_thread.start()
+                    self.update_tray_icon()
+
+                asyncio.run(self._run())
+            except KeyboardInterrupt:
+                print("\n🛑 사용자에 의해 종료됨")
+            except Exception as e:
+                logging.error(f"클라이언트 실행 중 오류: {e}")
+                print(f"❌ 클라이언트 실행 중 오류: {e}")
+
+        async def _run(self):
+            self.loop = asyncio.get_running_loop()
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix='ue-cms-worker'
+            )
+            # DNS 조회 등 기본 executor를 쓰는 작업도 같은 풀을 사용
+            self.loop.set_default_executor(self.executor)
+            self._stop_event = asyncio.Event()
+            self.running = True
+
+            try:
+                await self.run_blocking(self.cache_network_ip)
+                self.spawn(self._connection_loop())
+                self.start_heartbeat()
+
+                await self._stop_event.wait()
+            finally:
+                await self._shutdown()
+
+        async def _shutdown(self):
+            print(f"🛑 클라이언트 종료 중: {self.client_name}")
+            self.running = False
+
+            for task in list(self._tasks):
+                task.cancel()
+
+            try:
+                await self.run_blocking(self.save_server_config, self.server_url)
+                await self.run_blocking(self.stop_running_processes)
+            except Exception as e:
+                print(f"⚠️ 종료 처리 중 오류: {e}")
+
+            if self.icon and PYTRAY_AVAILABLE:
+                try:
+                    self.icon.stop()
+                except Exception as e:
+                    print(f"⚠️ 트레이 아이콘 제거 중 오류: {e}")
+
+            try:
+                if self.sio.connected:
+                    await self.sio.disconnect()
+            except Exception as e:
+                print(f"⚠️ 소켓 연결 해제 중 오류: {e}")
+
+            self.executor.shutdown(wait=False)
+            logging.info("클라이언트 종료")
+            print(f"✅ 클라이언트 종료 완료: {self.client_name}")
+
+        def stop(self):
+            """클라이언트를 중지합니다. (어느 스레드에서 호출해도 루프에 종료를 알림)"""
+            self.running = False
+            if self.loop and self._stop_event and not self.loop.is_closed():
+                self.loop.call_soon_threadsafe(self._stop_event.set)
+
+        def reconnect_to_server(self, icon=None, item=None):
+            """서버에 재연결을 시도합니다."""
+            if self.loop and not self.loop.is_closed():
+                asyncio.run_coroutine_threadsafe(self._reconnect(), self.loop)
+
+        async def _reconnect(self):
+            try:
+                print(f"🔄 서버 재연결 시도: {self.server_url}")
+                logging.info(f"서버 재연결 시도: {self.server_url}")
+
+                if self.sio.connected:
+                    await self.sio.disconnect()
+
+                await asyncio.sleep(1)
+
+                # 수동 해제 후에는 내장 재연결이 동작하지 않으므로 연결 루프를 다시 시작
+                self.spawn(self._connection_loop())
+            except Exception as e:
+                print(f"❌ 서버 재연결 중 오류: {e}")
+                logging.error(f"서버 재연결 중 오류: {e}")
+                self.update_tray_icon()
+
     def main():
         """메인 함수 - 서버 IP 입력 및 트레이 클라이언트 실행"""
         print("🚀 UE CMS Tray Client")
@@ -1231,6 +2179,9 @@ try:
             parser.add_argument('--server', '-s', help='서버 URL (예: http://192.168.1.100:8000)')
             parser.add_argument('--name', '-n', help='클라이언트 이름')
             parser.add_argument('--config', '-c', default='config.json', help='설정 파일 경로')
+            parser.add_argument('--async', dest='async_mode', action='store_true',
+                                help='asyncio 단일 이벤트 루프 에이전트 모드로 실행')
+            parser.add_argument('--workers', type=int, help='비동기 모드 워커 스레드 수 (기본값: 4)')
             
             args = parser.parse_args()
             
@@ -1281,15 +2232,22 @@ try:
             # 클라이언트 이름 결정
             client_name = args.name or config.get('client_name') or socket.gethostname()
             
+            # 에이전트 모드 결정 (명령행 인수 > 설정 파일 > 기본값)
+            agent_mode = 'async' if args.async_mode else config.get('agent_mode', 'thread')
+            worker_count = args.workers or config.get('worker_threads', 4)
+            
             print(f"\n📋 클라이언트 정보:")
             print(f"   서버: {server_url}")
             print(f"   이름: {client_name}")
             print(f"   설정 파일: {args.config}")
+            print(f"   모드: {agent_mode}")
             
             # 설정 저장
             save_config(args.config, {
                 'server_url': server_url,
                 'client_name': client_name,
+                'agent_mode': agent_mode,
+                'worker_threads': worker_count,
                 'saved_at': datetime.now().isoformat()
             })
             
@@ -1297,7 +2255,10 @@ try:
             print("=" * 50)
             
             # 클라이언트 생성 및 실행
-            client = UECMSTrayClient(server_url)
+            if agent_mode == 'async':
+                client = AsyncUECMSTrayClient(server_url, max_workers=worker_count)
+            else:
+                client = UECMSTrayClient(server_url)
             
             # 클라이언트 이름 설정
             if client_name:
@@ -7,6 +7,7 @@ const path = require('path');
 const config = require('./config/server');
 const database = require('./config/database');
 const logger = require('./utils/logger');
+const metrics = require('./utils/metrics');
 
 // 미들웨어
 const { errorHandler, notFoundHandler } = require('./middleware/errorHandler');
@@ -14,6 +15,12 @@ const { errorHandler, notFoundHandler } = require('./middleware/errorHandler');
 // 서비스
 const socketService = require('./services/socketService');
 const heartbeatService = require('./services/heartbeatService');
+const clientRegistry = require('./services/clientRegistry');
+const retentionService = require('./services/retentionService');
+const powerMonitor = require('./services/powerMonitor');
+const wakeService = require('./services/wakeService');
+const ChangeLogModel = require('./models/ChangeLog');
+const ExecutionRollupModel = require('./models/ExecutionRollup');
 
 // 라우트
 const routes = require('./routes');
@@ -33,6 +40,12 @@ app.use(express.static(path.join(__dirname, 'public')));
 // API 라우트
 app.use('/api', routes);
 
+// Prometheus 메트릭
+app.get('/metrics', (req, res) => {
+  res.set('Content-Type', 'text/plain; version=0.0.4; charset=utf-8');
+  res.send(metrics.render());
+});
+
 // favicon 라우트
 app.get('/favicon.ico', (req, res) => {
   res.status(204).end(); // No content
@@ -61,12 +74,33 @@ async function startServer() {
     // 마이그레이션 실행
     await runMigrations();
     
+    // 클라이언트 레지스트리 적재 (소켓 핸들러 조회용 메모리 캐시)
+    await clientRegistry.load();
+    
+    // 변경 로그 마지막 번호 적재 (/api/changes cursor 기준)
+    await ChangeLogModel.initialize();
+    
+    // 실행 이력 집계 준비 (이전 DB는 이력에서 한 번 재계산)
+    await ExecutionRollupModel.initialize();
+    
+    // 저장된 전원 상태 적재
+    await powerMonitor.initialize();
+    
     // Socket.IO 초기화
     socketService.initialize(server);
     
     // 하트비트 서비스 시작
     await heartbeatService.start();
     
+    // 실행 이력 보존 작업 시작
+    retentionService.start();
+    
+    // 전원 상태 모니터링 시작
+    powerMonitor.start();
+    
+    // 이벤트 루프 지연 측정 시작
+    metrics.start();
+    
     // 서버 시작
     server.listen(config.server.port, () => {
       logger.info(`🚀 UE CMS Server 시작됨`);
@@ -88,6 +122,10 @@ process.on('SIGINT', async () => {
   try {
     // 하트비트 서비스 중지
     await heartbeatService.stop();
+    retentionService.stop();
+    powerMonitor.stop();
+    wakeService.close();
+    metrics.stop();
     
     // 잠시 대기 (클라이언트들이 알림을 받을 시간)
     await new Promise(resolve => setTimeout(resolve, 2000));
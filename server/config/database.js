@@ -1,96 +1,271 @@
-const sqlite3 = require('sqlite3').verbose();
-const { promisify } = require('util');
 const path = require('path');
+const { AsyncLocalStorage } = require('async_hooks');
 const config = require('./server');
+const { loadDriver } = require('../db/drivers');
+const Mutex = require('../utils/mutex');
+const metrics = require('../utils/metrics');
 
+const queryDuration = metrics.histogram(
+  'uecms_db_query_duration_seconds',
+  'SQL 문별 실행 시간 (연결에서 실행된 시간, 쓰기 잠금 대기 제외)',
+  ['op', 'statement']
+);
+const writeLockWait = metrics.histogram('uecms_db_write_lock_wait_seconds', '쓰기 연결 잠금 대기 시간');
+const transactionDuration = metrics.histogram(
+  'uecms_db_transaction_duration_seconds',
+  '트랜잭션 시간 (BEGIN부터 COMMIT/ROLLBACK까지)',
+  ['result']
+);
+
+// 저장소 계층
+// - 쓰기 연결 1개: run/exec와 트랜잭션은 모두 여기서, 잠금(writeLock)으로 한 번에 한 호출자만 사용
+// - 읽기 전용 연결 N개(WAL): 트랜잭션 밖의 get/all은 가장 한가한 읽기 연결에서 실행
+// - 트랜잭션은 AsyncLocalStorage로 호출자 범위에 묶여, 그 안의 쿼리만 같은 트랜잭션에서 실행된다
+//   (다른 요청의 쿼리가 남의 BEGIN/COMMIT 사이에 끼어들지 않음)
 class Database {
   constructor() {
-    this.db = null;
+    this.driver = null;
+    this.writer = null;
+    this.readers = [];
+    this.writeLock = new Mutex();
+    this.txContext = new AsyncLocalStorage();
     this.isInitialized = false;
+    this.stats = { reads: 0, writes: 0, transactions: 0, rollbacks: 0 };
   }
 
   async initialize() {
     if (this.isInitialized) return;
 
-    const dbPath = path.resolve(config.database.filename);
-    
-    return new Promise((resolve, reject) => {
-      this.db = new sqlite3.Database(dbPath, (err) => {
-        if (err) {
-          console.error('데이터베이스 연결 실패:', err);
-          reject(err);
-        } else {
-          console.log('✅ SQLite 데이터베이스 연결 성공');
-          this.setupPromisifiedMethods();
-          this.optimizeDatabase();
-          this.isInitialized = true;
-          resolve();
-        }
-      });
-    });
-  }
-
-  setupPromisifiedMethods() {
-    // run 메서드를 직접 Promise로 감싸서 Statement 객체 반환
-    this.run = (sql, params = []) => {
-      return new Promise((resolve, reject) => {
-        this.db.run(sql, params, function(err) {
-          if (err) {
-            reject(err);
-          } else {
-            resolve(this); // Statement 객체 반환 (lastID, changes 포함)
-          }
-        });
-      });
+    const dbPath = config.database.filename === ':memory:'
+      ? ':memory:'
+      : path.resolve(config.database.filename);
+    const options = {
+      busyTimeout: config.database.busyTimeout,
+      statementCacheSize: config.database.statementCacheSize
     };
-    
-    this.get = promisify(this.db.get.bind(this.db));
-    this.all = promisify(this.db.all.bind(this.db));
-    this.exec = promisify(this.db.exec.bind(this.db));
+
+    this.driver = loadDriver(config.database.driver);
+
+    try {
+      this.writer = await this.driver.open(dbPath, options);
+      console.log(`✅ SQLite 데이터베이스 연결 성공 (드라이버: ${this.driver.name})`);
+    } catch (err) {
+      console.error('데이터베이스 연결 실패:', err);
+      throw err;
+    }
+
+    // WAL 모드가 켜진 뒤에 읽기 연결을 열어야 쓰기와 동시에 읽을 수 있음
+    await this.optimizeDatabase();
+
+    // 메모리 DB는 연결끼리 공유되지 않으므로 읽기 연결 없이 쓰기 연결만 사용
+    const readerCount = dbPath === ':memory:' ? 0 : config.database.readers;
+    for (let i = 0; i < readerCount; i++) {
+      try {
+        const reader = await this.driver.open(dbPath, { ...options, readonly: true });
+        await reader.exec('PRAGMA cache_size = 10000; PRAGMA temp_store = MEMORY; PRAGMA mmap_size = 30000000000;');
+        reader.inFlight = 0;
+        this.readers.push(reader);
+      } catch (error) {
+        console.error('읽기 연결 생성 실패 - 쓰기 연결로 읽기 처리:', error);
+        break;
+      }
+    }
+    console.log(`✅ 읽기 연결 ${this.readers.length}개 준비`);
+
+    this.isInitialized = true;
   }
 
   async optimizeDatabase() {
     try {
-      await this.run('PRAGMA journal_mode = WAL');
-      await this.run('PRAGMA synchronous = NORMAL');
-      await this.run('PRAGMA cache_size = 10000');
-      await this.run('PRAGMA temp_store = MEMORY');
-      await this.run('PRAGMA mmap_size = 30000000000');
+      await this.writer.run('PRAGMA journal_mode = WAL');
+      await this.writer.run('PRAGMA synchronous = NORMAL');
+      await this.writer.run('PRAGMA cache_size = 10000');
+      await this.writer.run('PRAGMA temp_store = MEMORY');
+      await this.writer.run('PRAGMA mmap_size = 30000000000');
       console.log('✅ 데이터베이스 최적화 완료');
     } catch (error) {
       console.error('데이터베이스 최적화 실패:', error);
     }
   }
 
-  async transaction(callback) {
-    await this.run('BEGIN TRANSACTION');
+  // 현재 호출 범위의 트랜잭션 (끝난 트랜잭션 범위에서 남은 비동기 작업은 트랜잭션 밖으로 취급)
+  currentTransaction() {
+    const tx = this.txContext.getStore();
+    return tx && tx.active ? tx : null;
+  }
+
+  // 쓰기 (트랜잭션 안이면 그 트랜잭션에서, 아니면 쓰기 잠금을 잡고 실행)
+  async run(sql, params = []) {
+    this.stats.writes++;
+    if (this.currentTransaction()) {
+      return await this.timed('run', sql, () => this.writer.run(sql, params));
+    }
+    return await this.exclusive(() => this.timed('run', sql, () => this.writer.run(sql, params)));
+  }
+
+  async exec(sql) {
+    this.stats.writes++;
+    if (this.currentTransaction()) {
+      return await this.timed('exec', sql, () => this.writer.exec(sql));
+    }
+    return await this.exclusive(() => this.timed('exec', sql, () => this.writer.exec(sql)));
+  }
+
+  async get(sql, params = []) {
+    return await this.read('get', sql, params);
+  }
+
+  async all(sql, params = []) {
+    return await this.read('all', sql, params);
+  }
+
+  async read(method, sql, params) {
+    this.stats.reads++;
+
+    // 트랜잭션 안의 읽기는 아직 커밋되지 않은 변경을 봐야 하므로 쓰기 연결에서
+    if (this.currentTransaction()) {
+      return await this.timed(method, sql, () => this.writer[method](sql, params));
+    }
+
+    const reader = this.pickReader();
+    if (!reader) {
+      return await this.exclusive(() => this.timed(method, sql, () => this.writer[method](sql, params)));
+    }
+
+    reader.inFlight++;
     try {
-      const result = await callback();
-      await this.run('COMMIT');
-      return result;
-    } catch (error) {
-      await this.run('ROLLBACK');
-      throw error;
+      return await this.timed(method, sql, () => reader[method](sql, params));
+    } finally {
+      reader.inFlight--;
     }
   }
 
-  async close() {
-    return new Promise((resolve, reject) => {
-      if (this.db) {
-        this.db.close((err) => {
-          if (err) {
-            reject(err);
-          } else {
-            console.log('✅ 데이터베이스 연결 종료');
-            resolve();
+  // SQL 문별 실행 시간 기록
+  async timed(op, sql, callback) {
+    const end = queryDuration.startTimer({ op, statement: metrics.normalizeSql(sql) });
+    try {
+      return await callback();
+    } finally {
+      end();
+    }
+  }
+
+  // 쓰기 잠금을 잡고 실행 (잠금 대기 시간 기록)
+  async exclusive(callback) {
+    const endWait = writeLockWait.startTimer();
+    const release = await this.writeLock.acquire();
+    endWait();
+    try {
+      return await callback();
+    } finally {
+      release();
+    }
+  }
+
+  pickReader() {
+    let best = null;
+    for (const reader of this.readers) {
+      if (!best || reader.inFlight < best.inFlight) {
+        best = reader;
+      }
+    }
+    return best;
+  }
+
+  // 호출자 범위 트랜잭션 (중첩 호출은 바깥 트랜잭션에 합류)
+  async transaction(callback) {
+    if (this.currentTransaction()) {
+      return await callback();
+    }
+
+    return await this.exclusive(async () => {
+      const tx = { active: true, afterCommit: [] };
+      const end = transactionDuration.startTimer();
+      this.stats.transactions++;
+      await this.writer.run('BEGIN IMMEDIATE');
+      try {
+        const result = await this.txContext.run(tx, callback);
+        await this.writer.run('COMMIT');
+        end({ result: 'commit' });
+        tx.active = false;
+        for (const hook of tx.afterCommit) {
+          try {
+            hook();
+          } catch (error) {
+            console.error('커밋 후 처리 오류:', error);
           }
-        });
-      } else {
-        resolve();
+        }
+        return result;
+      } catch (error) {
+        this.stats.rollbacks++;
+        await this.writer.run('ROLLBACK');
+        end({ result: 'rollback' });
+        throw error;
+      } finally {
+        tx.active = false;
       }
     });
   }
 
+  // 현재 트랜잭션이 커밋된 뒤 실행 (트랜잭션 밖이면 바로, 롤백되면 실행하지 않음)
+  afterCommit(callback) {
+    const tx = this.currentTransaction();
+    if (tx) {
+      tx.afterCommit.push(callback);
+    } else {
+      callback();
+    }
+  }
+
+  async close() {
+    const connections = [...this.readers, this.writer].filter(Boolean);
+    this.readers = [];
+    this.writer = null;
+    this.isInitialized = false;
+
+    for (const connection of connections) {
+      await connection.close();
+    }
+    if (connections.length > 0) {
+      console.log('✅ 데이터베이스 연결 종료');
+    }
+  }
+
+  getStats() {
+    return {
+      driver: this.driver ? this.driver.name : null,
+      readers: this.readers.length,
+      readersInFlight: this.readers.reduce((sum, reader) => sum + reader.inFlight, 0),
+      writeQueue: this.writeLock.waiting,
+      ...this.stats
+    };
+  }
+
+  // 연결별 준비된 문장 캐시 통계 (전체 합계 + 연결별)
+  async getStatementStats() {
+    const connections = [
+      { name: 'writer', connection: this.writer },
+      ...this.readers.map((reader, i) => ({ name: `reader${i + 1}`, connection: reader }))
+    ].filter(({ connection }) => connection);
+
+    const perConnection = await Promise.all(connections.map(async ({ name, connection }) => ({
+      name,
+      ...(await connection.getStatementStats())
+    })));
+
+    const total = { size: 0, hits: 0, misses: 0, evictions: 0 };
+    for (const stats of perConnection) {
+      total.size += stats.size;
+      total.hits += stats.hits;
+      total.misses += stats.misses;
+      total.evictions += stats.evictions;
+    }
+    const lookups = total.hits + total.misses;
+    total.hitRate = lookups > 0 ? Math.round((total.hits / lookups) * 1000) / 1000 : 0;
+
+    return { total, connections: perConnection };
+  }
+
   // 헬퍼 메서드들
   async exists(table, conditions) {
     const keys = Object.keys(conditions);
@@ -33,6 +33,13 @@ module.exports = {
     upgradeTimeout: 10000,
     maxHttpBufferSize: 1e6,
     
+    // 웹 UI 브로드캐스트 묶음 전송
+    broadcastWindow: 100,     // 이 시간(ms) 동안 발생한 이벤트를 한 프레임으로
+    broadcastMaxBatch: 500,   // 이 개수를 넘으면 바로 전송
+    
+    // 응답 전 연결이 끊긴 명령을 재등록 시 다시 보내는 시간 (이보다 늦은 실행은 보내지 않음)
+    commandReplayWindow: 30000,
+    
     // 클라이언트 연결 해제 방지
     allowRequest: (req, callback) => {
       callback(null, true); // 모든 연결 허용
@@ -43,7 +50,10 @@ module.exports = {
   database: {
     filename: process.env.DB_FILE || './ue_cms.db',
     busyTimeout: 5000,
-    verbose: process.env.NODE_ENV === 'development'
+    verbose: process.env.NODE_ENV === 'development',
+    driver: process.env.DB_DRIVER || 'sqlite3',            // 'sqlite3' | 'better-sqlite3' (선택 설치)
+    readers: parseInt(process.env.DB_READERS || '4', 10),   // 읽기 전용 연결 수 (0이면 쓰기 연결에서 읽기)
+    statementCacheSize: 200                                 // 연결별 준비된 문장 캐시 크기 (LRU)
   },
   
   // 모니터링 설정 - 문서 정확히 따름
@@ -56,7 +66,59 @@ module.exports = {
     // 새로 추가할 설정들
     maxMissedHeartbeats: 3,        // 3번 놓치면 오프라인
     heartbeatGracePeriod: 60000,   // 1분 여유시간
-    reconnectionGracePeriod: 120000 // 2분 재연결 대기
+    reconnectionGracePeriod: 120000, // 2분 재연결 대기
+    heartbeatFlushInterval: 5000,  // 하트비트 last_seen 일괄 기록 주기
+    livenessSoftTimeout: 15000,    // 마지막 하트비트 후 connection_check까지 (하트비트 5초 x 3회)
+    livenessProbeTimeout: 5000     // connection_check 응답 대기 후 오프라인 처리
+  },
+  
+  // 예약 실행 (시계 동기화된 에이전트가 같은 서버 시각에 프로세스 실행)
+  launch: {
+    synchronized: process.env.SYNC_LAUNCH !== 'false',
+    leadTime: 500,                 // 명령 전송 후 실행 시각까지 (대상의 최대 왕복 시간 x 2가 더 길면 그 값)
+    reportTimeout: 10000           // 실행 시각 보고를 기다리는 시간 (이후 보고된 노드만으로 집계)
+  },
+  
+  // 단계별 프리셋 실행 (각 단계의 노드가 준비되면 다음 단계 실행)
+  stages: {
+    readyTimeout: 120000           // 단계의 준비 보고 대기 (프리셋 단계에 timeout이 없을 때)
+  },
+  
+  // 전원 상태 모니터링 설정 (프로세스 실행 없이 TCP/UDP로 호스트 도달 확인)
+  power: {
+    monitoring: process.env.POWER_MONITORING !== 'false',
+    tickInterval: 5000,            // 스윕 주기 (확인 시각이 된 호스트만 확인)
+    minInterval: 5000,             // 상태가 바뀐 호스트의 확인 간격
+    maxInterval: 120000,           // 상태가 그대로인 호스트는 간격을 두 배씩 늘려 여기까지
+    concurrency: 32,               // 동시에 확인하는 호스트 수
+    probeTimeout: 1500,            // 응답 대기 (연결 거부도 켜져 있는 것으로 판단)
+    probePorts: [445, 3389, 135],  // TCP 확인 포트 (Windows SMB / RDP / RPC)
+    probeUdpPort: 9,               // UDP 확인 포트 (닫힌 포트의 ICMP 응답으로 판단, null이면 사용 안 함)
+    
+    // Wake-on-LAN (브로드캐스트 소켓 하나로 웨이브 단위 전송)
+    wol: {
+      port: 9,
+      bindAddress: process.env.WOL_BIND_ADDRESS || undefined, // 보낼 네트워크 인터페이스 주소 (생략 시 전체)
+      prefixLength: parseInt(process.env.WOL_PREFIX_LENGTH || '24', 10), // 대상 IP로 서브넷 지정 브로드캐스트 주소 계산
+      globalBroadcast: process.env.WOL_GLOBAL_BROADCAST !== 'false', // 255.255.255.255로도 전송 (같은 L2 구간)
+      extraBroadcasts: [],         // 추가로 보낼 브로드캐스트 주소
+      repeats: 3,                  // 주소별 반복 전송 수 (UDP 유실 대비)
+      repeatInterval: 100,         // 반복 전송 간격
+      waveSize: 8,                 // 한 번에 깨우는 대수 (돌입 전류 분산)
+      waveInterval: 3000,          // 웨이브 간격
+      bootTimeout: 300000,         // 첫 생존 신호 대기 (이후 시간 초과 처리)
+      historySize: 20              // 보관하는 최근 작업 수
+    }
+  },
+  
+  // 실행 이력 보존 설정
+  retention: {
+    executionHistoryDays: parseInt(process.env.EXECUTION_HISTORY_DAYS || '30', 10), // 이 기간이 지난 이력은 보관 파일로 이동
+    rollupHourlyDays: 14,          // 이 기간이 지난 시간 단위 집계는 일 단위로 합침
+    archiveDir: process.env.ARCHIVE_DIR || './archive',
+    interval: 6 * 60 * 60 * 1000,  // 6시간마다 실행
+    startupDelay: 60000,           // 서버 시작 1분 뒤 첫 실행
+    batchSize: 5000                // 한 번에 읽고 지우는 행 수
   },
   
   // 로깅 설정
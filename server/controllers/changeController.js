@@ -0,0 +1,127 @@
+const db = require('../config/database');
+const ChangeLogModel = require('../models/ChangeLog');
+const ClientModel = require('../models/Client');
+const GroupModel = require('../models/Group');
+const PresetModel = require('../models/Preset');
+const ExecutionService = require('../services/executionService');
+const logger = require('../utils/logger');
+
+// 한 번에 돌려줄 최대 변경 건수 (남으면 hasMore로 이어서 요청)
+const CHANGE_PAGE_SIZE = 500;
+
+class ChangeController {
+  // 증분 변경 피드
+  // GET /api/changes?cursor=<seq>
+  // - cursor 없음: 현재 cursor만 반환 (reset: true → 전체 목록을 다시 받은 뒤 이 cursor부터 동기화)
+  // - cursor가 서버보다 앞서 있음(DB 초기화 등): reset: true
+  // - 변경 없음: DB 조회 없이 빈 응답
+  static async getChanges(req, res, next) {
+    try {
+      const { cursor, since } = req.query;
+
+      // 이전 방식(since 타임스탬프) 호환
+      if (cursor === undefined && since) {
+        return res.json(await ClientModel.getChanges(since));
+      }
+
+      const latest = ChangeLogModel.getLatestSeq();
+      const from = Number.parseInt(cursor, 10);
+
+      if (cursor === undefined || !Number.isFinite(from) || from < 0 || from > latest) {
+        return res.json({
+          cursor: latest,
+          hasMore: false,
+          reset: true,
+          timestamp: new Date().toISOString()
+        });
+      }
+
+      if (from === latest) {
+        return res.json(ChangeController.buildResponse(latest, false, {}));
+      }
+
+      const rows = await ChangeLogModel.getSince(from, CHANGE_PAGE_SIZE);
+      const hasMore = rows.length === CHANGE_PAGE_SIZE;
+      const nextCursor = rows.length > 0 ? rows[rows.length - 1].seq : from;
+
+      // 엔티티별로 마지막 변경만 남김
+      const latestOps = { client: new Map(), group: new Map(), preset: new Map() };
+      for (const row of rows) {
+        if (latestOps[row.entity]) {
+          latestOps[row.entity].set(row.entity_id, row.op);
+        }
+      }
+
+      const split = (ops) => {
+        const upserts = [];
+        const deletes = [];
+        for (const [id, op] of ops) {
+          (op === 'delete' ? deletes : upserts).push(id);
+        }
+        return { upserts, deletes };
+      };
+
+      const clients = split(latestOps.client);
+      const groups = split(latestOps.group);
+      const presets = split(latestOps.preset);
+
+      // 클라이언트 상태가 바뀌면 그 클라이언트를 대상으로 하는 프리셋의 상태도 바뀜
+      if (clients.upserts.length > 0) {
+        const affected = await ChangeController.findPresetsForClients(clients.upserts);
+        for (const id of affected) {
+          if (!latestOps.preset.has(id)) {
+            presets.upserts.push(id);
+          }
+        }
+      }
+
+      const changedClients = await ClientModel.findByIds(clients.upserts);
+      const changedGroups = await GroupModel.findByIds(groups.upserts);
+      const changedPresets = await ExecutionService.withStatusMany(await PresetModel.findByIds(presets.upserts));
+
+      res.json(ChangeController.buildResponse(nextCursor, hasMore, {
+        clients: { changed: changedClients, deleted: clients.deletes },
+        groups: { changed: changedGroups, deleted: groups.deletes },
+        presets: { changed: changedPresets, deleted: presets.deletes }
+      }));
+    } catch (error) {
+      logger.error('변경사항 조회 실패:', error);
+      next(error);
+    }
+  }
+
+  static async findPresetsForClients(clientIds) {
+    const ids = new Set();
+    for (let i = 0; i < clientIds.length; i += CHANGE_PAGE_SIZE) {
+      const chunk = clientIds.slice(i, i + CHANGE_PAGE_SIZE);
+      const rows = await db.all(
+        `SELECT DISTINCT p.id FROM presets p
+         JOIN group_clients gc ON gc.group_id = p.target_group_id
+         WHERE gc.client_id IN (${chunk.map(() => '?').join(', ')})`,
+        chunk
+      );
+      for (const row of rows) ids.add(row.id);
+    }
+    return [...ids];
+  }
+
+  static buildResponse(cursor, hasMore, { clients, groups, presets }) {
+    const empty = { changed: [], deleted: [] };
+    clients = clients || empty;
+
+    return {
+      cursor,
+      hasMore,
+      reset: false,
+      clients,
+      groups: groups || empty,
+      presets: presets || empty,
+      // 이전 응답 형식 호환 (클라이언트 변경만)
+      changed: clients.changed,
+      deleted: clients.deleted,
+      timestamp: new Date().toISOString()
+    };
+  }
+}
+
+module.exports = ChangeController;
@@ -1,8 +1,32 @@
 const PresetModel = require('../models/Preset');
 const ExecutionService = require('../services/executionService');
 const socketService = require('../services/socketService');
+const stageService = require('../services/stageService');
 const logger = require('../utils/logger');
 
+// 단계 구성 검사 - [{ name?, client_ids: [...], ready?: { port | window | log + marker }, timeout? }]
+// 문제가 있으면 오류 메시지, 없으면 null
+function validateStages(stages) {
+  if (stages === undefined || stages === null) return null;
+  if (!Array.isArray(stages)) return '단계 구성은 배열이어야 합니다.';
+  
+  for (const [index, stage] of stages.entries()) {
+    if (!stage || !Array.isArray(stage.client_ids) || stage.client_ids.length === 0) {
+      return `단계 ${index + 1}에 클라이언트가 없습니다.`;
+    }
+    if (stage.ready) {
+      const { port, window, log, marker } = stage.ready;
+      if (!port && !window && !(log && marker)) {
+        return `단계 ${index + 1}의 준비 확인 조건은 port, window, log + marker 중 하나가 필요합니다.`;
+      }
+    }
+    if (stage.timeout !== undefined && !(Number(stage.timeout) > 0)) {
+      return `단계 ${index + 1}의 timeout이 올바르지 않습니다.`;
+    }
+  }
+  return null;
+}
+
 class PresetController {
   // 모든 프리셋 조회
   static async getAll(req, res, next) {
@@ -10,25 +34,7 @@ class PresetController {
       const presets = await PresetModel.findAll();
       
       // 각 프리셋의 현재 상태 계산
-      const presetsWithStatus = await Promise.all(
-        presets.map(async (preset) => {
-          try {
-            const status = await ExecutionService.getPresetStatus(preset.id);
-            return {
-              ...preset,
-              status: status.status,
-              is_running: status.status === 'running' || status.status === 'partial'
-            };
-          } catch (error) {
-            logger.error(`프리셋 ${preset.id} 상태 조회 실패:`, error);
-            return {
-              ...preset,
-              status: 'unknown',
-              is_running: false
-            };
-          }
-        })
-      );
+      const presetsWithStatus = await ExecutionService.withStatusMany(presets);
       
       res.json(presetsWithStatus);
     } catch (error) {
@@ -40,7 +46,7 @@ class PresetController {
   // 프리셋 생성
   static async create(req, res, next) {
     try {
-      const { name, description, target_group_id, client_commands } = req.body;
+      const { name, description, target_group_id, client_commands, stages } = req.body;
       
       // 유효성 검사
       if (!name || !target_group_id || !client_commands || Object.keys(client_commands).length === 0) {
@@ -48,9 +54,13 @@ class PresetController {
           error: '프리셋 이름, 대상 그룹, 명령어는 필수입니다.' 
         });
       }
+      const stagesError = validateStages(stages);
+      if (stagesError) {
+        return res.status(400).json({ error: stagesError });
+      }
 
       const preset = await PresetModel.create({
-        name, description, target_group_id, client_commands
+        name, description, target_group_id, client_commands, stages
       });
       
       // Socket.IO 이벤트 전송
@@ -68,16 +78,20 @@ class PresetController {
   static async update(req, res, next) {
     try {
       const { id } = req.params;
-      const { name, description, target_group_id, client_commands } = req.body;
+      const { name, description, target_group_id, client_commands, stages } = req.body;
       
       if (!name || !target_group_id || !client_commands || Object.keys(client_commands).length === 0) {
         return res.status(400).json({ 
           error: '프리셋 이름, 대상 그룹, 명령어는 필수입니다.' 
         });
       }
+      const stagesError = validateStages(stages);
+      if (stagesError) {
+        return res.status(400).json({ error: stagesError });
+      }
 
       const preset = await PresetModel.update(id, {
-        name, description, target_group_id, client_commands
+        name, description, target_group_id, client_commands, stages
       });
       
       // Socket.IO 이벤트 전송
@@ -179,6 +193,15 @@ class PresetController {
       next(error);
     }
   }
+
+  // 마지막 단계별 실행 진행 상황 (단계별 준비 시간, 클러스터 준비까지 시간)
+  static async getRun(req, res) {
+    const run = stageService.getRun(req.params.id);
+    if (!run) {
+      return res.status(404).json({ error: '단계별 실행 기록이 없습니다.' });
+    }
+    res.json(run);
+  }
 }
 
 module.exports = PresetController; 
\ No newline at end of file
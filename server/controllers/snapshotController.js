@@ -0,0 +1,35 @@
+const snapshotService = require('../services/snapshotService');
+const logger = require('../utils/logger');
+
+class SnapshotController {
+  // 대시보드 전체 상태 (GET /api/snapshot)
+  // ETag는 변경 로그 번호 기준이므로 변경이 없으면 304로 응답
+  static async getSnapshot(req, res, next) {
+    try {
+      const snapshot = await snapshotService.getSnapshot();
+
+      res.set({
+        'ETag': snapshot.etag,
+        'Cache-Control': 'no-cache',
+        'Vary': 'Accept-Encoding'
+      });
+
+      if (snapshotService.matches(req.headers['if-none-match'], snapshot)) {
+        snapshotService.stats.notModified++;
+        return res.status(304).end();
+      }
+
+      res.type('application/json');
+      if (req.acceptsEncodings('gzip') === 'gzip') {
+        res.set('Content-Encoding', 'gzip');
+        return res.send(snapshot.gzipBody);
+      }
+      res.send(snapshot.body);
+    } catch (error) {
+      logger.error('스냅샷 조회 실패:', error);
+      next(error);
+    }
+  }
+}
+
+module.exports = SnapshotController;
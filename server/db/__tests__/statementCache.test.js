@@ -0,0 +1,70 @@
+const StatementCache = require('../statementCache');
+
+describe('StatementCache', () => {
+  let evicted;
+  let cache;
+  const create = sql => ({ sql });
+
+  beforeEach(() => {
+    evicted = [];
+    cache = new StatementCache(2, statement => evicted.push(statement.sql));
+  });
+
+  test('prepares each SQL string once and reuses it', () => {
+    const first = cache.acquire('SELECT 1', create);
+    const second = cache.acquire('SELECT 1', create);
+
+    expect(second).toBe(first);
+    expect(cache.getStats()).toMatchObject({ size: 1, hits: 1, misses: 1, evictions: 0, hitRate: 0.5 });
+  });
+
+  test('evicts the least recently used statement and finalizes it', () => {
+    cache.acquire('A', create);
+    cache.acquire('B', create);
+    cache.acquire('A', create); // B가 가장 오래 쓰이지 않음
+    cache.acquire('C', create);
+
+    expect(evicted).toEqual(['B']);
+    expect(cache.size).toBe(2);
+
+    cache.acquire('D', create);
+    expect(evicted).toEqual(['B', 'A']);
+    expect(cache.getStats().evictions).toBe(2);
+  });
+
+  test('discard finalizes only the matching statement', () => {
+    const statement = cache.acquire('A', create);
+
+    cache.discard('A', { sql: 'other' });
+    expect(evicted).toEqual([]);
+    expect(cache.size).toBe(1);
+
+    cache.discard('A', statement);
+    expect(evicted).toEqual(['A']);
+    expect(cache.size).toBe(0);
+
+    cache.discard('missing');
+    expect(evicted).toEqual(['A']);
+  });
+
+  test('clear finalizes every statement while takeAll hands them back', () => {
+    cache.acquire('A', create);
+    cache.acquire('B', create);
+    cache.clear();
+    expect(evicted).toEqual(['A', 'B']);
+
+    cache.acquire('C', create);
+    expect(cache.takeAll()).toEqual([{ sql: 'C' }]);
+    expect(evicted).toEqual(['A', 'B']);
+    expect(cache.size).toBe(0);
+  });
+
+  test('capacity is at least one', () => {
+    const tiny = new StatementCache(0, statement => evicted.push(statement.sql));
+    tiny.acquire('A', create);
+    tiny.acquire('B', create);
+
+    expect(tiny.size).toBe(1);
+    expect(evicted).toEqual(['A']);
+  });
+});
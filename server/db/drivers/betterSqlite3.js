@@ -0,0 +1,94 @@
+const path = require('path');
+const { Worker } = require('worker_threads');
+
+// better-sqlite3 드라이버 (선택 설치)
+// 연결마다 워커 스레드 하나를 두고 메시지로 쿼리를 주고받는다.
+// SQLITE_DQS=0으로 빌드되어 큰따옴표 문자열(datetime("now"))은 오류가 난다. SQL 문자열 값은 작은따옴표로 쓴다.
+class BetterSqlite3Connection {
+  constructor(worker, options) {
+    this.worker = worker;
+    this.readonly = !!options.readonly;
+    this.nextId = 0;
+    this.pending = new Map(); // 요청 id -> { resolve, reject }
+
+    worker.on('message', ({ id, result, error }) => {
+      const request = this.pending.get(id);
+      if (!request) return;
+      this.pending.delete(id);
+      if (error) {
+        const err = new Error(error.message);
+        err.code = error.code;
+        request.reject(err);
+      } else {
+        request.resolve(result);
+      }
+    });
+
+    worker.on('error', (error) => this.failAll(error));
+    worker.on('exit', (code) => {
+      if (this.pending.size > 0) {
+        this.failAll(new Error(`데이터베이스 워커 종료 (code ${code})`));
+      }
+    });
+  }
+
+  static open(filename, options = {}) {
+    const worker = new Worker(path.join(__dirname, 'betterSqlite3Worker.js'), {
+      workerData: {
+        filename,
+        readonly: !!options.readonly,
+        busyTimeout: options.busyTimeout || 5000,
+        statementCacheSize: options.statementCacheSize || 200
+      }
+    });
+    const connection = new BetterSqlite3Connection(worker, options);
+
+    // 워커에서 연결이 열렸는지 확인
+    return connection.get('SELECT 1 AS ok').then(() => connection);
+  }
+
+  request(op, sql, params = []) {
+    return new Promise((resolve, reject) => {
+      const id = ++this.nextId;
+      this.pending.set(id, { resolve, reject });
+      this.worker.postMessage({ id, op, sql, params });
+    });
+  }
+
+  failAll(error) {
+    for (const { reject } of this.pending.values()) {
+      reject(error);
+    }
+    this.pending.clear();
+  }
+
+  run(sql, params) {
+    return this.request('run', sql, params);
+  }
+
+  get(sql, params) {
+    return this.request('get', sql, params);
+  }
+
+  all(sql, params) {
+    return this.request('all', sql, params);
+  }
+
+  exec(sql) {
+    return this.request('exec', sql);
+  }
+
+  getStatementStats() {
+    return this.request('stats');
+  }
+
+  async close() {
+    await this.request('close');
+    await this.worker.terminate();
+  }
+}
+
+module.exports = {
+  name: 'better-sqlite3',
+  open: (filename, options) => BetterSqlite3Connection.open(filename, options)
+};
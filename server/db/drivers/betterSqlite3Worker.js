@@ -0,0 +1,61 @@
+// better-sqlite3 연결 하나를 맡는 워커 스레드
+// better-sqlite3는 동기 API이므로 메인 이벤트 루프를 막지 않도록 연결마다 워커에서 실행한다.
+const { parentPort, workerData } = require('worker_threads');
+const Database = require('better-sqlite3');
+const StatementCache = require('../statementCache');
+
+const { filename, readonly, busyTimeout, statementCacheSize } = workerData;
+const db = new Database(filename, { readonly, fileMustExist: readonly, timeout: busyTimeout });
+// better-sqlite3 문장은 finalize가 없으므로 내보낼 때 별도 정리 없음
+const statements = new StatementCache(statementCacheSize);
+
+// node-sqlite3와 같이 boolean/undefined 값을 허용
+function normalizeParams(params = []) {
+  return params.map(value => {
+    if (value === undefined) return null;
+    if (typeof value === 'boolean') return value ? 1 : 0;
+    return value;
+  });
+}
+
+function execute({ op, sql, params }) {
+  if (op === 'exec') {
+    db.exec(sql);
+    return undefined;
+  }
+
+  if (op === 'stats') {
+    return statements.getStats();
+  }
+
+  const stmt = statements.acquire(sql, text => db.prepare(text));
+  params = normalizeParams(params);
+  if (op === 'run') {
+    // PRAGMA 등 결과 행을 돌려주는 문장도 run으로 실행할 수 있도록 처리
+    if (stmt.reader) {
+      stmt.all(params);
+      return { lastID: 0, changes: 0 };
+    }
+    const info = stmt.run(params);
+    return { lastID: Number(info.lastInsertRowid), changes: info.changes };
+  }
+  if (op === 'get') {
+    return stmt.get(params);
+  }
+  return stmt.all(params);
+}
+
+parentPort.on('message', (message) => {
+  if (message.op === 'close') {
+    db.close();
+    parentPort.postMessage({ id: message.id });
+    parentPort.close();
+    return;
+  }
+
+  try {
+    parentPort.postMessage({ id: message.id, result: execute(message) });
+  } catch (error) {
+    parentPort.postMessage({ id: message.id, error: { message: error.message, code: error.code } });
+  }
+});
@@ -0,0 +1,29 @@
+// 저장소 드라이버 선택
+// 드라이버는 open(filename, { readonly, busyTimeout })으로 연결을 열고,
+// 연결은 run(sql, params) -> { lastID, changes }, get, all, exec(sql), getStatementStats(), close()를 제공한다.
+// run/get/all은 SQL 문자열별로 준비된 문장을 캐시해 재사용한다 (db/statementCache.js).
+const DRIVERS = {
+  'sqlite3': () => require('./sqlite3'),
+  'better-sqlite3': () => {
+    // 선택 설치 패키지 - 없으면 예외
+    require.resolve('better-sqlite3');
+    return require('./betterSqlite3');
+  }
+};
+
+function loadDriver(name) {
+  const loader = DRIVERS[name];
+  if (!loader) {
+    console.warn(`⚠️ 알 수 없는 데이터베이스 드라이버 '${name}' - sqlite3 사용`);
+    return DRIVERS.sqlite3();
+  }
+
+  try {
+    return loader();
+  } catch (error) {
+    console.warn(`⚠️ 데이터베이스 드라이버 '${name}' 로드 실패 (${error.message}) - sqlite3 사용`);
+    return DRIVERS.sqlite3();
+  }
+}
+
+module.exports = { loadDriver };
@@ -0,0 +1,107 @@
+const sqlite3 = require('sqlite3').verbose();
+const StatementCache = require('../statementCache');
+
+// node-sqlite3 드라이버 (기본)
+// 연결마다 쿼리가 libuv 스레드 풀에서 실행되므로 연결을 여러 개 열면 읽기가 병렬로 처리된다.
+// 문장은 SQL 문자열별로 한 번만 준비해 캐시에 두고 재사용한다 (Statement는 자체 큐로 호출을 직렬화).
+class Sqlite3Connection {
+  constructor(handle, options) {
+    this.handle = handle;
+    this.readonly = !!options.readonly;
+    // 캐시 값은 준비 완료 Promise (준비 오류를 실행 호출자에게 그대로 전달하기 위함)
+    this.statements = new StatementCache(options.statementCacheSize || 200, (prepared) => {
+      prepared.then(stmt => stmt.finalize(), () => {});
+    });
+  }
+
+  static open(filename, options = {}) {
+    const mode = options.readonly
+      ? sqlite3.OPEN_READONLY
+      : sqlite3.OPEN_READWRITE | sqlite3.OPEN_CREATE;
+
+    return new Promise((resolve, reject) => {
+      const handle = new sqlite3.Database(filename, mode, (err) => {
+        if (err) {
+          reject(err);
+        } else {
+          if (options.busyTimeout) {
+            handle.configure('busyTimeout', options.busyTimeout);
+          }
+          resolve(new Sqlite3Connection(handle, options));
+        }
+      });
+    });
+  }
+
+  prepare(sql) {
+    return new Promise((resolve, reject) => {
+      const stmt = this.handle.prepare(sql, (err) => (err ? reject(err) : resolve(stmt)));
+    });
+  }
+
+  // 캐시된 문장으로 실행 - callback(this, result)는 Statement 콜백의 this(lastID, changes)와 결과를 받음
+  async execute(method, sql, params, callback) {
+    const prepared = this.statements.acquire(sql, text => this.prepare(text));
+    let stmt;
+    try {
+      stmt = await prepared;
+    } catch (err) {
+      // 준비에 실패한 SQL은 캐시에 남기지 않음
+      this.statements.discard(sql, prepared);
+      throw err;
+    }
+
+    return await new Promise((resolve, reject) => {
+      stmt[method](params, function(err, result) {
+        if (err) {
+          reject(err);
+        } else {
+          resolve(callback(this, result));
+        }
+      });
+      // get은 첫 행에서 멈추므로 커서를 바로 초기화 (열린 읽기 트랜잭션이 남아 있으면 WAL 스냅샷이 고정됨)
+      stmt.reset();
+    });
+  }
+
+  // { lastID, changes } 반환
+  run(sql, params = []) {
+    return this.execute('run', sql, params, (stmt) => ({ lastID: stmt.lastID, changes: stmt.changes }));
+  }
+
+  get(sql, params = []) {
+    return this.execute('get', sql, params, (stmt, row) => row);
+  }
+
+  all(sql, params = []) {
+    return this.execute('all', sql, params, (stmt, rows) => rows);
+  }
+
+  // 여러 문장 실행 (캐시하지 않음)
+  exec(sql) {
+    return new Promise((resolve, reject) => {
+      this.handle.exec(sql, (err) => (err ? reject(err) : resolve()));
+    });
+  }
+
+  async getStatementStats() {
+    return this.statements.getStats();
+  }
+
+  // 캐시된 문장을 모두 finalize한 뒤 연결 종료 (finalize되지 않은 문장이 있으면 close 실패)
+  async close() {
+    const prepared = this.statements.takeAll();
+    await Promise.all(prepared.map(p => p
+      .then(stmt => new Promise(resolve => stmt.finalize(() => resolve())))
+      .catch(() => {})));
+
+    return await new Promise((resolve, reject) => {
+      this.handle.close((err) => (err ? reject(err) : resolve()));
+    });
+  }
+}
+
+module.exports = {
+  name: 'sqlite3',
+  open: (filename, options) => Sqlite3Connection.open(filename, options)
+};
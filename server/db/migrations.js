@@ -86,13 +86,79 @@ const migrations = [
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
   )`,
   
+  // 변경 로그 (웹 UI 증분 동기화용, 엔티티별 최신 변경 한 건 + 삭제 기록)
+  `CREATE TABLE IF NOT EXISTS change_log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    entity TEXT NOT NULL,
+    entity_id INTEGER NOT NULL,
+    op TEXT NOT NULL DEFAULT 'upsert',
+    changed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+  )`,
+  
+  // 그룹 실행 단위 이력 (성공/실패 수는 카운터로 유지)
+  `CREATE TABLE IF NOT EXISTS execution_runs (
+    id TEXT PRIMARY KEY,
+    preset_id INTEGER,
+    preset_name TEXT,
+    group_id INTEGER,
+    status TEXT DEFAULT 'running',
+    total_clients INTEGER DEFAULT 0,
+    successful_count INTEGER DEFAULT 0,
+    failed_count INTEGER DEFAULT 0,
+    started_at DATETIME,
+    completed_at DATETIME,
+    duration_seconds REAL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+  )`,
+  
+  // 실행별 클라이언트 결과 (success NULL은 결과 대기)
+  `CREATE TABLE IF NOT EXISTS execution_run_results (
+    run_id TEXT NOT NULL,
+    client_id INTEGER NOT NULL,
+    success INTEGER,
+    error_message TEXT,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (run_id, client_id),
+    FOREIGN KEY (run_id) REFERENCES execution_runs (id) ON DELETE CASCADE
+  )`,
+  
+  // 실행 이력 집계 (시간/일 단위 버킷, 프리셋 없음은 preset_id 0)
+  `CREATE TABLE IF NOT EXISTS execution_rollups (
+    granularity TEXT NOT NULL,
+    bucket_start DATETIME NOT NULL,
+    preset_id INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (granularity, bucket_start, preset_id, status)
+  )`,
+  
+  // 상태별 전체 실행 수
+  `CREATE TABLE IF NOT EXISTS execution_status_totals (
+    status TEXT PRIMARY KEY,
+    count INTEGER NOT NULL DEFAULT 0
+  )`,
+  
+  // 클라이언트 전원 상태 (전원 모니터가 바뀐 상태만 기록)
+  `CREATE TABLE IF NOT EXISTS client_power_state (
+    client_id INTEGER PRIMARY KEY,
+    power_state TEXT NOT NULL,
+    changed_at DATETIME,
+    last_check DATETIME,
+    method TEXT,
+    FOREIGN KEY (client_id) REFERENCES clients (id) ON DELETE CASCADE
+  )`,
+  
   // 기본 인덱스들
   `CREATE INDEX IF NOT EXISTS idx_clients_ip ON clients(ip_address)`,
+  `CREATE INDEX IF NOT EXISTS idx_clients_name_nocase ON clients(name COLLATE NOCASE)`,
   `CREATE INDEX IF NOT EXISTS idx_clients_status ON clients(status)`,
   `CREATE INDEX IF NOT EXISTS idx_ip_mac_history_ip ON ip_mac_history(ip_address)`,
   `CREATE INDEX IF NOT EXISTS idx_ip_mac_history_mac ON ip_mac_history(mac_address)`,
   `CREATE INDEX IF NOT EXISTS idx_ip_name_history_ip ON ip_name_history(ip_address)`,
-  `CREATE INDEX IF NOT EXISTS idx_execution_history_time ON execution_history(executed_at)`
+  `CREATE INDEX IF NOT EXISTS idx_execution_history_time ON execution_history(executed_at)`,
+  `CREATE INDEX IF NOT EXISTS idx_change_log_entity ON change_log(entity, entity_id)`,
+  `CREATE INDEX IF NOT EXISTS idx_execution_runs_started ON execution_runs(started_at)`,
+  `CREATE INDEX IF NOT EXISTS idx_execution_runs_preset ON execution_runs(preset_id, started_at)`
 ];
 
 // 추가 마이그레이션 (컬럼 추가)
@@ -102,6 +168,7 @@ const additionalMigrations = [
   `ALTER TABLE clients ADD COLUMN status_changed_at DATETIME DEFAULT CURRENT_TIMESTAMP`,
   `ALTER TABLE presets ADD COLUMN last_executed_at DATETIME`,
   `ALTER TABLE presets ADD COLUMN is_running BOOLEAN DEFAULT false`,
+  `ALTER TABLE presets ADD COLUMN stages TEXT`,
   
   // 추가 인덱스들
   `CREATE INDEX IF NOT EXISTS idx_clients_updated_at ON clients(updated_at)`,
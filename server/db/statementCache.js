@@ -0,0 +1,81 @@
+// SQL 문자열 -> 준비된 문장 LRU 캐시
+// Map의 삽입 순서를 사용해 가장 오래 쓰이지 않은 문장부터 내보내고, 내보낸 문장은 onEvict로 정리(finalize)한다.
+class StatementCache {
+  constructor(capacity, onEvict = () => {}) {
+    this.capacity = Math.max(1, capacity);
+    this.onEvict = onEvict;
+    this.entries = new Map(); // sql -> { statement, uses }
+    this.stats = { hits: 0, misses: 0, evictions: 0 };
+  }
+
+  get size() {
+    return this.entries.size;
+  }
+
+  // 캐시에 없으면 create(sql)로 준비해서 넣음
+  acquire(sql, create) {
+    const cached = this.entries.get(sql);
+    if (cached) {
+      this.stats.hits++;
+      cached.uses++;
+      // 최근 사용으로 이동
+      this.entries.delete(sql);
+      this.entries.set(sql, cached);
+      return cached.statement;
+    }
+
+    this.stats.misses++;
+    const statement = create(sql);
+    this.entries.set(sql, { statement, uses: 1 });
+
+    if (this.entries.size > this.capacity) {
+      const [oldestSql, oldest] = this.entries.entries().next().value;
+      this.entries.delete(oldestSql);
+      this.stats.evictions++;
+      this.onEvict(oldest.statement);
+    }
+    return statement;
+  }
+
+  // 준비 실패 등으로 더 쓸 수 없는 문장 제거 (statement를 주면 같은 문장일 때만)
+  discard(sql, statement) {
+    const cached = this.entries.get(sql);
+    if (cached && (statement === undefined || cached.statement === statement)) {
+      this.entries.delete(sql);
+      this.onEvict(cached.statement);
+    }
+  }
+
+  // 정리는 호출자가 직접 (완료를 기다려야 하는 경우)
+  takeAll() {
+    const statements = Array.from(this.entries.values(), entry => entry.statement);
+    this.entries.clear();
+    return statements;
+  }
+
+  clear() {
+    for (const { statement } of this.entries.values()) {
+      this.onEvict(statement);
+    }
+    this.entries.clear();
+  }
+
+  getStats(top = 10) {
+    const total = this.stats.hits + this.stats.misses;
+    const hot = Array.from(this.entries, ([sql, { uses }]) => ({ sql: sql.replace(/\s+/g, ' ').trim(), uses }))
+      .sort((a, b) => b.uses - a.uses)
+      .slice(0, top);
+
+    return {
+      size: this.entries.size,
+      capacity: this.capacity,
+      hits: this.stats.hits,
+      misses: this.stats.misses,
+      evictions: this.stats.evictions,
+      hitRate: total > 0 ? Math.round((this.stats.hits / total) * 1000) / 1000 : 0,
+      hot
+    };
+  }
+}
+
+module.exports = StatementCache;
@@ -44,7 +44,7 @@ db.get('SELECT * FROM clients WHERE name = ?', ['motiondjHome'], (err, client) =
           
           // 현재 클라이언트 ID에 MAC 주소 저장
           db.run(
-            'INSERT OR REPLACE INTO client_power_info (client_id, mac_address, updated_at, is_manual) VALUES (?, ?, datetime("now"), ?)',
+            `INSERT OR REPLACE INTO client_power_info (client_id, mac_address, updated_at, is_manual) VALUES (?, ?, datetime('now'), ?)`,
             [client.id, oldPowerInfo.mac_address, oldPowerInfo.is_manual],
             function(err) {
               if (err) {
@@ -43,7 +43,7 @@ app.put('/api/clients/:id/mac-address', (req, res) => {
       // MAC 주소 저장 또는 업데이트
       const isManualFlag = is_manual ? 1 : 0;
       db.run(
-        'INSERT OR REPLACE INTO client_power_info (client_id, mac_address, updated_at, is_manual) VALUES (?, ?, datetime("now"), ?)',
+        `INSERT OR REPLACE INTO client_power_info (client_id, mac_address, updated_at, is_manual) VALUES (?, ?, datetime('now'), ?)`,
         [id, mac_address, isManualFlag],
         function(err) {
           if (err) {
@@ -0,0 +1,68 @@
+const db = require('../config/database');
+const logger = require('../utils/logger');
+
+// 마지막으로 기록된 변경 번호 (변경이 없으면 DB 조회 없이 응답하기 위함)
+let latestSeq = 0;
+
+// 클라이언트/그룹/프리셋 변경 로그
+// 엔티티마다 가장 최근 변경 한 건만 남기므로(이전 기록은 삭제) 테이블 크기는 엔티티 수 + 삭제 기록 수를 넘지 않는다.
+// 웹 UI는 마지막으로 받은 seq(cursor) 이후의 변경만 받아 간다.
+class ChangeLogModel {
+  static async initialize() {
+    const row = await db.get('SELECT MAX(seq) as seq FROM change_log');
+    latestSeq = (row && row.seq) || 0;
+  }
+
+  static getLatestSeq() {
+    return latestSeq;
+  }
+
+  // 변경 기록 (op: 'upsert' | 'delete')
+  // 변경 로그 기록 실패가 원래 작업을 실패시키지 않도록 오류는 로그만 남김
+  static async record(entity, ids, op = 'upsert') {
+    const entityIds = (Array.isArray(ids) ? ids : [ids]).filter(id => id !== undefined && id !== null);
+    if (entityIds.length === 0) return;
+
+    try {
+      // 행당 바인딩 변수 3개 - SQLite 한도(999)를 넘지 않도록 나누어 실행
+      const chunkSize = 300;
+      for (let i = 0; i < entityIds.length; i += chunkSize) {
+        const chunk = entityIds.slice(i, i + chunkSize);
+
+        await db.run(
+          `DELETE FROM change_log WHERE entity = ? AND entity_id IN (${chunk.map(() => '?').join(', ')})`,
+          [entity, ...chunk]
+        );
+
+        const params = [];
+        for (const id of chunk) {
+          params.push(entity, id, op);
+        }
+        const result = await db.run(
+          `INSERT INTO change_log (entity, entity_id, op) VALUES ${chunk.map(() => '(?, ?, ?)').join(', ')}`,
+          params
+        );
+
+        // 호출자의 트랜잭션이 롤백되면 그 seq는 다시 쓰이므로 커밋된 뒤에만 반영
+        const seq = result.lastID;
+        db.afterCommit(() => {
+          if (seq > latestSeq) {
+            latestSeq = seq;
+          }
+        });
+      }
+    } catch (error) {
+      logger.error(`변경 로그 기록 실패 (${entity} ${op}):`, error);
+    }
+  }
+
+  // cursor 이후의 변경 조회
+  static async getSince(cursor, limit = 500) {
+    return await db.all(
+      'SELECT seq, entity, entity_id, op FROM change_log WHERE seq > ? ORDER BY seq LIMIT ?',
+      [cursor, limit]
+    );
+  }
+}
+
+module.exports = ChangeLogModel;
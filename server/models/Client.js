@@ -1,28 +1,46 @@
 const db = require('../config/database');
 const logger = require('../utils/logger');
+const clientRegistry = require('../services/clientRegistry');
+const dispatchPlanCache = require('../services/dispatchPlanCache');
+const ChangeLogModel = require('./ChangeLog');
+
+// 일괄 UPDATE 한 번에 묶을 최대 행 수
+const BULK_CHUNK_SIZE = 500;
 
 class ClientModel {
   // 모든 클라이언트 조회 (MAC 주소 포함)
+  // MAC 주소는 레지스트리의 "클라이언트별 최신 MAC" 뷰에서 붙이므로 쿼리는 한 번
   static async findAll() {
-    const query = `
-      SELECT 
-        c.*,
-        cpi.mac_address,
-        cpi.is_manual as mac_is_manual
-      FROM clients c
-      LEFT JOIN (
-        SELECT client_id, mac_address, is_manual, updated_at 
-        FROM client_power_info cpi1 
-        WHERE updated_at = (
-          SELECT MAX(updated_at) 
-          FROM client_power_info cpi2 
-          WHERE cpi2.client_id = cpi1.client_id
-        )
-      ) cpi ON c.id = cpi.client_id
-      ORDER BY c.id
-    `;
+    const clients = await db.all('SELECT * FROM clients ORDER BY id');
+    return this.withMacAddresses(clients);
+  }
+
+  // 여러 ID의 클라이언트 조회 (findAll과 같은 형태, 변경 피드용)
+  static async findByIds(ids) {
+    if (!ids || ids.length === 0) {
+      return [];
+    }
     
-    return await db.all(query);
+    const rows = [];
+    for (let i = 0; i < ids.length; i += BULK_CHUNK_SIZE) {
+      const chunk = ids.slice(i, i + BULK_CHUNK_SIZE);
+      rows.push(...await db.all(
+        `SELECT * FROM clients WHERE id IN (${chunk.map(() => '?').join(', ')}) ORDER BY id`,
+        chunk
+      ));
+    }
+    
+    return this.withMacAddresses(rows);
+  }
+
+  // 클라이언트 행에 mac_address, mac_is_manual 컬럼 추가
+  static withMacAddresses(clients) {
+    for (const client of clients) {
+      const mac = clientRegistry.getMac(client.id);
+      client.mac_address = mac ? mac.mac_address : null;
+      client.mac_is_manual = mac ? mac.is_manual : null;
+    }
+    return clients;
   }
 
   // 클라이언트 변경사항 조회 (문서에 나온 API)
@@ -34,22 +52,9 @@ class ClientModel {
       if (since) {
         // ISO 8601 형식의 시간을 파싱하여 해당 시간 이후 변경된 클라이언트만 반환
         query = `
-          SELECT 
-            c.*,
-            cpi.mac_address,
-            cpi.is_manual as mac_is_manual
-          FROM clients c
-          LEFT JOIN (
-            SELECT client_id, mac_address, is_manual, updated_at 
-            FROM client_power_info cpi1 
-            WHERE updated_at = (
-              SELECT MAX(updated_at) 
-              FROM client_power_info cpi2 
-              WHERE cpi2.client_id = cpi1.client_id
-            )
-          ) cpi ON c.id = cpi.client_id
-          WHERE c.updated_at > ? OR c.last_seen > ? OR c.status_changed_at > ?
-          ORDER BY c.id
+          SELECT * FROM clients
+          WHERE updated_at > ? OR last_seen > ? OR status_changed_at > ?
+          ORDER BY id
         `;
         params = [since, since, since];
       } else {
@@ -57,7 +62,7 @@ class ClientModel {
         return await this.findAll();
       }
       
-      const changed = await db.all(query, params);
+      const changed = this.withMacAddresses(await db.all(query, params));
       
       // 삭제된 클라이언트는 별도 테이블에서 관리하지 않으므로 빈 배열 반환
       const deleted = [];
@@ -73,19 +78,37 @@ class ClientModel {
     }
   }
 
-  // ID로 클라이언트 조회
+  // ID로 클라이언트 조회 (레지스트리 우선, 없으면 DB)
   static async findById(id) {
-    return await db.get('SELECT * FROM clients WHERE id = ?', [id]);
+    const cached = clientRegistry.getById(id);
+    if (cached) return cached;
+    
+    const client = await db.get('SELECT * FROM clients WHERE id = ?', [id]);
+    // 트랜잭션 안에서 읽은 행은 커밋된 뒤에 캐시 (롤백되면 없던 행)
+    db.afterCommit(() => clientRegistry.set(client));
+    return client;
   }
 
   // 이름으로 클라이언트 조회 (대소문자 구분 없음)
   static async findByName(name) {
-    return await db.get('SELECT * FROM clients WHERE LOWER(name) = LOWER(?)', [name]);
+    const cached = clientRegistry.getByName(name);
+    if (cached) return cached;
+    
+    const client = await db.get('SELECT * FROM clients WHERE name = ? COLLATE NOCASE', [name]);
+    // 트랜잭션 안에서 읽은 행은 커밋된 뒤에 캐시 (롤백되면 없던 행)
+    db.afterCommit(() => clientRegistry.set(client));
+    return client;
   }
 
   // IP로 클라이언트 조회
   static async findByIP(ip) {
-    return await db.get('SELECT * FROM clients WHERE ip_address = ?', [ip]);
+    const cached = clientRegistry.getByIP(ip);
+    if (cached) return cached;
+    
+    const client = await db.get('SELECT * FROM clients WHERE ip_address = ? ORDER BY id LIMIT 1', [ip]);
+    // 트랜잭션 안에서 읽은 행은 커밋된 뒤에 캐시 (롤백되면 없던 행)
+    db.afterCommit(() => clientRegistry.set(client));
+    return client;
   }
 
   // 클라이언트 생성
@@ -94,7 +117,15 @@ class ClientModel {
     
     return await db.transaction(async () => {
       // 같은 이름의 기존 클라이언트 삭제
+      const replaced = await db.get('SELECT id FROM clients WHERE name = ?', [name]);
       await db.run('DELETE FROM clients WHERE name = ?', [name]);
+      db.afterCommit(() => {
+        clientRegistry.removeByName(name);
+        dispatchPlanCache.invalidateAll();
+      });
+      if (replaced) {
+        await ChangeLogModel.record('client', replaced.id, 'delete');
+      }
       
       // 새 클라이언트 생성
       const result = await db.run(
@@ -103,6 +134,7 @@ class ClientModel {
       );
       
       if (result && result.lastID) {
+        await ChangeLogModel.record('client', result.lastID);
         return await this.findById(result.lastID);
       } else {
         throw new Error('클라이언트 생성 실패: lastID를 가져올 수 없습니다.');
@@ -122,14 +154,20 @@ class ClientModel {
 
     // 업데이트
     await db.run(
-      'UPDATE clients SET name = ?, ip_address = ?, port = ?, updated_at = datetime("now") WHERE id = ?',
+      `UPDATE clients SET name = ?, ip_address = ?, port = ?, updated_at = datetime('now') WHERE id = ?`,
       [name, ip_address, port, id]
     );
+    const updatedAt = clientRegistry.now();
+    db.afterCommit(() => {
+      clientRegistry.patch(id, { name, ip_address, port, updated_at: updatedAt });
+      dispatchPlanCache.invalidateAll();
+    });
+    await ChangeLogModel.record('client', id);
 
     // 이름이 변경된 경우 히스토리 저장
     if (name !== existing.name) {
       await db.run(
-        'INSERT OR REPLACE INTO ip_name_history (ip_address, user_modified_name, original_name, last_used) VALUES (?, ?, ?, datetime("now"))',
+        `INSERT OR REPLACE INTO ip_name_history (ip_address, user_modified_name, original_name, last_used) VALUES (?, ?, ?, datetime('now'))`,
         [ip_address, name, existing.name]
       );
     }
@@ -145,8 +183,17 @@ class ClientModel {
         throw new Error('클라이언트를 찾을 수 없습니다.');
       }
 
+      // 소속 그룹의 클라이언트 목록도 바뀜
+      const groups = await db.all('SELECT group_id FROM group_clients WHERE client_id = ?', [id]);
+      
       // 관련 데이터 삭제 (CASCADE 설정으로 자동 처리)
       const result = await db.run('DELETE FROM clients WHERE id = ?', [id]);
+      db.afterCommit(() => {
+        clientRegistry.remove(id);
+        dispatchPlanCache.invalidateAll();
+      });
+      await ChangeLogModel.record('client', id, 'delete');
+      await ChangeLogModel.record('group', groups.map(g => g.group_id));
       
       return result.changes > 0;
     });
@@ -156,7 +203,7 @@ class ClientModel {
   static async updateStatus(id, status) {
     try {
       const result = await db.run(
-        'UPDATE clients SET status = ?, status_changed_at = datetime("now"), updated_at = datetime("now") WHERE id = ?',
+        `UPDATE clients SET status = ?, status_changed_at = datetime('now'), updated_at = datetime('now') WHERE id = ?`,
         [status, id]
       );
       
@@ -164,6 +211,10 @@ class ClientModel {
         return { success: false, error: '클라이언트를 찾을 수 없습니다' };
       }
       
+      const now = clientRegistry.now();
+      db.afterCommit(() => clientRegistry.patch(id, { status, status_changed_at: now, updated_at: now }));
+      await ChangeLogModel.record('client', id);
+      
       return { success: true };
     } catch (error) {
       logger.error('클라이언트 상태 업데이트 실패:', error);
@@ -171,6 +222,90 @@ class ClientModel {
     }
   }
 
+  // 여러 클라이언트 상태 일괄 업데이트 (프리셋 실행/정지용)
+  // currentPresetId를 넘기면 current_preset_id도 같은 UPDATE로 함께 변경 (null이면 초기화)
+  static async updateStatusMany(ids, status, currentPresetId) {
+    if (!ids || ids.length === 0) return 0;
+    
+    const setPreset = currentPresetId !== undefined;
+    let changes = 0;
+    
+    // SQLite 바인딩 변수 한도(999)를 넘지 않도록 나누어 실행
+    for (let i = 0; i < ids.length; i += BULK_CHUNK_SIZE) {
+      const chunk = ids.slice(i, i + BULK_CHUNK_SIZE);
+      const placeholders = chunk.map(() => '?').join(', ');
+      const params = setPreset ? [status, currentPresetId, ...chunk] : [status, ...chunk];
+      
+      const result = await db.run(
+        `UPDATE clients SET status = ?, ${setPreset ? 'current_preset_id = ?, ' : ''}status_changed_at = datetime('now'), updated_at = datetime('now') WHERE id IN (${placeholders})`,
+        params
+      );
+      changes += result.changes;
+    }
+    
+    const now = clientRegistry.now();
+    const fields = { status, status_changed_at: now, updated_at: now };
+    if (setPreset) {
+      fields.current_preset_id = currentPresetId;
+    }
+    // 호출자의 트랜잭션(프리셋 실행/정지)이 커밋된 뒤에 캐시 반영
+    db.afterCommit(() => {
+      for (const id of ids) {
+        clientRegistry.patch(id, fields);
+      }
+    });
+    await ChangeLogModel.record('client', ids);
+    
+    return changes;
+  }
+
+  // 하트비트 last_seen 일괄 기록 (lastSeenById: Map<id, 'YYYY-MM-DD HH:MM:SS'>)
+  // 클라이언트마다 값이 다르므로 CASE 식 하나로 묶어 UPDATE 한 번에 처리
+  static async updateLastSeenMany(lastSeenById) {
+    const entries = Array.from(lastSeenById.entries());
+    if (entries.length === 0) return 0;
+    
+    let changes = 0;
+    // 행당 바인딩 변수 3개 - SQLite 한도(999)를 넘지 않도록 나누어 실행
+    const chunkSize = 300;
+    for (let i = 0; i < entries.length; i += chunkSize) {
+      const chunk = entries.slice(i, i + chunkSize);
+      const cases = chunk.map(() => 'WHEN ? THEN ?').join(' ');
+      const placeholders = chunk.map(() => '?').join(', ');
+      const params = [];
+      for (const [id, lastSeen] of chunk) {
+        params.push(id, lastSeen);
+      }
+      for (const [id] of chunk) {
+        params.push(id);
+      }
+      
+      const result = await db.run(
+        `UPDATE clients SET last_seen = CASE id ${cases} END WHERE id IN (${placeholders})`,
+        params
+      );
+      changes += result.changes;
+    }
+    
+    db.afterCommit(() => {
+      for (const [id, lastSeen] of entries) {
+        clientRegistry.patch(id, { last_seen: lastSeen });
+      }
+    });
+    
+    return changes;
+  }
+
+  // 현재 실행 중인 프리셋 설정 (null이면 초기화)
+  static async setCurrentPreset(id, presetId) {
+    await db.run(
+      'UPDATE clients SET current_preset_id = ? WHERE id = ?',
+      [presetId, id]
+    );
+    db.afterCommit(() => clientRegistry.patch(id, { current_preset_id: presetId }));
+    await ChangeLogModel.record('client', id);
+  }
+
   // 하트비트 업데이트
   static async updateHeartbeat(name, ip_address, port = 8081) {
     // 기존 클라이언트 확인
@@ -179,9 +314,26 @@ class ClientModel {
     if (client) {
       // 기존 클라이언트 업데이트
       await db.run(
-        'UPDATE clients SET ip_address = ?, port = ?, status = ?, last_seen = datetime("now"), updated_at = datetime("now"), status_changed_at = datetime("now") WHERE id = ?',
+        `UPDATE clients SET ip_address = ?, port = ?, status = ?, last_seen = datetime('now'), updated_at = datetime('now'), status_changed_at = datetime('now') WHERE id = ?`,
         [ip_address, port, 'online', client.id]
       );
+      const ipChanged = client.ip_address !== ip_address;
+      const now = clientRegistry.now();
+      const clientId = client.id;
+      db.afterCommit(() => {
+        if (ipChanged) {
+          dispatchPlanCache.invalidateAll();
+        }
+        clientRegistry.patch(clientId, {
+          ip_address,
+          port,
+          status: 'online',
+          last_seen: now,
+          updated_at: now,
+          status_changed_at: now
+        });
+      });
+      await ChangeLogModel.record('client', client.id);
       return await this.findById(client.id);
     } else {
       // 새 클라이언트 자동 등록
@@ -198,10 +350,7 @@ class ClientModel {
   // MAC 주소 업데이트
   static async updateMacAddress(id, macAddress, isManual = false) {
     // 기존 MAC 주소 정보 확인
-    const existing = await db.get(
-      'SELECT mac_address, is_manual FROM client_power_info WHERE client_id = ?',
-      [id]
-    );
+    const existing = clientRegistry.getMac(id);
     
     // 수동 입력된 MAC 주소가 있으면 자동 수집으로 덮어쓰지 않음
     if (existing && existing.is_manual && !isManual) {
@@ -215,15 +364,18 @@ class ClientModel {
     
     // MAC 주소 저장 또는 업데이트
     await db.run(
-      'INSERT OR REPLACE INTO client_power_info (client_id, mac_address, updated_at, is_manual) VALUES (?, ?, datetime("now"), ?)',
+      `INSERT OR REPLACE INTO client_power_info (client_id, mac_address, updated_at, is_manual) VALUES (?, ?, datetime('now'), ?)`,
       [id, macAddress, isManual ? 1 : 0]
     );
+    db.afterCommit(() => clientRegistry.setMac(id, macAddress, isManual));
+    
+    await ChangeLogModel.record('client', id);
     
     // IP 주소 히스토리에도 저장
     const client = await this.findById(id);
     if (client) {
       await db.run(
-        'INSERT OR REPLACE INTO ip_mac_history (ip_address, mac_address, is_manual, last_used) VALUES (?, ?, ?, datetime("now"))',
+        `INSERT OR REPLACE INTO ip_mac_history (ip_address, mac_address, is_manual, last_used) VALUES (?, ?, ?, datetime('now'))`,
         [client.ip_address, macAddress, isManual ? 1 : 0]
       );
     }
@@ -239,26 +391,8 @@ class ClientModel {
   // 온라인 클라이언트 조회
   static async findOnlineClients() {
     return await db.all(
-      'SELECT * FROM clients WHERE status IN ("online", "running") ORDER BY name'
-    );
-  }
-
-  // 오프라인 처리 (문서 4번 정확히 따름)
-  static async markOfflineByTimeout(timeoutMs = 300000) {  // 5분으로 증가
-    const cutoffTime = new Date(Date.now() - timeoutMs).toISOString();
-    
-    // 더 엄격한 조건으로 변경 - 정말 오래된 것만 오프라인 처리
-    const result = await db.run(
-      `UPDATE clients 
-       SET status = "offline" 
-       WHERE status = "online" 
-       AND last_seen < ? 
-       AND last_seen IS NOT NULL`,  // NULL 체크 추가
-      [cutoffTime]
+      `SELECT * FROM clients WHERE status IN ('online', 'running') ORDER BY name`
     );
-    
-    logger.info(`하트비트 타임아웃으로 ${result.changes}개 클라이언트 오프라인 처리`);
-    return result.changes;
   }
 }
 
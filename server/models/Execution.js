@@ -1,4 +1,5 @@
 const db = require('../config/database');
+const ExecutionRollupModel = require('./ExecutionRollup');
 
 class ExecutionModel {
   // 실행 이력 조회
@@ -50,52 +51,35 @@ class ExecutionModel {
 
   // 실행 기록 생성
   static async create(presetId, clientId, status) {
-    const result = await db.run(
-      'INSERT INTO execution_history (preset_id, client_id, status) VALUES (?, ?, ?)',
-      [presetId, clientId, status]
-    );
-    
-    return result.lastID;
+    return await db.transaction(async () => {
+      const result = await db.run(
+        'INSERT INTO execution_history (preset_id, client_id, status) VALUES (?, ?, ?)',
+        [presetId, clientId, status]
+      );
+      await ExecutionRollupModel.add([{ presetId, status }]);
+      
+      return result.lastID;
+    });
   }
 
-  // 실행 상태 업데이트
+  // 실행 상태 업데이트 (집계의 이전 상태 -> 새 상태 이동 포함)
   static async updateStatus(id, status, result = null) {
-    await db.run(
-      'UPDATE execution_history SET status = ?, result = ? WHERE id = ?',
-      [status, result, id]
-    );
+    await db.transaction(async () => {
+      const previous = await db.get(
+        'SELECT preset_id, status, executed_at FROM execution_history WHERE id = ?',
+        [id]
+      );
+      await db.run(
+        'UPDATE execution_history SET status = ?, result = ? WHERE id = ?',
+        [status, result, id]
+      );
+      await ExecutionRollupModel.move(previous, status);
+    });
   }
 
-  // 통계 조회
+  // 통계 조회 (집계 테이블 기준 - 이력 크기와 무관)
   static async getStatistics() {
-    const stats = {};
-    
-    // 전체 실행 수
-    const totalResult = await db.get(
-      'SELECT COUNT(*) as total FROM execution_history'
-    );
-    stats.total = totalResult.total;
-    
-    // 상태별 실행 수
-    const statusResult = await db.all(`
-      SELECT status, COUNT(*) as count 
-      FROM execution_history 
-      GROUP BY status
-    `);
-    stats.byStatus = statusResult.reduce((acc, row) => {
-      acc[row.status] = row.count;
-      return acc;
-    }, {});
-    
-    // 최근 24시간 실행 수
-    const recentResult = await db.get(`
-      SELECT COUNT(*) as recent 
-      FROM execution_history 
-      WHERE executed_at > datetime('now', '-24 hours')
-    `);
-    stats.recent24Hours = recentResult.recent;
-    
-    return stats;
+    return await ExecutionRollupModel.getStatistics();
   }
 }
 
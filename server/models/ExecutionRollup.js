@@ -0,0 +1,161 @@
+const db = require('../config/database');
+const logger = require('../utils/logger');
+
+// 행당 바인딩 변수 5개 - SQLite 한도(999)를 넘지 않도록 나누어 실행
+const UPSERT_CHUNK_SIZE = 150;
+
+// SQLite datetime 형식 (UTC, 'YYYY-MM-DD HH:MM:SS')
+function sqliteTime(date = new Date()) {
+  return date.toISOString().replace('T', ' ').substring(0, 19);
+}
+
+// 실행 이력 집계
+// - execution_rollups: 시간 단위(hour) 버킷별 프리셋/상태별 실행 수, 오래된 버킷은 일 단위(day)로 합침
+// - execution_status_totals: 상태별 전체 실행 수
+// 실행 이력을 쓰는 곳에서 함께 갱신하므로 통계 조회는 이력 테이블 크기와 관계없이 작은 집계 테이블만 읽는다.
+// 이력 원본은 보존 기간이 지나면 보관 파일로 옮겨 삭제되지만 집계는 유지된다.
+class ExecutionRollupModel {
+  // 'YYYY-MM-DD HH:MM:SS' -> 'YYYY-MM-DD HH:00:00'
+  static hourBucket(timestamp = sqliteTime()) {
+    return `${String(timestamp).substring(0, 13)}:00:00`;
+  }
+
+  // 집계 반영 - entries: [{ presetId, status, executedAt?, delta? }]
+  static async add(entries) {
+    if (!entries || entries.length === 0) return;
+
+    const buckets = new Map();
+    const totals = new Map();
+    for (const entry of entries) {
+      const delta = entry.delta === undefined ? 1 : entry.delta;
+      const presetId = entry.presetId || 0;
+      const status = entry.status || 'unknown';
+      const bucket = this.hourBucket(entry.executedAt || sqliteTime());
+
+      const key = `${bucket}|${presetId}|${status}`;
+      const existing = buckets.get(key);
+      if (existing) {
+        existing.delta += delta;
+      } else {
+        buckets.set(key, { bucket, presetId, status, delta });
+      }
+      totals.set(status, (totals.get(status) || 0) + delta);
+    }
+
+    const rows = Array.from(buckets.values()).filter(row => row.delta !== 0);
+    const totalRows = Array.from(totals).filter(([, delta]) => delta !== 0);
+
+    await db.transaction(async () => {
+      for (let i = 0; i < rows.length; i += UPSERT_CHUNK_SIZE) {
+        const chunk = rows.slice(i, i + UPSERT_CHUNK_SIZE);
+        const params = [];
+        for (const row of chunk) {
+          params.push('hour', row.bucket, row.presetId, row.status, row.delta);
+        }
+        await db.run(
+          `INSERT INTO execution_rollups (granularity, bucket_start, preset_id, status, count)
+           VALUES ${chunk.map(() => '(?, ?, ?, ?, ?)').join(', ')}
+           ON CONFLICT(granularity, bucket_start, preset_id, status) DO UPDATE SET count = count + excluded.count`,
+          params
+        );
+      }
+
+      for (const [status, delta] of totalRows) {
+        await db.run(
+          `INSERT INTO execution_status_totals (status, count) VALUES (?, ?)
+           ON CONFLICT(status) DO UPDATE SET count = count + excluded.count`,
+          [status, delta]
+        );
+      }
+    });
+  }
+
+  // 실행 이력 행의 상태 변경 반영
+  static async move(row, toStatus) {
+    if (!row || row.status === toStatus) return;
+
+    await this.add([
+      { presetId: row.preset_id, status: row.status, executedAt: row.executed_at, delta: -1 },
+      { presetId: row.preset_id, status: toStatus, executedAt: row.executed_at, delta: 1 }
+    ]);
+  }
+
+  // 집계가 비어 있는데 이력이 있으면 (이 기능 이전의 DB) 이력에서 한 번 다시 계산
+  static async initialize() {
+    const totals = await db.get('SELECT COUNT(*) as count FROM execution_status_totals');
+    if (totals.count > 0) return;
+
+    const history = await db.get('SELECT id FROM execution_history LIMIT 1');
+    if (!history) return;
+
+    await this.rebuild();
+  }
+
+  static async rebuild() {
+    await db.transaction(async () => {
+      await db.run('DELETE FROM execution_rollups');
+      await db.run('DELETE FROM execution_status_totals');
+      await db.run(`
+        INSERT INTO execution_rollups (granularity, bucket_start, preset_id, status, count)
+        SELECT 'hour', strftime('%Y-%m-%d %H:00:00', executed_at), COALESCE(preset_id, 0), COALESCE(status, 'unknown'), COUNT(*)
+        FROM execution_history
+        GROUP BY 2, 3, 4
+      `);
+      await db.run(`
+        INSERT INTO execution_status_totals (status, count)
+        SELECT COALESCE(status, 'unknown'), COUNT(*)
+        FROM execution_history
+        GROUP BY 1
+      `);
+    });
+    logger.info('실행 이력 집계 재계산 완료');
+  }
+
+  // 기준 시각보다 오래된 시간 단위 버킷을 일 단위로 합침
+  static async compact(before) {
+    const cutoff = this.hourBucket(before);
+
+    return await db.transaction(async () => {
+      await db.run(`
+        INSERT INTO execution_rollups (granularity, bucket_start, preset_id, status, count)
+        SELECT 'day', date(bucket_start) || ' 00:00:00', preset_id, status, SUM(count)
+        FROM execution_rollups
+        WHERE granularity = 'hour' AND bucket_start < ?
+        GROUP BY 2, 3, 4
+        ON CONFLICT(granularity, bucket_start, preset_id, status) DO UPDATE SET count = count + excluded.count
+      `, [cutoff]);
+
+      const result = await db.run(
+        "DELETE FROM execution_rollups WHERE granularity = 'hour' AND bucket_start < ?",
+        [cutoff]
+      );
+      return result.changes;
+    });
+  }
+
+  // 전체/상태별/최근 24시간 실행 수
+  static async getStatistics() {
+    const totals = await db.all('SELECT status, count FROM execution_status_totals WHERE count != 0');
+    const byStatus = {};
+    let total = 0;
+    for (const row of totals) {
+      byStatus[row.status] = row.count;
+      total += row.count;
+    }
+
+    // 현재 시간 버킷 포함 최근 24개 시간 버킷
+    const since = this.hourBucket(sqliteTime(new Date(Date.now() - 23 * 60 * 60 * 1000)));
+    const recent = await db.get(
+      "SELECT COALESCE(SUM(count), 0) as recent FROM execution_rollups WHERE granularity = 'hour' AND bucket_start >= ?",
+      [since]
+    );
+
+    return {
+      total,
+      byStatus,
+      recent24Hours: recent.recent
+    };
+  }
+}
+
+module.exports = ExecutionRollupModel;
@@ -1,16 +1,47 @@
 const db = require('../config/database');
+const dispatchPlanCache = require('../services/dispatchPlanCache');
+const ChangeLogModel = require('./ChangeLog');
+
+// IN 목록 바인딩 변수 수 - SQLite 한도(999)를 넘지 않도록 나누어 조회
+const BULK_CHUNK_SIZE = 500;
 
 class GroupModel {
   // 모든 그룹 조회 (클라이언트 정보 포함)
+  // 그룹과 소속 클라이언트를 한 번의 JOIN으로 조회한 뒤 그룹별로 묶음
   static async findAll() {
-    const groups = await db.all('SELECT * FROM groups ORDER BY created_at DESC');
+    const rows = await db.all(`
+      SELECT 
+        g.*,
+        c.id AS member_id,
+        c.name AS member_name,
+        c.ip_address AS member_ip_address,
+        c.status AS member_status,
+        c.last_seen AS member_last_seen
+      FROM groups g
+      LEFT JOIN group_clients gc ON gc.group_id = g.id
+      LEFT JOIN clients c ON c.id = gc.client_id
+      ORDER BY g.created_at DESC, g.id, c.name
+    `);
     
-    // 각 그룹의 클라이언트 정보 조회
-    for (const group of groups) {
-      group.clients = await this.getGroupClients(group.id);
+    const groups = new Map();
+    for (const row of rows) {
+      const { member_id, member_name, member_ip_address, member_status, member_last_seen, ...group } = row;
+      
+      if (!groups.has(group.id)) {
+        groups.set(group.id, { ...group, clients: [] });
+      }
+      if (member_id !== null) {
+        groups.get(group.id).clients.push({
+          id: member_id,
+          name: member_name,
+          ip_address: member_ip_address,
+          status: member_status,
+          last_seen: member_last_seen
+        });
+      }
     }
     
-    return groups;
+    return [...groups.values()];
   }
 
   // ID로 그룹 조회
@@ -22,6 +53,37 @@ class GroupModel {
     return group;
   }
 
+  // 여러 그룹을 한꺼번에 조회 (클라이언트 정보 포함, 없는 ID는 제외)
+  static async findByIds(ids) {
+    if (!ids || ids.length === 0) {
+      return [];
+    }
+    
+    const groups = new Map();
+    for (let i = 0; i < ids.length; i += BULK_CHUNK_SIZE) {
+      const chunk = ids.slice(i, i + BULK_CHUNK_SIZE);
+      const placeholders = chunk.map(() => '?').join(', ');
+      const rows = await db.all(`SELECT * FROM groups WHERE id IN (${placeholders}) ORDER BY id`, chunk);
+      for (const row of rows) {
+        groups.set(row.id, { ...row, clients: [] });
+      }
+      
+      const members = await db.all(`
+        SELECT gc.group_id, c.id, c.name, c.ip_address, c.status, c.last_seen
+        FROM group_clients gc
+        JOIN clients c ON gc.client_id = c.id
+        WHERE gc.group_id IN (${placeholders})
+        ORDER BY c.name
+      `, chunk);
+      for (const { group_id, ...client } of members) {
+        const group = groups.get(group_id);
+        if (group) group.clients.push(client);
+      }
+    }
+    
+    return [...groups.values()];
+  }
+
   // 그룹의 클라이언트 조회
   static async getGroupClients(groupId) {
     const query = `
@@ -55,6 +117,8 @@ class GroupModel {
           [groupId, clientId]
         );
       }
+      db.afterCommit(() => dispatchPlanCache.invalidateAll());
+      await ChangeLogModel.record('group', groupId);
       
       return await this.findById(groupId);
     });
@@ -81,6 +145,8 @@ class GroupModel {
           [id, clientId]
         );
       }
+      db.afterCommit(() => dispatchPlanCache.invalidateAll());
+      await ChangeLogModel.record('group', id);
       
       return await this.findById(id);
     });
@@ -94,6 +160,8 @@ class GroupModel {
       
       // 그룹 삭제
       const result = await db.run('DELETE FROM groups WHERE id = ?', [id]);
+      db.afterCommit(() => dispatchPlanCache.invalidateAll());
+      await ChangeLogModel.record('group', id, 'delete');
       
       return result.changes > 0;
     });
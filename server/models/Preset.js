@@ -1,4 +1,10 @@
 const db = require('../config/database');
+const dispatchPlanCache = require('../services/dispatchPlanCache');
+const ChangeLogModel = require('./ChangeLog');
+const ExecutionRollupModel = require('./ExecutionRollup');
+
+// IN 목록 바인딩 변수 수 - SQLite 한도(999)를 넘지 않도록 나누어 조회
+const BULK_CHUNK_SIZE = 500;
 
 class PresetModel {
   // 모든 프리셋 조회
@@ -12,10 +18,11 @@ class PresetModel {
     
     const presets = await db.all(query);
     
-    // client_commands JSON 파싱
+    // client_commands / stages JSON 파싱
     return presets.map(preset => ({
       ...preset,
-      client_commands: preset.client_commands ? JSON.parse(preset.client_commands) : {}
+      client_commands: preset.client_commands ? JSON.parse(preset.client_commands) : {},
+      stages: preset.stages ? JSON.parse(preset.stages) : null
     }));
   }
 
@@ -33,46 +40,89 @@ class PresetModel {
     if (preset) {
       preset.client_commands = preset.client_commands ? 
         JSON.parse(preset.client_commands) : {};
+      preset.stages = preset.stages ? JSON.parse(preset.stages) : null;
     }
     
     return preset;
   }
 
+  // 여러 프리셋을 한꺼번에 조회 (없는 ID는 제외)
+  static async findByIds(ids) {
+    if (!ids || ids.length === 0) {
+      return [];
+    }
+    
+    const presets = [];
+    for (let i = 0; i < ids.length; i += BULK_CHUNK_SIZE) {
+      const chunk = ids.slice(i, i + BULK_CHUNK_SIZE);
+      presets.push(...await db.all(`
+        SELECT p.*, g.name as group_name 
+        FROM presets p
+        LEFT JOIN groups g ON p.target_group_id = g.id
+        WHERE p.id IN (${chunk.map(() => '?').join(', ')})
+        ORDER BY p.id
+      `, chunk));
+    }
+    
+    return presets.map(preset => ({
+      ...preset,
+      client_commands: preset.client_commands ? JSON.parse(preset.client_commands) : {},
+      stages: preset.stages ? JSON.parse(preset.stages) : null
+    }));
+  }
+
   // 프리셋 생성
+  // stages: [{ name, client_ids, ready, timeout }] - 순서대로 실행할 단계 (없으면 모든 노드를 한 번에 실행)
   static async create(data) {
-    const { name, description, target_group_id, client_commands } = data;
+    const { name, description, target_group_id, client_commands, stages } = data;
     
     const clientCommandsJson = JSON.stringify(client_commands);
     
     const result = await db.run(
-      'INSERT INTO presets (name, description, target_group_id, client_commands) VALUES (?, ?, ?, ?)',
-      [name, description, target_group_id, clientCommandsJson]
+      'INSERT INTO presets (name, description, target_group_id, client_commands, stages) VALUES (?, ?, ?, ?, ?)',
+      [name, description, target_group_id, clientCommandsJson, this.stagesJson(stages)]
     );
+    db.afterCommit(() => dispatchPlanCache.invalidatePreset(result.lastID));
+    await ChangeLogModel.record('preset', result.lastID);
     
     return await this.findById(result.lastID);
   }
 
   // 프리셋 업데이트
+  // stages를 보내지 않은 요청(웹 UI 편집 화면)은 단계 구성을 유지하고, null이나 []이면 단계 구성을 지움
   static async update(id, data) {
-    const { name, description, target_group_id, client_commands } = data;
+    const { name, description, target_group_id, client_commands, stages } = data;
     
     const clientCommandsJson = JSON.stringify(client_commands);
     
-    const result = await db.run(
-      'UPDATE presets SET name = ?, description = ?, target_group_id = ?, client_commands = ? WHERE id = ?',
-      [name, description, target_group_id, clientCommandsJson, id]
-    );
+    const result = stages === undefined
+      ? await db.run(
+        'UPDATE presets SET name = ?, description = ?, target_group_id = ?, client_commands = ? WHERE id = ?',
+        [name, description, target_group_id, clientCommandsJson, id]
+      )
+      : await db.run(
+        'UPDATE presets SET name = ?, description = ?, target_group_id = ?, client_commands = ?, stages = ? WHERE id = ?',
+        [name, description, target_group_id, clientCommandsJson, this.stagesJson(stages), id]
+      );
     
     if (result.changes === 0) {
       throw new Error('프리셋을 찾을 수 없습니다.');
     }
+    db.afterCommit(() => dispatchPlanCache.invalidatePreset(id));
+    await ChangeLogModel.record('preset', id);
     
     return await this.findById(id);
   }
 
+  static stagesJson(stages) {
+    return Array.isArray(stages) && stages.length > 0 ? JSON.stringify(stages) : null;
+  }
+
   // 프리셋 삭제
   static async delete(id) {
     const result = await db.run('DELETE FROM presets WHERE id = ?', [id]);
+    db.afterCommit(() => dispatchPlanCache.invalidatePreset(id));
+    await ChangeLogModel.record('preset', id, 'delete');
     return result.changes > 0;
   }
 
@@ -99,14 +149,39 @@ class PresetModel {
       'INSERT INTO execution_history (preset_id, client_id, status) VALUES (?, ?, ?)',
       [presetId, clientId, status]
     );
+    await ExecutionRollupModel.add([{ presetId, status }]);
+  }
+
+  // 실행 히스토리 일괄 기록 (entries: [{ clientId, status }])
+  static async addExecutionHistoryMany(presetId, entries) {
+    if (!entries || entries.length === 0) return;
+    
+    // 행당 바인딩 변수 3개 - SQLite 한도(999)를 넘지 않도록 나누어 INSERT
+    const chunkSize = 300;
+    for (let i = 0; i < entries.length; i += chunkSize) {
+      const chunk = entries.slice(i, i + chunkSize);
+      const placeholders = chunk.map(() => '(?, ?, ?)').join(', ');
+      const params = [];
+      for (const entry of chunk) {
+        params.push(presetId, entry.clientId, entry.status);
+      }
+      
+      await db.run(
+        `INSERT INTO execution_history (preset_id, client_id, status) VALUES ${placeholders}`,
+        params
+      );
+    }
+    
+    await ExecutionRollupModel.add(entries.map(entry => ({ presetId, status: entry.status })));
   }
 
   // 프리셋 마지막 실행 시간 업데이트
   static async updateLastExecuted(presetId) {
     await db.run(
-      'UPDATE presets SET last_executed_at = datetime("now") WHERE id = ?',
+      `UPDATE presets SET last_executed_at = datetime('now') WHERE id = ?`,
       [presetId]
     );
+    await ChangeLogModel.record('preset', presetId);
   }
 }
 
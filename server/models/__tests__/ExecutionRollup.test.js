@@ -0,0 +1,111 @@
+process.env.DB_FILE = ':memory:';
+
+jest.mock('../../utils/logger', () => ({
+  info: jest.fn(),
+  warn: jest.fn(),
+  error: jest.fn(),
+  debug: jest.fn()
+}));
+
+const db = require('../../config/database');
+const { runMigrations } = require('../../db/migrations');
+const ExecutionRollup = require('../ExecutionRollup');
+
+async function rollups(granularity) {
+  return await db.all(
+    'SELECT bucket_start, preset_id, status, count FROM execution_rollups WHERE granularity = ? ORDER BY bucket_start, preset_id, status',
+    [granularity]
+  );
+}
+
+async function totals() {
+  const rows = await db.all('SELECT status, count FROM execution_status_totals ORDER BY status');
+  return Object.fromEntries(rows.map(row => [row.status, row.count]));
+}
+
+describe('ExecutionRollupModel', () => {
+  beforeAll(async () => {
+    jest.spyOn(console, 'log').mockImplementation(() => {});
+    await db.initialize();
+    await runMigrations();
+  });
+
+  afterAll(async () => {
+    await db.close();
+    console.log.mockRestore();
+  });
+
+  beforeEach(async () => {
+    await db.run('DELETE FROM execution_rollups');
+    await db.run('DELETE FROM execution_status_totals');
+  });
+
+  test('add groups entries into hourly buckets per preset and status', async () => {
+    await ExecutionRollup.add([
+      { presetId: 1, status: 'completed', executedAt: '2026-01-01 10:15:00' },
+      { presetId: 1, status: 'completed', executedAt: '2026-01-01 10:45:00' },
+      { presetId: 1, status: 'failed', executedAt: '2026-01-01 10:50:00' },
+      { presetId: null, status: 'completed', executedAt: '2026-01-01 11:00:00' }
+    ]);
+    await ExecutionRollup.add([{ presetId: 1, status: 'completed', executedAt: '2026-01-01 10:59:59' }]);
+
+    expect(await rollups('hour')).toEqual([
+      { bucket_start: '2026-01-01 10:00:00', preset_id: 1, status: 'completed', count: 3 },
+      { bucket_start: '2026-01-01 10:00:00', preset_id: 1, status: 'failed', count: 1 },
+      { bucket_start: '2026-01-01 11:00:00', preset_id: 0, status: 'completed', count: 1 }
+    ]);
+    expect(await totals()).toEqual({ completed: 4, failed: 1 });
+  });
+
+  test('move shifts one execution between statuses in its original bucket', async () => {
+    const row = { preset_id: 2, status: 'running', executed_at: '2026-01-01 09:30:00' };
+    await ExecutionRollup.add([
+      { presetId: 2, status: 'running', executedAt: row.executed_at },
+      { presetId: 2, status: 'running', executedAt: row.executed_at }
+    ]);
+
+    await ExecutionRollup.move(row, 'stopped');
+    await ExecutionRollup.move({ ...row, status: 'stopped' }, 'running');
+    await ExecutionRollup.move(row, 'running'); // 같은 상태는 무시
+
+    expect(await rollups('hour')).toEqual([
+      { bucket_start: '2026-01-01 09:00:00', preset_id: 2, status: 'running', count: 2 },
+      { bucket_start: '2026-01-01 09:00:00', preset_id: 2, status: 'stopped', count: 0 }
+    ]);
+
+    await ExecutionRollup.move(row, 'stopped');
+    expect(await totals()).toEqual({ running: 1, stopped: 1 });
+    expect(await ExecutionRollup.getStatistics()).toMatchObject({ total: 2, byStatus: { running: 1, stopped: 1 } });
+  });
+
+  test('compact folds hourly buckets older than the cutoff into day buckets', async () => {
+    await ExecutionRollup.add([
+      { presetId: 1, status: 'completed', executedAt: '2026-01-01 10:00:00' },
+      { presetId: 1, status: 'completed', executedAt: '2026-01-01 23:10:00' },
+      { presetId: 1, status: 'failed', executedAt: '2026-01-01 23:20:00' },
+      { presetId: 1, status: 'completed', executedAt: '2026-01-02 08:00:00' },
+      { presetId: 1, status: 'completed', executedAt: '2026-01-02 09:00:00' }
+    ]);
+
+    // 기준 시각이 속한 시간 버킷(09시)은 남김
+    expect(await ExecutionRollup.compact('2026-01-02 09:30:00')).toBe(4);
+    expect(await rollups('day')).toEqual([
+      { bucket_start: '2026-01-01 00:00:00', preset_id: 1, status: 'completed', count: 2 },
+      { bucket_start: '2026-01-01 00:00:00', preset_id: 1, status: 'failed', count: 1 },
+      { bucket_start: '2026-01-02 00:00:00', preset_id: 1, status: 'completed', count: 1 }
+    ]);
+    expect(await rollups('hour')).toEqual([
+      { bucket_start: '2026-01-02 09:00:00', preset_id: 1, status: 'completed', count: 1 }
+    ]);
+
+    // 이미 일 단위 버킷이 있는 날은 합산
+    expect(await ExecutionRollup.compact('2026-01-03 00:00:00')).toBe(1);
+    expect(await rollups('day')).toEqual([
+      { bucket_start: '2026-01-01 00:00:00', preset_id: 1, status: 'completed', count: 2 },
+      { bucket_start: '2026-01-01 00:00:00', preset_id: 1, status: 'failed', count: 1 },
+      { bucket_start: '2026-01-02 00:00:00', preset_id: 1, status: 'completed', count: 2 }
+    ]);
+    expect(await rollups('hour')).toEqual([]);
+    expect(await totals()).toEqual({ completed: 4, failed: 1 });
+  });
+});
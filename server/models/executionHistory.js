@@ -1,96 +1,98 @@
 const db = require('../config/database');
 const logger = require('../utils/logger');
 
+// 행당 바인딩 변수 2개 - SQLite 한도(999)를 넘지 않도록 나누어 실행
+const RESULT_CHUNK_SIZE = 400;
+
+// 그룹 실행 단위 이력
+// - execution_runs: 실행 한 건 (성공/실패 수는 카운터 컬럼으로 유지)
+// - execution_run_results: 클라이언트별 결과 한 행 ((run_id, client_id) 기본 키, success NULL은 결과 대기)
+// 결과 수신은 키 조회 + upsert + 카운터 증감이므로 대상 수와 관계없이 일정하고,
+// 트랜잭션 안에서 처리되어 여러 노드가 동시에 결과를 보내도 갱신이 유실되지 않는다.
 class ExecutionHistoryModel {
-  // 실행 히스토리 생성
-  static async create(presetId, presetName, groupId, clientIds) {
+  // 실행 히스토리 생성 (executionId를 주면 그 ID로 - 명령 전송 전에 결과 대기를 등록하는 경우)
+  static async create(presetId, presetName, groupId, clientIds, executionId = `exec_${presetId}_${Date.now()}`) {
     try {
-      const executionId = `exec_${presetId}_${Date.now()}`;
+      const startedAt = new Date().toISOString();
       
-      const execution = {
-        id: executionId,
-        preset_id: presetId,
-        preset_name: presetName,
-        group_id: groupId,
-        started_at: new Date().toISOString(),
-        status: 'running',
-        total_clients: clientIds.length,
-        target_clients: JSON.stringify(clientIds),
-        successful_clients: JSON.stringify([]),
-        failed_clients: JSON.stringify([]),
-        error_messages: JSON.stringify({}),
-        created_at: new Date().toISOString()
-      };
-
-      const result = await db.run(`
-        INSERT INTO execution_history (
-          id, preset_id, preset_name, group_id, started_at, status, 
-          total_clients, target_clients, successful_clients, failed_clients, 
-          error_messages, created_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-      `, [
-        execution.id, execution.preset_id, execution.preset_name, execution.group_id,
-        execution.started_at, execution.status, execution.total_clients,
-        execution.target_clients, execution.successful_clients, execution.failed_clients,
-        execution.error_messages, execution.created_at
-      ]);
-
-      if (result && result.lastID) {
-        logger.info(`실행 히스토리 생성: ${executionId}`);
-        return executionId;
-      } else {
-        throw new Error('실행 히스토리 생성 실패');
-      }
+      await db.transaction(async () => {
+        await db.run(`
+          INSERT INTO execution_runs (
+            id, preset_id, preset_name, group_id, started_at, status, total_clients, created_at
+          ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        `, [executionId, presetId, presetName, groupId, startedAt, 'running', clientIds.length, startedAt]);
+        
+        // 대상 클라이언트는 결과 대기 행으로 미리 생성
+        for (let i = 0; i < clientIds.length; i += RESULT_CHUNK_SIZE) {
+          const chunk = clientIds.slice(i, i + RESULT_CHUNK_SIZE);
+          const params = [];
+          for (const clientId of chunk) {
+            params.push(executionId, clientId);
+          }
+          await db.run(
+            `INSERT OR IGNORE INTO execution_run_results (run_id, client_id) VALUES ${chunk.map(() => '(?, ?)').join(', ')}`,
+            params
+          );
+        }
+      });
+      
+      logger.info(`실행 히스토리 생성: ${executionId}`);
+      return executionId;
     } catch (error) {
       logger.error('실행 히스토리 생성 실패:', error);
       throw error;
     }
   }
 
-  // 클라이언트별 실행 결과 업데이트
+  // 클라이언트별 실행 결과 업데이트 - 갱신 후 실행의 { total_clients, successful_count, failed_count } 반환
   static async updateClientResult(executionId, clientId, success, errorMessage = null) {
     try {
-      // 기존 실행 히스토리 조회
-      const execution = await this.findById(executionId);
-      if (!execution) {
-        throw new Error('실행 히스토리를 찾을 수 없습니다');
-      }
-
-      let successfulClients = JSON.parse(execution.successful_clients || '[]');
-      let failedClients = JSON.parse(execution.failed_clients || '[]');
-      let errorMessages = JSON.parse(execution.error_messages || '{}');
-
-      if (success) {
-        if (!successfulClients.includes(clientId)) {
-          successfulClients.push(clientId);
-        }
-        // 실패 목록에서 제거
-        failedClients = failedClients.filter(id => id !== clientId);
-      } else {
-        if (!failedClients.includes(clientId)) {
-          failedClients.push(clientId);
+      const value = success ? 1 : 0;
+      
+      const counts = await db.transaction(async () => {
+        const previous = await db.get(
+          'SELECT success FROM execution_run_results WHERE run_id = ? AND client_id = ?',
+          [executionId, clientId]
+        );
+        
+        if (!previous) {
+          const run = await db.get('SELECT id FROM execution_runs WHERE id = ?', [executionId]);
+          if (!run) {
+            throw new Error('실행 히스토리를 찾을 수 없습니다');
+          }
         }
-        // 성공 목록에서 제거
-        successfulClients = successfulClients.filter(id => id !== clientId);
         
-        if (errorMessage) {
-          errorMessages[clientId] = errorMessage;
+        // 실패 시에만 오류 메시지 갱신 (성공으로 바뀌어도 이전 오류 메시지는 유지)
+        await db.run(`
+          INSERT INTO execution_run_results (run_id, client_id, success, error_message, updated_at)
+          VALUES (?, ?, ?, ?, datetime('now'))
+          ON CONFLICT(run_id, client_id) DO UPDATE SET
+            success = excluded.success,
+            error_message = CASE WHEN excluded.success = 0
+              THEN COALESCE(excluded.error_message, execution_run_results.error_message)
+              ELSE execution_run_results.error_message END,
+            updated_at = excluded.updated_at
+        `, [executionId, clientId, value, success ? null : errorMessage]);
+        
+        // 이전 결과 -> 새 결과 전이만큼 카운터 증감
+        const previousValue = previous ? previous.success : null;
+        const successDelta = (value === 1 ? 1 : 0) - (previousValue === 1 ? 1 : 0);
+        const failedDelta = (value === 0 ? 1 : 0) - (previousValue === 0 ? 1 : 0);
+        if (successDelta !== 0 || failedDelta !== 0) {
+          await db.run(
+            'UPDATE execution_runs SET successful_count = successful_count + ?, failed_count = failed_count + ? WHERE id = ?',
+            [successDelta, failedDelta, executionId]
+          );
         }
-      }
-
-      // 업데이트
-      await db.run(`
-        UPDATE execution_history 
-        SET successful_clients = ?, failed_clients = ?, error_messages = ?
-        WHERE id = ?
-      `, [
-        JSON.stringify(successfulClients),
-        JSON.stringify(failedClients),
-        JSON.stringify(errorMessages),
-        executionId
-      ]);
+        
+        return await db.get(
+          'SELECT total_clients, successful_count, failed_count FROM execution_runs WHERE id = ?',
+          [executionId]
+        );
+      });
 
       logger.debug(`실행 결과 업데이트: ${executionId}, 클라이언트 ${clientId}, 성공: ${success}`);
+      return counts;
     } catch (error) {
       logger.error('실행 결과 업데이트 실패:', error);
       throw error;
@@ -100,7 +102,7 @@ class ExecutionHistoryModel {
   // 실행 완료 처리
   static async complete(executionId, status = 'completed') {
     try {
-      const execution = await this.findById(executionId);
+      const execution = await db.get('SELECT started_at FROM execution_runs WHERE id = ?', [executionId]);
       if (!execution) {
         throw new Error('실행 히스토리를 찾을 수 없습니다');
       }
@@ -110,7 +112,7 @@ class ExecutionHistoryModel {
       const durationSeconds = (new Date(completedAt) - startedAt) / 1000;
 
       await db.run(`
-        UPDATE execution_history 
+        UPDATE execution_runs 
         SET completed_at = ?, status = ?, duration_seconds = ?
         WHERE id = ?
       `, [completedAt, status, durationSeconds, executionId]);
@@ -126,21 +128,12 @@ class ExecutionHistoryModel {
   static async getRecent(limit = 10) {
     try {
       const query = `
-        SELECT * FROM execution_history 
+        SELECT * FROM execution_runs 
         ORDER BY started_at DESC 
         LIMIT ?
       `;
       
-      const executions = await db.all(query, [limit]);
-      
-      // JSON 필드 파싱
-      return executions.map(execution => ({
-        ...execution,
-        target_clients: JSON.parse(execution.target_clients || '[]'),
-        successful_clients: JSON.parse(execution.successful_clients || '[]'),
-        failed_clients: JSON.parse(execution.failed_clients || '[]'),
-        error_messages: JSON.parse(execution.error_messages || '{}')
-      }));
+      return await this.withClientResults(await db.all(query, [limit]));
     } catch (error) {
       logger.error('최근 실행 히스토리 조회 실패:', error);
       throw error;
@@ -151,22 +144,13 @@ class ExecutionHistoryModel {
   static async getByPresetId(presetId, limit = 10) {
     try {
       const query = `
-        SELECT * FROM execution_history 
+        SELECT * FROM execution_runs 
         WHERE preset_id = ?
         ORDER BY started_at DESC 
         LIMIT ?
       `;
       
-      const executions = await db.all(query, [presetId, limit]);
-      
-      // JSON 필드 파싱
-      return executions.map(execution => ({
-        ...execution,
-        target_clients: JSON.parse(execution.target_clients || '[]'),
-        successful_clients: JSON.parse(execution.successful_clients || '[]'),
-        failed_clients: JSON.parse(execution.failed_clients || '[]'),
-        error_messages: JSON.parse(execution.error_messages || '{}')
-      }));
+      return await this.withClientResults(await db.all(query, [presetId, limit]));
     } catch (error) {
       logger.error('프리셋 실행 히스토리 조회 실패:', error);
       throw error;
@@ -176,43 +160,76 @@ class ExecutionHistoryModel {
   // ID로 실행 히스토리 조회
   static async findById(id) {
     try {
-      const execution = await db.get('SELECT * FROM execution_history WHERE id = ?', [id]);
-      
-      if (execution) {
-        return {
-          ...execution,
-          target_clients: JSON.parse(execution.target_clients || '[]'),
-          successful_clients: JSON.parse(execution.successful_clients || '[]'),
-          failed_clients: JSON.parse(execution.failed_clients || '[]'),
-          error_messages: JSON.parse(execution.error_messages || '{}')
-        };
+      const execution = await db.get('SELECT * FROM execution_runs WHERE id = ?', [id]);
+      if (!execution) {
+        return null;
       }
       
-      return null;
+      const [result] = await this.withClientResults([execution]);
+      return result;
     } catch (error) {
       logger.error('실행 히스토리 조회 실패:', error);
       throw error;
     }
   }
 
-  // 실행 통계 조회
+  // 클라이언트별 결과 행을 이전 응답 형식(대상/성공/실패 배열, 오류 메시지 객체)으로 붙임
+  static async withClientResults(executions) {
+    if (executions.length === 0) {
+      return executions;
+    }
+    
+    const byRun = new Map(executions.map(execution => [execution.id, {
+      ...execution,
+      target_clients: [],
+      successful_clients: [],
+      failed_clients: [],
+      error_messages: {}
+    }]));
+    
+    const ids = Array.from(byRun.keys());
+    const rows = await db.all(
+      `SELECT run_id, client_id, success, error_message FROM execution_run_results
+       WHERE run_id IN (${ids.map(() => '?').join(', ')})
+       ORDER BY updated_at, client_id`,
+      ids
+    );
+    
+    for (const row of rows) {
+      const execution = byRun.get(row.run_id);
+      execution.target_clients.push(row.client_id);
+      if (row.success === 1) {
+        execution.successful_clients.push(row.client_id);
+      } else if (row.success === 0) {
+        execution.failed_clients.push(row.client_id);
+      }
+      if (row.error_message) {
+        execution.error_messages[row.client_id] = row.error_message;
+      }
+    }
+    
+    return Array.from(byRun.values());
+  }
+
+  // 실행 통계 조회 (실행 단위 - execution_runs 기준)
   static async getStats() {
     try {
       const stats = await db.get(`
-        SELECT 
-          COUNT(*) as total_executions,
-          COUNT(CASE WHEN status = 'completed' THEN 1 END) as completed_executions,
-          COUNT(CASE WHEN status = 'failed' THEN 1 END) as failed_executions,
-          COUNT(CASE WHEN status = 'running' THEN 1 END) as running_executions,
+        SELECT
+          COUNT(*) as total,
+          SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as completed,
+          SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) as failed,
+          SUM(CASE WHEN status = 'running' THEN 1 ELSE 0 END) as running,
           AVG(duration_seconds) as avg_duration
-        FROM execution_history
+        FROM execution_runs
       `);
 
       return {
-        total_executions: stats.total_executions || 0,
-        completed_executions: stats.completed_executions || 0,
-        failed_executions: stats.failed_executions || 0,
-        running_executions: stats.running_executions || 0,
+        total_executions: stats.total,
+        completed_executions: stats.completed || 0,
+        failed_executions: stats.failed || 0,
+        running_executions: stats.running || 0,
+        // 완료된 실행의 평균 소요 시간 (초)
         avg_duration: stats.avg_duration || 0
       };
     } catch (error) {
@@ -1,43 +1,23 @@
-const ping = require('ping');
 const { exec } = require('child_process');
 const util = require('util');
 const execAsync = util.promisify(exec);
+const powerMonitor = require('./services/powerMonitor');
+const wakeService = require('./services/wakeService');
 
 class PowerManager {
   constructor(db, io) {
     this.db = db;
     this.io = io;
-    this.monitoringInterval = null;
   }
 
-  // Wake-on-LAN 패킷 전송
-  async wakeOnLan(macAddress) {
+  // Wake-on-LAN 패킷 전송 (Wake-on-LAN 엔진의 공유 브로드캐스트 소켓 사용)
+  async wakeOnLan(macAddress, ipAddress = null) {
     try {
-      // MAC 주소를 바이트로 변환
-      const macBytes = Buffer.from(macAddress.replace(/:/g, ''), 'hex');
-      
-      // Magic Packet 생성 (6바이트 FF + MAC 주소 16번 반복)
-      const magicPacket = Buffer.concat([
-        Buffer.alloc(6, 0xFF),
-        Buffer.concat(Array(16).fill(macBytes))
-      ]);
-      
-      // UDP 소켓으로 브로드캐스트 전송
-      const dgram = require('dgram');
-      const socket = dgram.createSocket('udp4');
-      
-      return new Promise((resolve) => {
-        socket.send(magicPacket, 9, '255.255.255.255', (err) => {
-          socket.close();
-          if (err) {
-            console.error('Wake-on-LAN 실패:', err);
-            resolve(false);
-          } else {
-            console.log(`🔌 Wake-on-LAN 패킷 전송: ${macAddress}`);
-            resolve(true);
-          }
-        });
-      });
+      const delivered = await wakeService.sendMagicPacket(macAddress, ipAddress);
+      if (delivered) {
+        console.log(`🔌 Wake-on-LAN 패킷 전송: ${macAddress}`);
+      }
+      return delivered;
     } catch (error) {
       console.error('Wake-on-LAN 오류:', error);
       return false;
@@ -75,16 +55,13 @@ class PowerManager {
     }
   }
 
-  // Ping으로 클라이언트 상태 확인
+  // 클라이언트 도달 확인 (ping 프로세스 대신 전원 모니터의 TCP/UDP 확인 사용)
   async pingClient(ipAddress) {
     try {
-      const result = await ping.promise.probe(ipAddress, {
-        timeout: 5,
-        min_reply: 1
-      });
+      const result = await powerMonitor.probe(ipAddress);
       return result.alive;
     } catch (error) {
-      console.error('Ping 실패:', error);
+      console.error('도달 확인 실패:', error);
       return false;
     }
   }
@@ -132,7 +109,7 @@ class PowerManager {
         case 'wake':
           const powerInfo = await this.getPowerInfo(clientId);
           if (powerInfo && powerInfo.mac_address) {
-            success = await this.wakeOnLan(powerInfo.mac_address);
+            success = await this.wakeOnLan(powerInfo.mac_address, client.ip_address);
           } else {
             errorMessage = 'MAC 주소가 설정되지 않았습니다.';
           }
@@ -204,6 +181,20 @@ class PowerManager {
     try {
       const bulkAction = await this.createBulkPowerAction(action, clientIds.length);
       
+      // 전원 켜기는 한꺼번에 보내지 않고 Wake-on-LAN 엔진이 웨이브 단위로 전송 (부팅 완료는 작업에서 추적)
+      if (action === 'wake') {
+        const job = wakeService.wake(clientIds);
+        const failed = job.counts.failed;
+        await this.updateBulkPowerAction(bulkAction.id, job.total - failed, failed);
+        
+        return {
+          success: true,
+          bulk_action_id: bulkAction.id,
+          wake_job: job,
+          results: { successful: job.total - failed, failed, total: job.total }
+        };
+      }
+      
       // 각 클라이언트에 액션 실행
       const results = await Promise.allSettled(
         clientIds.map(clientId => this.executePowerAction(clientId, action))
@@ -298,39 +289,15 @@ class PowerManager {
   }
 
   // 전원 상태 모니터링 시작
+  // 클라이언트를 하나씩 기다리며 확인하던 30초 주기 루프 대신 전원 모니터(services/powerMonitor)를 사용:
+  // 동시 확인 수 제한, 호스트별 적응형 간격, 스윕당 한 번의 일괄 기록과 power_state_updated 프레임
   startMonitoring() {
-    if (this.monitoringInterval) {
-      clearInterval(this.monitoringInterval);
-    }
-
-    this.monitoringInterval = setInterval(async () => {
-      try {
-        const clients = await this.getAllClients();
-        
-        for (const client of clients) {
-          const powerState = await this.checkClientPower(client.id);
-          
-          // 웹 UI에 실시간 업데이트 전송
-          this.io.emit('power_state_updated', {
-            clientId: client.id,
-            powerState
-          });
-        }
-      } catch (error) {
-        console.error('전원 모니터링 오류:', error);
-      }
-    }, 30000); // 30초마다 체크
-
-    console.log('🔌 전원 상태 모니터링 시작');
+    powerMonitor.start();
   }
 
   // 전원 상태 모니터링 중지
   stopMonitoring() {
-    if (this.monitoringInterval) {
-      clearInterval(this.monitoringInterval);
-      this.monitoringInterval = null;
-      console.log('🔌 전원 상태 모니터링 중지');
-    }
+    powerMonitor.stop();
   }
 
   async getAllClients() {
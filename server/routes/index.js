@@ -1,5 +1,17 @@
 const express = require('express');
 const router = express.Router();
+const db = require('../config/database');
+const clientRegistry = require('../services/clientRegistry');
+const dispatchPlanCache = require('../services/dispatchPlanCache');
+const snapshotService = require('../services/snapshotService');
+const broadcastBus = require('../services/broadcastBus');
+const retentionService = require('../services/retentionService');
+const heartbeatService = require('../services/heartbeatService');
+const powerMonitor = require('../services/powerMonitor');
+const wakeService = require('../services/wakeService');
+const clockService = require('../services/clockService');
+const ChangeController = require('../controllers/changeController');
+const SnapshotController = require('../controllers/snapshotController');
 
 // 라우트 모듈들
 const clientRoutes = require('./clients');
@@ -12,19 +24,32 @@ router.get('/health', (req, res) => {
   res.json({ 
     status: 'ok', 
     timestamp: new Date().toISOString(),
-    server: 'UE CMS Server v2.0'
+    server: 'UE CMS Server v2.0',
+    clientRegistry: clientRegistry.getStats(),
+    dispatchPlans: dispatchPlanCache.getStats(),
+    snapshot: snapshotService.getStats(),
+    broadcast: broadcastBus.getStats(),
+    retention: retentionService.getStatus(),
+    heartbeat: heartbeatService.getHeartbeatStats(),
+    power: powerMonitor.getStats(),
+    wake: wakeService.getStats(),
+    clock: clockService.getStats(),
+    process: {
+      pid: process.pid,
+      uptime: process.uptime(),
+      memoryUsage: process.memoryUsage(),
+      cpuUsage: process.cpuUsage()
+    }
   });
 });
 
-// 누락된 API 엔드포인트들 추가
-router.get('/changes', (req, res) => {
+// 데이터베이스 연결/준비된 문장 캐시 상태
+router.get('/health/db', async (req, res) => {
   try {
-    const { since } = req.query;
-    // 변경사항 조회 로직 (임시로 빈 응답)
     res.json({
-      changed: [],
-      deleted: [],
-      timestamp: new Date().toISOString()
+      timestamp: new Date().toISOString(),
+      connections: db.getStats(),
+      statements: await db.getStatementStats()
     });
   } catch (error) {
     res.status(500).json({
@@ -34,6 +59,55 @@ router.get('/changes', (req, res) => {
   }
 });
 
+// 클라이언트별 전원 상태 (전원 모니터의 마지막 확인 결과)
+router.get('/power', (req, res) => {
+  res.json({
+    states: powerMonitor.getStates(),
+    stats: powerMonitor.getStats(),
+    timestamp: new Date().toISOString()
+  });
+});
+
+// 에이전트별 시계 차이 추정값과 마지막 예약 실행의 노드 간 실행 시각 차이
+router.get('/clock', (req, res) => {
+  res.json({
+    clients: clockService.getClocks(),
+    stats: clockService.getStats(),
+    timestamp: new Date().toISOString()
+  });
+});
+
+// Wake-on-LAN 작업 시작 (웨이브 단위 전송은 백그라운드에서 진행, 진행 상황은 wake_job_updated)
+router.post('/power/wake', (req, res) => {
+  const { client_ids, wave_size, wave_interval } = req.body || {};
+  if (!Array.isArray(client_ids) || client_ids.length === 0) {
+    return res.status(400).json({ success: false, error: 'client_ids가 필요합니다.' });
+  }
+
+  const job = wakeService.wake(client_ids, { waveSize: wave_size, waveInterval: wave_interval });
+  res.status(202).json({ success: true, job });
+});
+
+// 최근 Wake-on-LAN 작업 목록
+router.get('/power/wake', (req, res) => {
+  res.json({ jobs: wakeService.getJobs(), stats: wakeService.getStats() });
+});
+
+// Wake-on-LAN 작업 상세 (대상별 웨이브/부팅 시간, 전체 준비 시간)
+router.get('/power/wake/:jobId', (req, res) => {
+  const job = wakeService.getJob(req.params.jobId);
+  if (!job) {
+    return res.status(404).json({ success: false, error: '작업을 찾을 수 없습니다.' });
+  }
+  res.json(job);
+});
+
+// 누락된 API 엔드포인트들 추가
+router.get('/changes', ChangeController.getChanges);
+
+// 대시보드 초기 로드용 전체 상태 (ETag + gzip)
+router.get('/snapshot', SnapshotController.getSnapshot);
+
 router.post('/heartbeat', (req, res) => {
   try {
     const { clientName } = req.body;
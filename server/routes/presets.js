@@ -24,4 +24,7 @@ router.post('/:id/stop', asyncHandler(PresetController.stop));
 // 프리셋 상태 조회
 router.get('/:id/status', asyncHandler(PresetController.getStatus));
 
+// 단계별 실행 진행 상황 조회
+router.get('/:id/run', asyncHandler(PresetController.getRun));
+
 module.exports = router; 
\ No newline at end of file
@@ -0,0 +1,94 @@
+const config = require('../config/server');
+
+// 웹 UI 전용 방
+const WEB_ROOM = 'web';
+
+// 엔티티별로 마지막 상태만 보내면 되는 이벤트 -> 엔티티 키
+const COALESCE_KEYS = {
+  client_status_changed: data => (data.client_id !== undefined && data.client_id !== null)
+    ? data.client_id
+    : (data.name ? String(data.name).toUpperCase() : undefined),
+  client_updated: data => data.id,
+  preset_status_changed: data => data.preset_id,
+  preset_updated: data => data.id,
+  group_updated: data => data.id,
+  mac_address_updated: data => data.clientId
+};
+
+// 웹 UI 브로드캐스트 버스
+// 짧은 구간(broadcastWindow) 동안 발생한 이벤트를 모아 web 방에 state_batch 한 프레임으로 보낸다.
+// 상태 이벤트는 같은 엔티티에 대해 마지막 값만 남기고(이전 이벤트는 통째로 대체), 나머지 이벤트는 발생 순서대로 전달한다.
+// 상태 이벤트는 엔티티의 전체 상태를 담으므로 필드를 병합하면 이전 상태의 값(running_clients, reason 등)이 남는다.
+// 에이전트 소켓은 web 방에 들어가지 않으므로 UI 이벤트를 받지 않는다.
+class BroadcastBus {
+  constructor() {
+    this.io = null;
+    this.room = WEB_ROOM;
+    this.pending = new Map(); // 키 -> { event, data }
+    this.sequence = 0;        // 병합하지 않는 이벤트용 고유 키
+    this.timer = null;
+    this.windowMs = config.socket.broadcastWindow;
+    this.maxBatchSize = config.socket.broadcastMaxBatch;
+    this.stats = { published: 0, coalesced: 0, frames: 0 };
+  }
+
+  attach(io) {
+    this.io = io;
+  }
+
+  publish(event, data) {
+    this.stats.published++;
+
+    const keyOf = COALESCE_KEYS[event];
+    const entityKey = keyOf && data ? keyOf(data) : undefined;
+    let key;
+    if (entityKey !== undefined && entityKey !== null) {
+      key = `${event}:${entityKey}`;
+      const previous = this.pending.get(key);
+      if (previous) {
+        this.stats.coalesced++;
+        // 마지막 위치로 옮겨 다른 이벤트와의 순서를 유지
+        this.pending.delete(key);
+      }
+    } else {
+      key = `#${++this.sequence}`;
+    }
+    this.pending.set(key, { event, data });
+
+    if (this.pending.size >= this.maxBatchSize) {
+      this.flush();
+    } else if (!this.timer) {
+      this.timer = setTimeout(() => this.flush(), this.windowMs);
+    }
+  }
+
+  flush() {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+    if (this.pending.size === 0) return;
+
+    const events = Array.from(this.pending.values());
+    this.pending.clear();
+
+    if (this.io) {
+      this.io.to(this.room).emit('state_batch', {
+        events,
+        timestamp: new Date().toISOString()
+      });
+      this.stats.frames++;
+    }
+  }
+
+  getStats() {
+    return {
+      pending: this.pending.size,
+      published: this.stats.published,
+      coalesced: this.stats.coalesced,
+      frames: this.stats.frames
+    };
+  }
+}
+
+module.exports = new BroadcastBus();
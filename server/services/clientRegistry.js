@@ -0,0 +1,180 @@
+const db = require('../config/database');
+const logger = require('../utils/logger');
+
+// SQLite datetime('now')와 같은 형식 (UTC, 'YYYY-MM-DD HH:MM:SS')
+function sqliteNow() {
+  return new Date().toISOString().replace('T', ' ').substring(0, 19);
+}
+
+// 클라이언트 행 메모리 캐시 (write-through)
+// ClientModel의 조회는 먼저 여기서 찾고, 쓰기는 DB 반영 후 여기에도 반영한다.
+// 서버 시작 시 전체 행을 적재하므로 평상시 소켓 핸들러의 조회는 SQLite를 거치지 않는다.
+class ClientRegistry {
+  constructor() {
+    this.byId = new Map();    // id -> 클라이언트 행
+    this.byName = new Map();  // 소문자 이름 -> id
+    this.byIP = new Map();    // IP -> Set(id)
+    this.macById = new Map(); // id -> { mac_address, is_manual } (클라이언트별 최신 MAC)
+    this.loaded = false;
+    this.stats = { hits: 0, misses: 0 };
+  }
+
+  // DB의 클라이언트 전체 적재
+  async load() {
+    const rows = await db.all('SELECT * FROM clients');
+
+    this.byId.clear();
+    this.byName.clear();
+    this.byIP.clear();
+    for (const row of rows) {
+      this.set(row);
+    }
+
+    // 같은 클라이언트에 여러 행이 있던 이전 DB도 있으므로 updated_at 순으로 덮어써 최신 값만 남김
+    const macRows = await db.all(
+      'SELECT client_id, mac_address, is_manual FROM client_power_info ORDER BY updated_at, id'
+    );
+    this.macById.clear();
+    for (const row of macRows) {
+      this.macById.set(row.client_id, { mac_address: row.mac_address, is_manual: row.is_manual });
+    }
+    this.loaded = true;
+
+    logger.info(`클라이언트 레지스트리 적재 완료: ${rows.length}개 (MAC ${this.macById.size}개)`);
+  }
+
+  // 캐시에 기록할 현재 시각 (DB의 datetime('now') 값과 동일한 형식)
+  now() {
+    return sqliteNow();
+  }
+
+  normalizeName(name) {
+    return name ? String(name).toLowerCase() : name;
+  }
+
+  // 조회 (없으면 undefined - 호출 측에서 DB로 폴백)
+  getById(id) {
+    return this.lookup(this.byId.get(Number(id)));
+  }
+
+  getByName(name) {
+    const id = this.byName.get(this.normalizeName(name));
+    return this.lookup(id !== undefined ? this.byId.get(id) : undefined);
+  }
+
+  getByIP(ip) {
+    const ids = this.byIP.get(ip);
+    if (!ids || ids.size === 0) {
+      return this.lookup(undefined);
+    }
+    // DB 조회와 같이 가장 먼저 등록된 행 반환
+    return this.lookup(this.byId.get(Math.min(...ids)));
+  }
+
+  // 전체 행 (읽기 전용 - 수정하지 말 것)
+  list() {
+    return Array.from(this.byId.values());
+  }
+
+  // 이름만 조회 (메트릭 등 내부 조회용 - 적중 통계에 넣지 않음)
+  getName(id) {
+    const row = this.byId.get(Number(id));
+    return row ? row.name : undefined;
+  }
+
+  lookup(row) {
+    if (row) {
+      this.stats.hits++;
+      return { ...row };
+    }
+    this.stats.misses++;
+    return undefined;
+  }
+
+  // 행 추가/교체
+  set(row) {
+    if (!row || row.id === undefined || row.id === null) return;
+
+    this.unindex(row.id);
+    const cached = { ...row };
+    this.byId.set(cached.id, cached);
+    this.index(cached);
+  }
+
+  // 일부 컬럼만 갱신 (캐시에 없는 행은 무시 - 다음 조회 때 DB에서 적재)
+  patch(id, fields) {
+    const existing = this.byId.get(Number(id));
+    if (!existing) return;
+
+    this.unindex(existing.id);
+    Object.assign(existing, fields);
+    this.index(existing);
+  }
+
+  remove(id) {
+    this.unindex(Number(id));
+    this.byId.delete(Number(id));
+    this.macById.delete(Number(id)); // client_power_info는 ON DELETE CASCADE
+  }
+
+  // 최신 MAC 주소 (없으면 undefined)
+  getMac(id) {
+    const mac = this.macById.get(Number(id));
+    return mac ? { ...mac } : undefined;
+  }
+
+  // updateMacAddress에서 DB 기록 후 호출
+  setMac(id, macAddress, isManual) {
+    this.macById.set(Number(id), { mac_address: macAddress, is_manual: isManual ? 1 : 0 });
+  }
+
+  removeByName(name) {
+    const id = this.byName.get(this.normalizeName(name));
+    if (id !== undefined) {
+      this.remove(id);
+    }
+  }
+
+  index(row) {
+    if (row.name) {
+      this.byName.set(this.normalizeName(row.name), row.id);
+    }
+    if (row.ip_address) {
+      if (!this.byIP.has(row.ip_address)) {
+        this.byIP.set(row.ip_address, new Set());
+      }
+      this.byIP.get(row.ip_address).add(row.id);
+    }
+  }
+
+  unindex(id) {
+    const existing = this.byId.get(id);
+    if (!existing) return;
+
+    const nameKey = this.normalizeName(existing.name);
+    if (this.byName.get(nameKey) === id) {
+      this.byName.delete(nameKey);
+    }
+    const ids = this.byIP.get(existing.ip_address);
+    if (ids) {
+      ids.delete(id);
+      if (ids.size === 0) {
+        this.byIP.delete(existing.ip_address);
+      }
+    }
+  }
+
+  getStats() {
+    const total = this.stats.hits + this.stats.misses;
+    return {
+      loaded: this.loaded,
+      size: this.byId.size,
+      macAddresses: this.macById.size,
+      hits: this.stats.hits,
+      misses: this.stats.misses,
+      hitRate: total > 0 ? Math.round((this.stats.hits / total) * 1000) / 1000 : 0
+    };
+  }
+}
+
+module.exports = new ClientRegistry();
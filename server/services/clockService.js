@@ -0,0 +1,158 @@
+const { performance } = require('perf_hooks');
+const config = require('../config/server');
+const logger = require('../utils/logger');
+const metrics = require('../utils/metrics');
+
+const SKEW_BUCKETS = [0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25, 0.5, 1];
+
+const clockOffset = metrics.gauge('uecms_clock_offset_seconds', '에이전트별 시계 차이 추정값 (서버 - 에이전트)', ['client']);
+const clockRtt = metrics.gauge('uecms_clock_rtt_seconds', '시계 차이 추정에 쓴 ping/pong 왕복 시간', ['client']);
+const launchDelay = metrics.histogram('uecms_launch_delay_seconds', '예약 실행 시각과 실제 실행 시각 차이 (절댓값)', [], SKEW_BUCKETS);
+const launchSkew = metrics.histogram('uecms_launch_skew_seconds', '예약 실행 한 번에서 가장 빠른 노드와 가장 늦은 노드의 실행 시각 차이', [], SKEW_BUCKETS);
+const launchLate = metrics.counter('uecms_launch_late_total', '예약 시각이 지난 뒤 명령을 받아 바로 실행한 노드 수');
+
+// 시계 동기화 / 예약 실행
+// - 에이전트가 ping에 보낸 시각(t0)에 서버 수신/송신 시각(t1, t2)을 붙여 pong으로 응답 (NTP 방식)
+//   에이전트가 왕복 시간이 가장 짧은 표본으로 시계 차이를 계산해 다음 ping에 함께 보내면 여기에 기록
+// - 프리셋 실행 시 모든 노드에 같은 서버 시각(launchAt)을 보내고, 에이전트는 자기 시계로 환산한 시각까지 기다렸다 실행
+// - 에이전트가 보고한 실제 실행 시각(서버 시계 기준)으로 노드 간 실행 시각 차이를 측정
+class ClockService {
+  constructor() {
+    this.clients = new Map(); // clientName -> { offset, rtt, syncedAt }
+    this.launches = new Map(); // commandId -> 예약 실행
+    this.lastLaunch = null;
+    this.stats = { launches: 0, reports: 0, late: 0 };
+
+    metrics.onCollect(() => this.collectMetrics());
+  }
+
+  // 밀리초 단위 고해상도 서버 시각 (Date.now()와 같은 기준)
+  now() {
+    return performance.timeOrigin + performance.now();
+  }
+
+  // ping에 포함된 에이전트의 현재 추정값 기록
+  record(clientName, sample) {
+    if (!clientName || !sample || typeof sample.offset !== 'number' || typeof sample.rtt !== 'number') return;
+    this.clients.set(clientName, { offset: sample.offset, rtt: sample.rtt, syncedAt: Date.now() });
+  }
+
+  // 예약 실행 시각 - 대상 중 가장 느린 노드도 시각 전에 명령을 받도록 왕복 시간의 두 배 이상 여유
+  planLaunchAt(clientNames) {
+    let maxRtt = 0;
+    for (const clientName of clientNames) {
+      const clock = this.clients.get(clientName);
+      if (clock) maxRtt = Math.max(maxRtt, clock.rtt);
+    }
+    return Math.round(this.now() + Math.max(config.launch.leadTime, maxRtt * 2));
+  }
+
+  // 전송한 명령의 실행 보고 대기 등록 (dispatches: emitToClients에 넘긴 목록 중 전송된 것)
+  trackLaunch(presetId, launchAt, dispatches) {
+    if (dispatches.length === 0) return;
+
+    const launch = {
+      presetId,
+      launchAt,
+      expected: dispatches.length,
+      commandIds: dispatches.map(dispatch => dispatch.data.commandId),
+      reports: new Map(), // clientName -> { launchedAt, delayMs, rtt }
+      timer: null
+    };
+    launch.timer = setTimeout(() => this.finishLaunch(launch), config.launch.reportTimeout);
+    if (launch.timer.unref) launch.timer.unref();
+
+    for (const commandId of launch.commandIds) {
+      this.launches.set(commandId, launch);
+    }
+    this.stats.launches++;
+  }
+
+  // execution_result의 실행 시각 보고 (동기화되지 않은 에이전트는 launchedAt 없음)
+  reportLaunch(clientName, commandId, report) {
+    const launch = commandId ? this.launches.get(commandId) : null;
+    if (!launch) return;
+    this.launches.delete(commandId);
+
+    if (report && typeof report.launchedAt === 'number') {
+      const delayMs = report.launchedAt - launch.launchAt;
+      launchDelay.observe({}, Math.abs(delayMs) / 1000);
+      if (report.late) {
+        launchLate.inc();
+        this.stats.late++;
+      }
+      launch.reports.set(clientName, { launchedAt: report.launchedAt, delayMs, rtt: report.clockRtt, late: !!report.late });
+      this.stats.reports++;
+    }
+
+    // 모든 노드가 보고하면 바로 집계 (보고하지 않는 노드가 있으면 reportTimeout 후)
+    if (!launch.commandIds.some(id => this.launches.get(id) === launch)) {
+      this.finishLaunch(launch);
+    }
+  }
+
+  finishLaunch(launch) {
+    if (!launch.timer) return;
+    clearTimeout(launch.timer);
+    launch.timer = null;
+    for (const commandId of launch.commandIds) {
+      if (this.launches.get(commandId) === launch) this.launches.delete(commandId);
+    }
+
+    const reports = Array.from(launch.reports.entries());
+    if (reports.length === 0) return;
+
+    const times = reports.map(([, report]) => report.launchedAt);
+    const skewMs = Math.max(...times) - Math.min(...times);
+    const rtts = reports.map(([, report]) => report.rtt).filter(rtt => typeof rtt === 'number');
+    launchSkew.observe({}, skewMs / 1000);
+
+    this.lastLaunch = {
+      presetId: launch.presetId,
+      launchAt: new Date(launch.launchAt).toISOString(),
+      expected: launch.expected,
+      reported: reports.length,
+      skewMs: Math.round(skewMs * 100) / 100,
+      // 시계 차이 추정 오차 범위 (경로가 비대칭이면 최대 왕복 시간의 절반)
+      uncertaintyMs: rtts.length > 0 ? Math.round(Math.max(...rtts) / 2 * 100) / 100 : null,
+      clients: reports.map(([clientName, report]) => ({
+        clientName,
+        delayMs: Math.round(report.delayMs * 100) / 100,
+        late: report.late
+      }))
+    };
+
+    logger.info(`⏱️ 예약 실행 시각 차이: 프리셋 ${launch.presetId} - ${reports.length}/${launch.expected}개 노드, ${this.lastLaunch.skewMs}ms`);
+    require('./socketService').emit('launch_skew_measured', this.lastLaunch);
+  }
+
+  collectMetrics() {
+    clockOffset.reset();
+    clockRtt.reset();
+    for (const [clientName, clock] of this.clients) {
+      clockOffset.set({ client: clientName }, clock.offset / 1000);
+      clockRtt.set({ client: clientName }, clock.rtt / 1000);
+    }
+  }
+
+  getClocks() {
+    return Array.from(this.clients.entries()).map(([clientName, clock]) => ({
+      clientName,
+      offsetMs: Math.round(clock.offset * 100) / 100,
+      rttMs: Math.round(clock.rtt * 100) / 100,
+      syncedAt: new Date(clock.syncedAt).toISOString()
+    }));
+  }
+
+  getStats() {
+    return {
+      synchronized: config.launch.synchronized,
+      clients: this.clients.size,
+      pendingReports: this.launches.size,
+      lastLaunch: this.lastLaunch,
+      ...this.stats
+    };
+  }
+}
+
+module.exports = new ClockService();
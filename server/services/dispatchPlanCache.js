@@ -0,0 +1,164 @@
+const clientRegistry = require('./clientRegistry');
+const config = require('../config/server');
+const logger = require('../utils/logger');
+
+// 프리셋별 전송 계획 캐시
+// 프리셋 조회, 대상 그룹 클라이언트 조회, 클라이언트별 명령어 결정을 한 번만 수행해 두고
+// 프리셋 실행 시에는 DB 조회 없이 대상 수만큼의 메모리 조회로 전송 목록을 만든다.
+// - 프리셋/그룹/클라이언트가 바뀌면 모델에서 invalidate 호출
+// - 소켓 연결이 바뀌면(connectionVersion 증가) 전송 대상 이름만 다시 계산
+class DispatchPlanCache {
+  constructor() {
+    this.plans = new Map(); // presetId -> plan
+    this.building = new Map(); // presetId -> Promise (동시 실행 시 중복 조회 방지)
+    this.generation = 0;
+    this.stats = { hits: 0, builds: 0 };
+  }
+
+  async getPlan(presetId) {
+    const id = Number(presetId);
+    const cached = this.plans.get(id);
+    if (cached) {
+      this.stats.hits++;
+      return cached;
+    }
+
+    if (!this.building.has(id)) {
+      const generation = this.generation;
+      const promise = this.build(id)
+        .then(plan => {
+          // 조회 도중 무효화되었으면 캐시하지 않음
+          if (plan && generation === this.generation) {
+            this.plans.set(id, plan);
+          }
+          return plan;
+        })
+        .finally(() => this.building.delete(id));
+      this.building.set(id, promise);
+    }
+    return await this.building.get(id);
+  }
+
+  async build(presetId) {
+    const PresetModel = require('../models/Preset');
+    const GroupModel = require('../models/Group');
+
+    const preset = await PresetModel.findById(presetId);
+    if (!preset) {
+      return null;
+    }
+
+    const clients = preset.target_group_id ? await GroupModel.getGroupClients(preset.target_group_id) : [];
+    const targets = [];
+    const missing = [];
+
+    for (const client of clients) {
+      // 클라이언트 이름 정규화
+      const normalizedClientName = client.name ? client.name.toUpperCase() : client.name;
+
+      // 명령어 찾기 (ID, 원본 이름, 정규화된 이름 순서로)
+      const command = preset.client_commands[client.id] || preset.client_commands[client.name] || preset.client_commands[normalizedClientName];
+
+      if (command) {
+        targets.push({
+          clientId: client.id,
+          normalizedClientName,
+          ipAddress: client.ip_address,
+          command,
+          sendClientName: null
+        });
+      } else {
+        missing.push({ clientId: client.id, normalizedClientName, ipAddress: client.ip_address });
+      }
+    }
+
+    this.stats.builds++;
+    logger.debug(`전송 계획 생성: 프리셋 ${preset.id} - 대상 ${targets.length}개, 명령어 없음 ${missing.length}개`);
+
+    return {
+      preset,
+      clientIds: clients.map(c => c.id),
+      snapshot: new Map(clients.map(c => [c.id, c])),
+      targets,
+      stages: this.buildStages(preset.stages, targets),
+      missing,
+      connectionVersion: -1
+    };
+  }
+
+  // 프리셋 단계 구성 -> [{ name, ready, timeout, targets }]
+  // 단계 객체는 plan.targets와 같은 대상 객체를 참조하므로 resolveTargets 결과가 그대로 반영된다.
+  // 어느 단계에도 없는 대상은 마지막 단계 뒤에 한 단계로 실행 (단계가 없으면 전체가 한 단계)
+  buildStages(stages, targets) {
+    const byId = new Map(targets.map(target => [target.clientId, target]));
+    const assigned = new Set();
+    const result = [];
+
+    for (const [index, stage] of (stages || []).entries()) {
+      const stageTargets = [];
+      for (const clientId of stage.client_ids || []) {
+        const target = byId.get(Number(clientId));
+        if (target && !assigned.has(target.clientId)) {
+          assigned.add(target.clientId);
+          stageTargets.push(target);
+        }
+      }
+      result.push({
+        name: stage.name || `단계 ${index + 1}`,
+        ready: stage.ready || null,
+        timeout: stage.timeout || config.stages.readyTimeout,
+        targets: stageTargets
+      });
+    }
+
+    const rest = targets.filter(target => !assigned.has(target.clientId));
+    if (rest.length > 0 || result.length === 0) {
+      result.push({
+        name: result.length === 0 ? '전체' : '나머지',
+        ready: null,
+        timeout: config.stages.readyTimeout,
+        targets: rest
+      });
+    }
+    return result;
+  }
+
+  // 현재 클라이언트 행 (레지스트리 우선, 없으면 계획 생성 시점의 값)
+  currentClient(plan, clientId) {
+    return clientRegistry.getById(clientId) || plan.snapshot.get(clientId);
+  }
+
+  // 연결 상태가 바뀐 경우에만 전송 대상 이름을 다시 계산 (IP -> 연결된 소켓 이름)
+  resolveTargets(plan, socketService) {
+    if (plan.connectionVersion !== socketService.connectionVersion) {
+      for (const target of plan.targets) {
+        const connectedClientName = socketService.findClientByIP(target.ipAddress);
+        const targetClientName = connectedClientName || target.normalizedClientName;
+        target.sendClientName = targetClientName.toUpperCase();
+      }
+      plan.connectionVersion = socketService.connectionVersion;
+    }
+    return plan.targets;
+  }
+
+  invalidatePreset(presetId) {
+    this.generation++;
+    this.plans.delete(Number(presetId));
+  }
+
+  // 그룹 구성이나 클라이언트 이름/IP가 바뀌면 모든 계획이 영향을 받을 수 있음
+  invalidateAll() {
+    this.generation++;
+    this.plans.clear();
+  }
+
+  getStats() {
+    return {
+      cached: this.plans.size,
+      hits: this.stats.hits,
+      builds: this.stats.builds
+    };
+  }
+}
+
+module.exports = new DispatchPlanCache();
@@ -1,82 +1,181 @@
+const crypto = require('crypto');
 const PresetModel = require('../models/Preset');
 const ClientModel = require('../models/Client');
 const socketService = require('./socketService');
+const dispatchPlanCache = require('./dispatchPlanCache');
+const clientRegistry = require('./clientRegistry');
+const clockService = require('./clockService');
+const stageService = require('./stageService');
 const logger = require('../utils/logger');
+const ChangeLogModel = require('../models/ChangeLog');
+const ExecutionHistoryModel = require('../models/executionHistory');
 const db = require('../config/database');
+const config = require('../config/server');
+const metrics = require('../utils/metrics');
+
+const dispatchDuration = metrics.histogram(
+  'uecms_preset_dispatch_duration_seconds',
+  '프리셋 실행/정지 요청부터 모든 노드에 명령을 보낼 때까지 시간',
+  ['action']
+);
+const actionDuration = metrics.histogram(
+  'uecms_preset_action_duration_seconds',
+  '프리셋 실행/정지 전체 처리 시간 (DB 기록 포함)',
+  ['action']
+);
+
+// 실행 이력(execution_runs) 결과 대기
+// 명령 전송 전에 commandId를 등록해 두므로 이력 행을 기록하기 전에 도착한 결과도 기록 후 반영된다.
+const pendingResults = new Map(); // commandId -> { run, clientId }
+const activeRuns = new Map();     // presetId -> 결과를 기다리는 마지막 실행
+
+// 프리셋 상태 일괄 조회 시 IN 목록 크기
+const STATUS_CHUNK_SIZE = 500;
 
 class ExecutionService {
   // 프리셋 실행
+  // 단계가 구성된 프리셋은 첫 단계만 실행하고 반환 (다음 단계는 stageService가 준비 보고를 받아 실행)
   static async executePreset(presetId) {
     logger.info(`프리셋 실행 시작: ID ${presetId}`);
+    const endAction = actionDuration.startTimer({ action: 'execute' });
+    const endDispatch = dispatchDuration.startTimer({ action: 'execute' });
     console.log(`[DEBUG] executePreset 호출됨: ID ${presetId}`);
     
-    // 프리셋 정보 조회
-    const preset = await PresetModel.findById(presetId);
-    if (!preset) {
+    // 전송 계획 조회 (캐시되어 있으면 DB 조회 없음)
+    const plan = await dispatchPlanCache.getPlan(presetId);
+    if (!plan) {
       throw new Error('프리셋을 찾을 수 없습니다.');
     }
+    const preset = plan.preset;
     
-    // 대상 클라이언트 조회
-    const clients = await PresetModel.getTargetClients(presetId);
+    // 대상 클라이언트 (현재 상태는 클라이언트 레지스트리에서 조회)
+    const clients = plan.clientIds.map(id => dispatchPlanCache.currentClient(plan, id));
     const onlineClients = clients.filter(c => c.status !== 'offline');
     
     if (onlineClients.length === 0) {
       throw new Error('실행 가능한 온라인 클라이언트가 없습니다.');
     }
     
-    // 실행 결과 수집
+    const warnings = plan.missing.map(m => `클라이언트 ${m.normalizedClientName}에 대한 명령어가 설정되지 않았습니다.`);
+    const staged = plan.stages.length > 1 || !!plan.stages[0].ready;
+    
+    // 이전 실행에서 결과를 받지 못한 노드는 실패로 마감 (전송을 늦추지 않도록 기다리지 않음)
+    this.closeRun(preset.id, 'interrupted', '다음 실행 전까지 결과를 받지 못했습니다.');
+    const run = this.beginRun(plan);
+    
+    let dispatched;
+    let stageRun;
+    if (staged) {
+      stageRun = await stageService.begin(preset, plan.stages, async (index, register) => {
+        const result = await this.dispatchTargets(plan, plan.stages[index].targets, {
+          stage: plan.stages[index],
+          endDispatch: index === 0 ? endDispatch : null,
+          run,
+          onDispatch: register
+        });
+        if (index === 0) dispatched = result;
+        return result.commands;
+      }, () => this.failUndispatched(run, '이전 단계가 준비되지 않아 실행하지 않았습니다.'));
+    } else {
+      stageService.cancel(preset.id);
+      dispatched = await this.dispatchTargets(plan, plan.targets, { endDispatch, run });
+    }
+    
+    const executionResults = dispatched ? dispatched.executionResults : [];
+    if (dispatched) warnings.push(...dispatched.warnings);
+    const launchAt = dispatched ? dispatched.launchAt : undefined;
+    
+    // Socket.IO 이벤트 전송
+    socketService.emit('preset_executed', {
+      presetId: preset.id,
+      presetName: preset.name,
+      executionId: run.executionId,
+      clients: executionResults,
+      launchAt: launchAt !== undefined ? new Date(launchAt).toISOString() : null,
+      stages: stageRun,
+      warnings: warnings
+    });
+    
+    endAction();
+    return {
+      message: '프리셋이 실행되었습니다.',
+      preset: preset,
+      executionId: run.executionId,
+      clients: executionResults,
+      launchAt: launchAt !== undefined ? new Date(launchAt).toISOString() : null,
+      stages: stageRun,
+      summary: {
+        total: clients.length,
+        online: onlineClients.length,
+        offline: clients.length - onlineClients.length,
+        executed: executionResults.length
+      },
+      warnings: warnings.length > 0 ? warnings : undefined
+    };
+  }
+
+  // 대상 노드에 실행 명령 전송 후 상태/이력 기록 (단계 실행 시 단계마다 호출)
+  // options: { stage, endDispatch, run, onDispatch } / 반환: { executionResults, warnings, launchAt, commands }
+  // onDispatch(commands)는 명령을 보내기 직전에 호출 (결과가 DB 기록보다 먼저 도착해도 받을 수 있도록)
+  static async dispatchTargets(plan, targets, options = {}) {
+    const preset = plan.preset;
+    const { stage, endDispatch, run, onDispatch } = options;
     const executionResults = [];
     const warnings = [];
     
-    // 각 클라이언트에 명령 전송
-    for (const client of clients) {
-      // 클라이언트 이름 정규화
-      const normalizedClientName = client.name ? client.name.toUpperCase() : client.name;
-      console.log(`[DEBUG] 클라이언트 처리 시작: ${normalizedClientName} (ID: ${client.id}, IP: ${client.ip_address}, 상태: ${client.status})`);
-      
-      // 명령어 찾기 (ID, 원본 이름, 정규화된 이름 순서로)
-      const command = preset.client_commands[client.id] || preset.client_commands[client.name] || preset.client_commands[normalizedClientName];
-      
-      if (!command) {
-        console.log(`[DEBUG] 클라이언트 ${normalizedClientName} (IP: ${client.ip_address})에 대한 명령어가 설정되지 않음`);
-        warnings.push(`클라이언트 ${normalizedClientName}에 대한 명령어가 설정되지 않았습니다.`);
-        continue;
+    // 1단계: 전송 목록 구성 (연결이 바뀌었으면 전송 대상 이름을 다시 계산)
+    dispatchPlanCache.resolveTargets(plan, socketService);
+    // 모든 노드가 같은 서버 시각에 실행하도록 예약 (시계 동기화 전 에이전트는 받는 즉시 실행)
+    const launchAt = config.launch.synchronized && targets.length > 0
+      ? clockService.planLaunchAt(targets.map(target => target.sendClientName))
+      : undefined;
+    const dispatches = targets.map(target => ({
+      client: dispatchPlanCache.currentClient(plan, target.clientId),
+      normalizedClientName: target.normalizedClientName,
+      clientName: target.sendClientName,
+      event: 'execute_command',
+      data: {
+        clientName: target.sendClientName,
+        command: target.command,
+        presetId: preset.id,
+        commandId: crypto.randomUUID(),
+        launchAt,
+        // 준비 확인 조건 (에이전트가 실행 후 확인해 command_ready로 보고)
+        ready: stage && stage.ready ? stage.ready : undefined,
+        readyTimeout: stage && stage.ready ? stage.timeout : undefined
       }
+    }));
+    
+    if (run) {
+      for (const dispatch of dispatches) {
+        run.dispatched.add(dispatch.client.id);
+        run.commands.add(dispatch.data.commandId);
+        pendingResults.set(dispatch.data.commandId, { run, clientId: dispatch.client.id });
+      }
+    }
+    if (onDispatch) {
+      onDispatch(dispatches.map(dispatch => ({
+        commandId: dispatch.data.commandId,
+        clientId: dispatch.client.id,
+        clientName: dispatch.clientName
+      })));
+    }
+    
+    // 2단계: 모든 노드에 명령을 한꺼번에 전송 (노드 간 실행 시각 편차 최소화)
+    const sentResults = socketService.emitToClients(dispatches);
+    if (endDispatch) endDispatch();
+    if (launchAt !== undefined) {
+      clockService.trackLaunch(preset.id, launchAt, dispatches.filter(dispatch => sentResults.get(dispatch.clientName)));
+    }
+    
+    // 3단계: 전송 결과 분류
+    const historyEntries = [];
+    const offlineIds = [];
+    for (const dispatch of dispatches) {
+      const { client, normalizedClientName } = dispatch;
       
-      console.log(`[DEBUG] 클라이언트 ${normalizedClientName} (IP: ${client.ip_address})에 명령 전송 시도: ${command.substring(0, 50)}...`);
-      console.log(`[DEBUG] 프리셋 명령어 맵: ${JSON.stringify(preset.client_commands)}`);
-      
-      // IP 주소로 연결된 클라이언트 찾기 (더 안정적)
-      const connectedClientName = socketService.findClientByIP(client.ip_address);
-      const targetClientName = connectedClientName || client.name; // 원본 이름 사용
-      
-      console.log(`[DEBUG] IP ${client.ip_address}로 연결된 클라이언트: ${connectedClientName || '없음'}`);
-      console.log(`[DEBUG] 최종 대상 클라이언트 이름: ${targetClientName}`);
-      
-      // 클라이언트 이름을 대문자로 정규화하여 전송 (서버 내부에서 대문자로 관리)
-      const sendClientName = targetClientName.toUpperCase();
-      
-      const sent = socketService.emitToClient(sendClientName, 'execute_command', {
-        clientName: sendClientName,
-        command: command,
-        presetId: preset.id
-      });
-      
-      console.log(`[DEBUG] 명령 전송 결과: ${client.name} - ${sent ? '성공' : '실패'}`);
-      
-      if (sent) {
-        // 상태 업데이트
-        await ClientModel.updateStatus(client.id, 'running');
-        
-        // current_preset_id 업데이트
-        await db.run(
-          'UPDATE clients SET current_preset_id = ? WHERE id = ?',
-          [preset.id, client.id]
-        );
-        
-        // 실행 히스토리 기록
-        await PresetModel.addExecutionHistory(preset.id, client.id, 'executing');
-        
+      if (sentResults.get(dispatch.clientName)) {
+        historyEntries.push({ clientId: client.id, status: 'executing' });
         executionResults.push({
           clientId: client.id,
           clientName: normalizedClientName,
@@ -84,21 +183,61 @@ class ExecutionService {
         });
       } else {
         warnings.push(`클라이언트 ${normalizedClientName}가 연결되지 않았습니다.`);
-        await PresetModel.addExecutionHistory(preset.id, client.id, 'failed_offline');
+        historyEntries.push({ clientId: client.id, status: 'failed_offline' });
+        offlineIds.push(client.id);
+        if (run) {
+          run.commands.delete(dispatch.data.commandId);
+          pendingResults.delete(dispatch.data.commandId);
+        }
+      }
+    }
+    
+    // 4단계: 클라이언트 수와 관계없이 일괄 쿼리 몇 개를 하나의 트랜잭션으로 기록
+    // 실행 이력 행은 첫 전송에서 대상 전체를 결과 대기로 만들고, 결과 반영은 이 기록이 커밋된 뒤에
+    const createRun = !!run && !run.created;
+    let runCounts = null;
+    const persisted = db.transaction(async () => {
+      // 상태 + current_preset_id 업데이트
+      await ClientModel.updateStatusMany(executionResults.map(r => r.clientId), 'running', preset.id);
+      
+      // 실행 히스토리 기록
+      await PresetModel.addExecutionHistoryMany(preset.id, historyEntries);
+      
+      if (run) {
+        if (createRun) {
+          await ExecutionHistoryModel.create(preset.id, preset.name, preset.target_group_id, run.clientIds, run.executionId);
+        }
+        for (const clientId of offlineIds) {
+          runCounts = await ExecutionHistoryModel.updateClientResult(run.executionId, clientId, false, '연결되지 않음');
+        }
+      }
+      
+      // 프리셋의 마지막 실행 시간 업데이트
+      await PresetModel.updateLastExecuted(preset.id);
+      
+      // 프리셋 실행 상태 업데이트 (실행 중인 클라이언트가 있으면 running으로 설정)
+      if (executionResults.length > 0) {
+        await db.run(
+          'UPDATE presets SET is_running = 1 WHERE id = ?',
+          [preset.id]
+        );
       }
+    });
+    if (createRun) {
+      run.created = persisted.then(() => true, () => false);
+    }
+    await persisted;
+    if (runCounts) {
+      await this.finishRunIfDone(run, runCounts);
     }
     
-    // 프리셋의 마지막 실행 시간 업데이트
-    await PresetModel.updateLastExecuted(preset.id);
+    // 캐시된 프리셋 행도 DB와 같게 유지
+    preset.last_executed_at = clientRegistry.now();
+    if (executionResults.length > 0) {
+      preset.is_running = 1;
+    }
     
-    // 프리셋 실행 상태 업데이트 (실행 중인 클라이언트가 있으면 running으로 설정)
     if (executionResults.length > 0) {
-      // 프리셋 상태를 running으로 설정
-      await db.run(
-        'UPDATE presets SET is_running = 1 WHERE id = ?',
-        [preset.id]
-      );
-      
       console.log(`[DEBUG] 프리셋 ${preset.id} 상태를 running으로 업데이트`);
       
       // 웹 UI에 프리셋 상태 변경 이벤트 전송
@@ -112,75 +251,79 @@ class ExecutionService {
       socketService.emit('preset_status_changed', statusEvent);
     }
     
-    // Socket.IO 이벤트 전송
-    socketService.emit('preset_executed', {
-      presetId: preset.id,
-      presetName: preset.name,
-      clients: executionResults,
-      warnings: warnings
-    });
-    
     return {
-      message: '프리셋이 실행되었습니다.',
-      preset: preset,
-      clients: executionResults,
-      summary: {
-        total: clients.length,
-        online: onlineClients.length,
-        offline: clients.length - onlineClients.length,
-        executed: executionResults.length
-      },
-      warnings: warnings.length > 0 ? warnings : undefined
+      executionResults,
+      warnings,
+      launchAt,
+      commands: dispatches.map(dispatch => ({
+        commandId: dispatch.data.commandId,
+        clientId: dispatch.client.id,
+        clientName: dispatch.clientName,
+        sent: !!sentResults.get(dispatch.clientName)
+      }))
     };
   }
 
   // 프리셋 정지
   static async stopPreset(presetId) {
     logger.info(`프리셋 정지 시작: ID ${presetId}`);
+    const endAction = actionDuration.startTimer({ action: 'stop' });
+    const endDispatch = dispatchDuration.startTimer({ action: 'stop' });
     
-    // 프리셋 정보 조회
-    const preset = await PresetModel.findById(presetId);
-    if (!preset) {
+    // 전송 계획 조회 (캐시되어 있으면 DB 조회 없음)
+    const plan = await dispatchPlanCache.getPlan(presetId);
+    if (!plan) {
       throw new Error('프리셋을 찾을 수 없습니다.');
     }
+    const preset = plan.preset;
     
-    // 대상 클라이언트 조회
-    const clients = await PresetModel.getTargetClients(presetId);
+    // 아직 실행하지 않은 단계가 있으면 취소
+    stageService.cancel(preset.id);
+    
+    // 대상 클라이언트
+    const clients = plan.clientIds.map(id => dispatchPlanCache.currentClient(plan, id));
     const stopResults = [];
     
-    // 각 클라이언트에 정지 명령 전송
-    for (const client of clients) {
-      // 클라이언트 이름을 대문자로 정규화하여 전송 (서버 내부에서 대문자로 관리)
-      const sendClientName = client.name.toUpperCase();
-      
-      const sent = socketService.emitToClient(sendClientName, 'stop_command', {
-        clientName: sendClientName,
-        presetId: preset.id
-      });
-      
-      if (sent) {
-        // 상태 업데이트
-        await ClientModel.updateStatus(client.id, 'online');
-        
-        // current_preset_id 초기화
-        await db.run(
-          'UPDATE clients SET current_preset_id = NULL WHERE id = ?',
-          [client.id]
-        );
-        
-        stopResults.push({
-          clientId: client.id,
-          clientName: client.name,
-          status: 'stopping'
-        });
+    // 모든 클라이언트에 정지 명령을 한꺼번에 전송
+    // 클라이언트 이름을 대문자로 정규화하여 전송 (서버 내부에서 대문자로 관리)
+    const dispatches = clients.map(client => ({
+      client,
+      clientName: client.name.toUpperCase(),
+      event: 'stop_command',
+      data: {
+        clientName: client.name.toUpperCase(),
+        presetId: preset.id,
+        commandId: crypto.randomUUID()
       }
+    }));
+    const sentResults = socketService.emitToClients(dispatches);
+    endDispatch();
+    
+    for (const dispatch of dispatches) {
+      if (!sentResults.get(dispatch.clientName)) continue;
+      stopResults.push({
+        clientId: dispatch.client.id,
+        clientName: dispatch.client.name,
+        status: 'stopping'
+      });
     }
     
-    // 프리셋 실행 상태 업데이트 (정지)
-    await db.run(
-      'UPDATE presets SET is_running = 0 WHERE id = ?',
-      [preset.id]
-    );
+    // 전송 후 상태를 하나의 트랜잭션으로 기록
+    await db.transaction(async () => {
+      // 상태 업데이트 + current_preset_id 초기화
+      await ClientModel.updateStatusMany(stopResults.map(r => r.clientId), 'online', null);
+      
+      // 프리셋 실행 상태 업데이트 (정지)
+      await db.run(
+        'UPDATE presets SET is_running = 0 WHERE id = ?',
+        [preset.id]
+      );
+      await ChangeLogModel.record('preset', preset.id);
+    });
+    preset.is_running = 0;
+    
+    // 결과를 받지 못한 노드는 실패로 기록하고 실행 이력 마감
+    await this.closeRun(preset.id, 'stopped', '결과를 받기 전에 정지되었습니다.');
     
     // 웹 UI에 프리셋 상태 변경 이벤트 전송
     socketService.emit('preset_status_changed', {
@@ -196,6 +339,7 @@ class ExecutionService {
       clients: stopResults
     });
     
+    endAction();
     return {
       message: '프리셋 정지 요청이 전송되었습니다.',
       preset: preset,
@@ -207,6 +351,97 @@ class ExecutionService {
     };
   }
 
+  // 실행 이력 시작 - 대상은 단계와 관계없이 전송 계획의 모든 노드
+  static beginRun(plan) {
+    const run = {
+      executionId: `exec_${plan.preset.id}_${Date.now()}`,
+      presetId: plan.preset.id,
+      clientIds: plan.targets.map(target => target.clientId),
+      commands: new Set(), // 결과를 기다리는 commandId
+      dispatched: new Set(), // 명령을 보낸(또는 보내려 한) clientId - 단계 실행이 중간에 끝나면 나머지는 실패로 마감
+      created: null,       // 이력 행 기록 완료 Promise (실패하면 false)
+      completed: false
+    };
+    activeRuns.set(run.presetId, run);
+    return run;
+  }
+
+  // execution_result 반영 (결과를 기다리는 명령만, 같은 명령의 중복 결과는 무시)
+  static async recordResult(commandId, result) {
+    const pending = commandId ? pendingResults.get(commandId) : null;
+    if (!pending) return;
+    pendingResults.delete(commandId);
+    const { run, clientId } = pending;
+    run.commands.delete(commandId);
+    
+    try {
+      if (!run.created || !(await run.created)) return;
+      const success = !!(result && result.success);
+      const counts = await ExecutionHistoryModel.updateClientResult(
+        run.executionId,
+        clientId,
+        success,
+        success ? null : (result && result.error) || '실행 실패'
+      );
+      await this.finishRunIfDone(run, counts);
+    } catch (error) {
+      logger.error(`실행 결과 기록 실패 (${run.executionId}):`, error);
+    }
+  }
+
+  // 모든 대상의 결과가 모이면 실행 이력 완료
+  static async finishRunIfDone(run, counts) {
+    if (!counts || run.completed || counts.successful_count + counts.failed_count < counts.total_clients) return;
+    run.completed = true;
+    if (activeRuns.get(run.presetId) === run) {
+      activeRuns.delete(run.presetId);
+    }
+    await ExecutionHistoryModel.complete(run.executionId, counts.failed_count === counts.total_clients ? 'failed' : 'completed');
+  }
+
+  // 단계 실행이 끝났는데 명령을 보내지 않은 노드가 있으면 실패로 기록 (보낸 노드의 결과는 계속 기다림)
+  static async failUndispatched(run, errorMessage) {
+    const clientIds = run.clientIds.filter(clientId => !run.dispatched.has(clientId));
+    if (clientIds.length === 0 || run.completed) return;
+    if (!run.created || !(await run.created)) return;
+    
+    let counts = null;
+    await db.transaction(async () => {
+      for (const clientId of clientIds) {
+        counts = await ExecutionHistoryModel.updateClientResult(run.executionId, clientId, false, errorMessage);
+      }
+    });
+    await this.finishRunIfDone(run, counts);
+  }
+
+  // 정지/재실행 시 결과를 기다리던 노드를 실패로 기록하고 실행 이력 마감
+  static async closeRun(presetId, status, errorMessage) {
+    const run = activeRuns.get(presetId);
+    if (!run) return;
+    activeRuns.delete(presetId);
+    
+    const clientIds = [];
+    for (const commandId of run.commands) {
+      const pending = pendingResults.get(commandId);
+      if (pending) clientIds.push(pending.clientId);
+      pendingResults.delete(commandId);
+    }
+    run.commands.clear();
+    
+    try {
+      if (!run.created || !(await run.created) || run.completed) return;
+      run.completed = true;
+      await db.transaction(async () => {
+        for (const clientId of clientIds) {
+          await ExecutionHistoryModel.updateClientResult(run.executionId, clientId, false, errorMessage);
+        }
+        await ExecutionHistoryModel.complete(run.executionId, status);
+      });
+    } catch (error) {
+      logger.error(`실행 이력 마감 실패 (${run.executionId}):`, error);
+    }
+  }
+
   // 프리셋 상태 조회
   static async getPresetStatus(presetId) {
     const preset = await PresetModel.findById(presetId);
@@ -215,7 +450,26 @@ class ExecutionService {
     }
     
     const clients = await PresetModel.getTargetClients(presetId);
+    const { status, statusColor, summary } = this.summarizeStatus(presetId, clients);
     
+    return {
+      presetId: presetId,
+      presetName: preset.name,
+      status: status,
+      statusColor: statusColor,
+      summary: summary,
+      clients: clients.map(client => ({
+        id: client.id,
+        name: client.name,
+        status: client.status,
+        current_preset_id: client.current_preset_id,
+        isRunningThisPreset: client.status === 'running' && client.current_preset_id == presetId
+      }))
+    };
+  }
+
+  // 대상 클라이언트 상태로 프리셋 상태 판정
+  static summarizeStatus(presetId, clients) {
     // 각 클라이언트의 상태 판정
     let runningCount = 0;
     let onlineCount = 0;
@@ -252,25 +506,54 @@ class ExecutionService {
     }
     
     return {
-      presetId: presetId,
-      presetName: preset.name,
-      status: status,
-      statusColor: statusColor,
+      status,
+      statusColor,
       summary: {
         total: clients.length,
         running: runningCount,
         online: onlineCount,
         offline: offlineCount
-      },
-      clients: clients.map(client => ({
-        id: client.id,
-        name: client.name,
-        status: client.status,
-        current_preset_id: client.current_preset_id,
-        isRunningThisPreset: client.status === 'running' && client.current_preset_id == presetId
-      }))
+      }
     };
   }
+
+  // 여러 프리셋에 상태 필드를 붙임 - 대상 그룹의 클라이언트를 한 번에 조회 (조회 실패 시 모두 unknown)
+  static async withStatusMany(presets) {
+    try {
+      const groupIds = [...new Set(presets.map(preset => preset.target_group_id).filter(id => id))];
+      const clientsByGroup = new Map(groupIds.map(id => [id, []]));
+      for (let i = 0; i < groupIds.length; i += STATUS_CHUNK_SIZE) {
+        const chunk = groupIds.slice(i, i + STATUS_CHUNK_SIZE);
+        const rows = await db.all(
+          `SELECT gc.group_id, c.id, c.status, c.current_preset_id
+           FROM group_clients gc
+           JOIN clients c ON c.id = gc.client_id
+           WHERE gc.group_id IN (${chunk.map(() => '?').join(', ')})`,
+          chunk
+        );
+        for (const row of rows) {
+          clientsByGroup.get(row.group_id).push(row);
+        }
+      }
+      
+      return presets.map(preset => {
+        const clients = clientsByGroup.get(preset.target_group_id) || [];
+        const { status } = this.summarizeStatus(preset.id, clients);
+        return {
+          ...preset,
+          status,
+          is_running: status === 'running' || status === 'partial'
+        };
+      });
+    } catch (error) {
+      logger.error('프리셋 상태 일괄 조회 실패:', error);
+      return presets.map(preset => ({
+        ...preset,
+        status: 'unknown',
+        is_running: false
+      }));
+    }
+  }
 }
 
 module.exports = ExecutionService; 
\ No newline at end of file
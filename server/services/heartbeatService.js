@@ -1,12 +1,38 @@
+const { EventEmitter } = require('events');
 const ClientModel = require('../models/Client');
 const socketService = require('./socketService');
+const clientRegistry = require('./clientRegistry');
+const config = require('../config/server');
 const logger = require('../utils/logger');
+const DeadlineQueue = require('../utils/deadlineQueue');
+const metrics = require('../utils/metrics');
 
-class HeartbeatService {
+const heartbeatInterval = metrics.histogram(
+  'uecms_heartbeat_interval_seconds',
+  '같은 클라이언트의 생존 신호 사이 간격 (하트비트 주기 5초보다 길면 지연)',
+  [],
+  [1, 2.5, 5, 6, 7.5, 10, 15, 30, 60, 120]
+);
+const heartbeatAge = metrics.gauge('uecms_heartbeat_age_seconds', '클라이언트별 마지막 생존 신호 이후 경과 시간', ['client_id', 'client']);
+const heartbeatClients = metrics.gauge('uecms_heartbeat_clients', '하트비트 추적 클라이언트 수', ['state']);
+
+// 생존 신호마다 'alive' 이벤트(client) 발생 - 전원 켜기 후 부팅 완료 확인 등에 사용
+class HeartbeatService extends EventEmitter {
   constructor() {
+    super();
     this.clientHeartbeats = new Map();
     this.running = false;
-    this.monitorInterval = null;
+    
+    // 클라이언트별 생존 마감 시각 (가장 이른 마감 시각에만 깨어남)
+    // soft: 하트비트가 끊김 → connection_check 확인 / hard: 응답 없음 → 오프라인
+    this.liveness = new DeadlineQueue((clientId, payload) => this.handleDeadline(clientId, payload));
+    
+    // 아직 DB에 기록하지 않은 last_seen (client_id -> 시각)
+    this.pendingLastSeen = new Map();
+    this.flushInterval = null;
+    this.flushing = false;
+    
+    metrics.onCollect(() => this.collectMetrics());
   }
 
   async start() {
@@ -18,10 +44,13 @@ class HeartbeatService {
     this.running = true;
     logger.info('🔄 하트비트 서비스 시작됨');
     
-    // 30초마다 하트비트 모니터링
-    this.monitorInterval = setInterval(() => {
-      this.monitorHeartbeats();
-    }, 30000);
+    // 하트비트는 메모리에 모아 두었다가 주기적으로 한 번에 기록
+    this.flushInterval = setInterval(() => {
+      this.flushLastSeen();
+    }, config.monitoring.heartbeatFlushInterval);
+    
+    // 서버 시작 전부터 온라인으로 기록된 클라이언트도 마감 시각 등록
+    await this.scheduleKnownClients();
   }
 
   async stop() {
@@ -31,11 +60,16 @@ class HeartbeatService {
 
     this.running = false;
     
-    if (this.monitorInterval) {
-      clearInterval(this.monitorInterval);
-      this.monitorInterval = null;
+    this.liveness.clear();
+    
+    if (this.flushInterval) {
+      clearInterval(this.flushInterval);
+      this.flushInterval = null;
     }
     
+    // 남은 last_seen 기록
+    await this.flushLastSeen();
+    
     logger.info('⏹️ 하트비트 서비스 중지됨');
   }
 
@@ -54,64 +88,163 @@ class HeartbeatService {
         return;
       }
       
-      const previousStatus = client.status;
-      this.clientHeartbeats.set(client.id, new Date());
+      await this.recordHeartbeat(client);
+    } catch (error) {
+      logger.error(`하트비트 처리 실패 (클라이언트 ${clientName}):`, error);
+    }
+  }
+
+  // 바이너리 하트비트 (registration_success에서 받은 client_id만 전송됨)
+  async receiveHeartbeatById(clientId) {
+    try {
+      const client = await ClientModel.findById(clientId);
+      if (!client) {
+        logger.warn(`하트비트 수신: 클라이언트를 찾을 수 없음 - ID ${clientId}`);
+        return false;
+      }
       
-      // DB에 last_seen 업데이트
+      await this.recordHeartbeat(client);
+      return true;
+    } catch (error) {
+      logger.error(`하트비트 처리 실패 (클라이언트 ID ${clientId}):`, error);
+      return false;
+    }
+  }
+
+  async recordHeartbeat(client) {
+    const previousStatus = client.status;
+    this.touch(client);
+    
+    // last_seen은 메모리에만 기록 (flushLastSeen에서 일괄 저장)
+    this.pendingLastSeen.set(client.id, clientRegistry.now());
+    
+    // 상태 기록은 실제 전환이 있을 때만 (running 상태는 유지)
+    if (previousStatus === 'offline') {
       await ClientModel.updateStatus(client.id, 'online');
       
-      // 상태가 변경된 경우에만 이벤트 전송
-      if (previousStatus === 'offline') {
-        socketService.emit('client_status_changed', {
-          client_id: client.id,
-          status: 'online',
-          reason: 'heartbeat_updated'
-        });
-        logger.info(`💓 클라이언트 ${clientName} (ID: ${client.id}) 온라인 상태 유지 알림 전송`);
+      socketService.emit('client_status_changed', {
+        client_id: client.id,
+        status: 'online',
+        reason: 'heartbeat_updated'
+      });
+      logger.info(`💓 클라이언트 ${client.name} (ID: ${client.id}) 온라인 상태 유지 알림 전송`);
+    }
+    
+    logger.debug(`💓 클라이언트 ${client.name} (ID: ${client.id}) 하트비트 수신`);
+  }
+
+  // 모아 둔 last_seen을 UPDATE 한 번으로 기록
+  async flushLastSeen() {
+    if (this.flushing || this.pendingLastSeen.size === 0) return;
+    
+    const batch = this.pendingLastSeen;
+    this.pendingLastSeen = new Map();
+    this.flushing = true;
+    
+    try {
+      await ClientModel.updateLastSeenMany(batch);
+      logger.debug(`💓 last_seen 일괄 기록: ${batch.size}개 클라이언트`);
+    } catch (error) {
+      logger.error('last_seen 일괄 기록 실패:', error);
+      // 실패한 항목은 다음 주기에 다시 기록 (그 사이 들어온 더 최신 값은 유지)
+      for (const [clientId, lastSeen] of batch) {
+        if (!this.pendingLastSeen.has(clientId)) {
+          this.pendingLastSeen.set(clientId, lastSeen);
+        }
+      }
+    } finally {
+      this.flushing = false;
+    }
+  }
+
+  async scheduleKnownClients() {
+    try {
+      const onlineClients = await ClientModel.findOnlineClients();
+      const deadline = Date.now() + config.monitoring.heartbeatGracePeriod;
+      
+      for (const client of onlineClients) {
+        this.liveness.schedule(client.id, deadline, { phase: 'soft', name: client.name });
       }
       
-      logger.debug(`💓 클라이언트 ${clientName} (ID: ${client.id}) 하트비트 수신`);
+      logger.info(`💓 생존 확인 대상 등록: ${onlineClients.length}개 클라이언트`);
     } catch (error) {
-      logger.error(`하트비트 처리 실패 (클라이언트 ${clientName}):`, error);
+      logger.error('생존 확인 대상 등록 실패:', error);
     }
   }
 
-  async monitorHeartbeats() {
+  // 생존 신호 기록 (하트비트, 등록, connection_check 응답) → 소프트 마감 시각 연장
+  touch(client) {
+    const now = new Date();
+    const previous = this.clientHeartbeats.get(client.id);
+    if (previous) {
+      heartbeatInterval.observe({}, (now - previous) / 1000);
+    }
+    this.clientHeartbeats.set(client.id, now);
+    this.emit('alive', client);
     if (!this.running) return;
+    
+    this.liveness.schedule(client.id, Date.now() + config.monitoring.livenessSoftTimeout, {
+      phase: 'soft',
+      name: client.name
+    });
+  }
 
+  // 소켓 연결이 끊긴 클라이언트 → 재연결 여유시간이 지나면 오프라인
+  trackDisconnect(client) {
+    if (!this.running) return;
+    
+    this.liveness.schedule(client.id, Date.now() + config.monitoring.reconnectionGracePeriod, {
+      phase: 'hard',
+      name: client.name,
+      reason: '재연결 타임아웃'
+    });
+  }
+
+  handleDeadline(clientId, payload) {
+    if (payload.phase === 'soft') {
+      // 하트비트는 끊겼지만 소켓이 살아 있으면 connection_check로 한 번 더 확인
+      const sent = socketService.sendConnectionCheck(payload.name, config.monitoring.livenessProbeTimeout);
+      if (sent) {
+        logger.debug(`💓 클라이언트 ${payload.name} (ID: ${clientId}) 하트비트 지연 - 연결 확인 전송`);
+        this.liveness.schedule(clientId, Date.now() + config.monitoring.livenessProbeTimeout, {
+          phase: 'hard',
+          name: payload.name,
+          reason: 'heartbeat_timeout'
+        });
+        return;
+      }
+      this.markOffline(clientId, 'heartbeat_timeout');
+      return;
+    }
+    
+    this.markOffline(clientId, payload.reason);
+  }
+
+  async markOffline(clientId, reason) {
     try {
-      const currentTime = new Date();
-      const timeoutThreshold = new Date(currentTime.getTime() - 30000); // 30초 타임아웃
+      const client = await ClientModel.findById(clientId);
+      if (!client || client.status === 'offline') return;
       
-      // 모든 온라인 클라이언트 확인
-      const onlineClients = await ClientModel.findOnlineClients();
+      // 오프라인으로 변경
+      await ClientModel.updateStatus(clientId, 'offline');
+      this.clientHeartbeats.delete(clientId);
       
-      for (const client of onlineClients) {
-        const clientId = client.id;
-        const lastHeartbeat = this.clientHeartbeats.get(clientId) || client.last_seen;
-        
-        // 타임아웃 체크
-        if (!lastHeartbeat || new Date(lastHeartbeat) < timeoutThreshold) {
-          // 오프라인으로 변경
-          await ClientModel.updateStatus(clientId, 'offline');
-          
-          // Socket으로 알림
-          socketService.emit('client_status_changed', {
-            client_id: clientId,
-            status: 'offline',
-            reason: 'heartbeat_timeout'
-          });
-          
-          // 실행 중이던 프리셋 정리
-          if (client.current_preset_id) {
-            await this.cleanupPresetExecution(clientId, client.current_preset_id);
-          }
-          
-          logger.info(`❌ 클라이언트 ${clientId} 하트비트 타임아웃으로 오프라인 처리`);
-        }
+      // Socket으로 알림
+      socketService.emit('client_status_changed', {
+        client_id: clientId,
+        name: client.name,
+        status: 'offline',
+        reason: reason
+      });
+      
+      // 실행 중이던 프리셋 정리
+      if (client.current_preset_id) {
+        await this.cleanupPresetExecution(clientId, client.current_preset_id);
       }
+      
+      logger.info(`❌ 클라이언트 ${client.name} (ID: ${clientId}) 오프라인 처리: ${reason}`);
     } catch (error) {
-      logger.error('하트비트 모니터링 오류:', error);
+      logger.error(`오프라인 처리 실패 (클라이언트 ${clientId}):`, error);
     }
   }
 
@@ -151,13 +284,14 @@ class HeartbeatService {
   getHeartbeatStats() {
     const stats = {
       totalClients: this.clientHeartbeats.size,
+      trackedClients: this.liveness.size,
       activeClients: 0,
       inactiveClients: 0,
       lastUpdate: new Date().toISOString()
     };
 
     const currentTime = new Date();
-    const timeoutThreshold = new Date(currentTime.getTime() - 30000);
+    const timeoutThreshold = new Date(currentTime.getTime() - config.monitoring.livenessSoftTimeout);
 
     for (const [clientId, lastHeartbeat] of this.clientHeartbeats) {
       if (lastHeartbeat > timeoutThreshold) {
@@ -169,6 +303,20 @@ class HeartbeatService {
 
     return stats;
   }
+
+  // /metrics 조회 시 클라이언트별 경과 시간 갱신 (오프라인 처리된 클라이언트는 빠짐)
+  collectMetrics() {
+    const now = Date.now();
+    heartbeatAge.reset();
+    for (const [clientId, lastHeartbeat] of this.clientHeartbeats) {
+      heartbeatAge.set({ client_id: clientId, client: clientRegistry.getName(clientId) || '' }, (now - lastHeartbeat) / 1000);
+    }
+
+    const stats = this.getHeartbeatStats();
+    heartbeatClients.set({ state: 'active' }, stats.activeClients);
+    heartbeatClients.set({ state: 'inactive' }, stats.inactiveClients);
+    heartbeatClients.set({ state: 'tracked' }, stats.trackedClients);
+  }
 }
 
 // 싱글톤 인스턴스 생성
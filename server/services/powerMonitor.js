@@ -0,0 +1,344 @@
+const net = require('net');
+const dgram = require('dgram');
+const config = require('../config/server');
+const db = require('../config/database');
+const clientRegistry = require('./clientRegistry');
+const socketService = require('./socketService');
+const logger = require('../utils/logger');
+const metrics = require('../utils/metrics');
+
+// 행당 바인딩 변수 5개 - SQLite 한도(999)를 넘지 않도록 나누어 실행
+const UPSERT_CHUNK_SIZE = 150;
+
+const sweepDuration = metrics.histogram('uecms_power_sweep_duration_seconds', '전원 상태 스윕 한 번의 시간');
+const probesTotal = metrics.counter('uecms_power_probes_total', '호스트 도달 확인 수', ['result']);
+const powerHosts = metrics.gauge('uecms_power_hosts', '전원 상태별 호스트 수', ['state']);
+
+// SQLite datetime 형식 (UTC, 'YYYY-MM-DD HH:MM:SS')
+function sqliteTime(date = new Date()) {
+  return date.toISOString().replace('T', ' ').substring(0, 19);
+}
+
+// 연결된 UDP 소켓에 ICMP port unreachable이 전달될 때의 오류 코드
+const UDP_ALIVE_ERRORS = new Set(['ECONNREFUSED', 'ECONNRESET']);
+
+// 호스트 도달 확인 (프로세스 실행 없이 소켓만 사용)
+// - TCP: 연결 성공이나 연결 거부(RST) 모두 호스트가 켜져 있다는 뜻
+// - UDP: 닫힌 포트로 보낸 데이터그램에 ICMP port unreachable이 오면 켜져 있음
+//   (Linux는 ECONNREFUSED, Windows는 WSAECONNRESET이 ECONNRESET으로 전달됨)
+// 응답이 없거나 호스트/네트워크 도달 불가 오류면 꺼진 것으로 본다.
+function probeHost(ipAddress, options = {}) {
+  const { ports = [], udpPort = null, timeout = 1500 } = options;
+  const startedAt = process.hrtime.bigint();
+
+  return new Promise((resolve) => {
+    const handles = [];
+    let remaining = ports.length + (udpPort ? 1 : 0);
+    let settled = false;
+    let timer = null;
+
+    const finish = (alive, method) => {
+      if (settled) return;
+      settled = true;
+      clearTimeout(timer);
+      for (const handle of handles) {
+        try {
+          handle.destroy ? handle.destroy() : handle.close();
+        } catch (error) {
+          // 이미 닫힌 소켓
+        }
+      }
+      resolve({
+        alive,
+        method,
+        rtt: alive ? Number(process.hrtime.bigint() - startedAt) / 1e6 : null
+      });
+    };
+    const negative = () => {
+      remaining--;
+      if (remaining <= 0) finish(false, null);
+    };
+
+    if (remaining === 0) {
+      finish(false, null);
+      return;
+    }
+    timer = setTimeout(() => finish(false, null), timeout);
+
+    for (const port of ports) {
+      const socket = net.connect({ host: ipAddress, port });
+      handles.push(socket);
+      socket.once('connect', () => finish(true, `tcp:${port}`));
+      socket.once('error', (error) => {
+        if (error.code === 'ECONNREFUSED') {
+          finish(true, `tcp:${port}`);
+        } else {
+          negative();
+        }
+      });
+    }
+
+    if (udpPort) {
+      const socket = dgram.createSocket('udp4');
+      handles.push(socket);
+      socket.once('error', (error) => {
+        if (UDP_ALIVE_ERRORS.has(error.code)) {
+          finish(true, `udp:${udpPort}`);
+        } else {
+          negative();
+        }
+      });
+      // 연결된 UDP 소켓이어야 ICMP 오류를 받을 수 있음
+      socket.connect(udpPort, ipAddress, (error) => {
+        if (error) return negative();
+        socket.send(Buffer.alloc(1), (sendError) => {
+          if (sendError && UDP_ALIVE_ERRORS.has(sendError.code)) finish(true, `udp:${udpPort}`);
+        });
+      });
+    }
+  });
+}
+
+// 동시 실행 수를 제한해 목록 처리
+async function mapWithConcurrency(items, limit, worker) {
+  const results = new Array(items.length);
+  let next = 0;
+  const runners = Array.from({ length: Math.min(limit, items.length) }, async () => {
+    while (next < items.length) {
+      const index = next++;
+      results[index] = await worker(items[index]);
+    }
+  });
+  await Promise.all(runners);
+  return results;
+}
+
+// 전원 상태 모니터
+// tickInterval마다 스윕하되, 확인 시각이 된 호스트만 동시 실행 수 제한 안에서 확인한다.
+// - 상태가 바뀐 호스트는 minInterval로 자주, 그대로인 호스트는 확인 간격을 두 배씩 늘려 maxInterval까지
+// - 에이전트 소켓이 연결된 호스트는 켜져 있으므로 확인하지 않음
+// - 바뀐 상태만 스윕당 한 번의 일괄 쓰기와 power_state_updated 한 프레임으로 반영
+class PowerMonitor {
+  constructor() {
+    this.hosts = new Map(); // client_id -> { ip, state, source, interval, nextProbeAt, lastCheck, changedAt, rtt, method }
+    this.timer = null;
+    this.sweeping = false;
+    this.lastSweep = null;
+    this.stats = { sweeps: 0, probes: 0, changes: 0, skippedTicks: 0 };
+
+    metrics.onCollect(() => this.collectMetrics());
+  }
+
+  // 저장된 마지막 상태 적재 (재시작 직후 첫 스윕에서 모두 다시 확인)
+  async initialize() {
+    const rows = await db.all('SELECT client_id, power_state, changed_at FROM client_power_state');
+    for (const row of rows) {
+      this.hosts.set(row.client_id, {
+        ip: null,
+        state: row.power_state,
+        source: 'stored',
+        interval: config.power.minInterval,
+        nextProbeAt: 0,
+        lastCheck: null,
+        changedAt: row.changed_at,
+        rtt: null,
+        method: null
+      });
+    }
+  }
+
+  start() {
+    if (this.timer || !config.power.monitoring) return;
+
+    this.timer = setInterval(() => this.sweep(), config.power.tickInterval);
+    if (this.timer.unref) this.timer.unref();
+    logger.info(`🔌 전원 상태 모니터링 시작 (동시 확인 ${config.power.concurrency}개, 간격 ${config.power.minInterval / 1000}~${config.power.maxInterval / 1000}초)`);
+  }
+
+  stop() {
+    if (!this.timer) return;
+    clearInterval(this.timer);
+    this.timer = null;
+    logger.info('🔌 전원 상태 모니터링 중지');
+  }
+
+  probe(ipAddress) {
+    const { probePorts, probeUdpPort, probeTimeout } = config.power;
+    return probeHost(ipAddress, { ports: probePorts, udpPort: probeUdpPort, timeout: probeTimeout });
+  }
+
+  async sweep() {
+    // 이전 스윕이 끝나지 않았으면 이번 주기는 건너뜀 (스윕이 겹쳐 쌓이지 않도록)
+    if (this.sweeping) {
+      this.stats.skippedTicks++;
+      return;
+    }
+    this.sweeping = true;
+    const endSweep = sweepDuration.startTimer();
+
+    try {
+      const now = Date.now();
+      const clients = clientRegistry.list();
+      const known = new Set();
+      const due = [];
+      const changes = [];
+
+      for (const client of clients) {
+        known.add(client.id);
+        const host = this.hosts.get(client.id) || this.createHost();
+        host.ip = client.ip_address;
+        this.hosts.set(client.id, host);
+
+        // 에이전트가 연결되어 있으면 확인 없이 켜짐 (연결이 끊기면 다음 스윕에서 바로 확인)
+        if (client.name && socketService.isClientConnected(client.name.toUpperCase())) {
+          if (this.apply(client.id, host, { alive: true, method: 'agent', rtt: null }, now)) {
+            changes.push(client.id);
+          }
+          host.nextProbeAt = 0;
+          continue;
+        }
+
+        if (host.nextProbeAt <= now && host.ip) {
+          due.push({ clientId: client.id, host });
+        }
+      }
+
+      // 삭제된 클라이언트 정리
+      for (const clientId of this.hosts.keys()) {
+        if (!known.has(clientId)) this.hosts.delete(clientId);
+      }
+
+      const results = await mapWithConcurrency(due, config.power.concurrency, ({ host }) => this.probe(host.ip));
+      const checkedAt = Date.now();
+      due.forEach(({ clientId, host }, i) => {
+        probesTotal.inc({ result: results[i].alive ? 'alive' : 'unreachable' });
+        if (this.apply(clientId, host, results[i], checkedAt)) {
+          changes.push(clientId);
+        }
+      });
+
+      this.stats.sweeps++;
+      this.stats.probes += due.length;
+      this.stats.changes += changes.length;
+      this.lastSweep = {
+        at: new Date(checkedAt).toISOString(),
+        hosts: clients.length,
+        probed: due.length,
+        changed: changes.length,
+        durationMs: Math.round(endSweep() * 1000)
+      };
+
+      if (changes.length > 0) {
+        await this.persist(changes);
+        socketService.emit('power_state_updated', {
+          states: changes.map(clientId => this.describe(clientId)),
+          timestamp: new Date().toISOString()
+        });
+      }
+    } catch (error) {
+      logger.error('전원 모니터링 오류:', error);
+    } finally {
+      this.sweeping = false;
+    }
+  }
+
+  createHost() {
+    return {
+      ip: null,
+      state: 'unknown',
+      source: null,
+      interval: config.power.minInterval,
+      nextProbeAt: 0,
+      lastCheck: null,
+      changedAt: null,
+      rtt: null,
+      method: null
+    };
+  }
+
+  // 확인 결과 반영 및 다음 확인 시각 계산 - 상태가 바뀌었으면 true
+  apply(clientId, host, result, now) {
+    const state = result.alive ? 'online' : 'offline';
+    const changed = host.state !== state;
+
+    host.source = result.method === 'agent' ? 'agent' : 'probe';
+    host.lastCheck = now;
+    host.rtt = result.rtt;
+    host.method = result.method;
+    if (changed) {
+      host.state = state;
+      host.changedAt = sqliteTime(new Date(now));
+      host.interval = config.power.minInterval;
+    } else {
+      host.interval = Math.min(host.interval * 2, config.power.maxInterval);
+    }
+    // 같은 시각에 몰리지 않도록 최대 10% 분산
+    host.nextProbeAt = now + host.interval + Math.floor(Math.random() * host.interval * 0.1);
+    return changed;
+  }
+
+  // 바뀐 상태만 여러 행 upsert로 기록
+  async persist(clientIds) {
+    const rows = clientIds.map(clientId => {
+      const host = this.hosts.get(clientId);
+      return [clientId, host.state, host.changedAt, sqliteTime(new Date(host.lastCheck)), host.method];
+    });
+
+    await db.transaction(async () => {
+      for (let i = 0; i < rows.length; i += UPSERT_CHUNK_SIZE) {
+        const chunk = rows.slice(i, i + UPSERT_CHUNK_SIZE);
+        await db.run(
+          `INSERT INTO client_power_state (client_id, power_state, changed_at, last_check, method)
+           VALUES ${chunk.map(() => '(?, ?, ?, ?, ?)').join(', ')}
+           ON CONFLICT(client_id) DO UPDATE SET
+             power_state = excluded.power_state,
+             changed_at = excluded.changed_at,
+             last_check = excluded.last_check,
+             method = excluded.method`,
+          chunk.flat()
+        );
+      }
+    });
+  }
+
+  describe(clientId) {
+    const host = this.hosts.get(clientId);
+    if (!host) return null;
+    return {
+      clientId,
+      powerState: host.state,
+      source: host.source,
+      method: host.method,
+      rtt: host.rtt === null ? null : Math.round(host.rtt * 10) / 10,
+      lastCheck: host.lastCheck ? new Date(host.lastCheck).toISOString() : null,
+      changedAt: host.changedAt,
+      nextCheckIn: host.nextProbeAt ? Math.max(0, host.nextProbeAt - Date.now()) : null
+    };
+  }
+
+  getStates() {
+    return Array.from(this.hosts.keys()).map(clientId => this.describe(clientId));
+  }
+
+  collectMetrics() {
+    const counts = { online: 0, offline: 0, unknown: 0 };
+    for (const host of this.hosts.values()) {
+      counts[host.state] = (counts[host.state] || 0) + 1;
+    }
+    for (const [state, count] of Object.entries(counts)) {
+      powerHosts.set({ state }, count);
+    }
+  }
+
+  getStats() {
+    return {
+      running: !!this.timer,
+      hosts: this.hosts.size,
+      sweeping: this.sweeping,
+      lastSweep: this.lastSweep,
+      ...this.stats
+    };
+  }
+}
+
+module.exports = new PowerMonitor();
@@ -0,0 +1,224 @@
+const fs = require('fs');
+const path = require('path');
+const zlib = require('zlib');
+const { once } = require('events');
+const config = require('../config/server');
+const db = require('../config/database');
+const ExecutionRollupModel = require('../models/ExecutionRollup');
+const logger = require('../utils/logger');
+
+// SQLite datetime 형식 (UTC, 'YYYY-MM-DD HH:MM:SS')
+function sqliteTime(date) {
+  return date.toISOString().replace('T', ' ').substring(0, 19);
+}
+
+// 실행 이력 보존 작업
+// 1. 보존 기간(executionHistoryDays)이 지난 실행 이력을 gzip JSONL 파일로 보관한 뒤 삭제
+//    (execution_history, 그룹 실행 단위 이력 execution_runs + 클라이언트별 결과 execution_run_results)
+// 2. rollupHourlyDays가 지난 시간 단위 집계를 일 단위로 합침
+// 통계는 집계 테이블에서 계산하므로 원본을 지워도 전체 실행 수는 유지된다.
+class RetentionService {
+  constructor() {
+    this.timer = null;
+    this.startupTimer = null;
+    this.isRunning = false;
+    this.lastRun = null;
+  }
+
+  start() {
+    const { interval, startupDelay } = config.retention;
+
+    // 서버 시작 직후 부하를 피해 잠시 뒤 첫 실행
+    this.startupTimer = setTimeout(() => this.run(), startupDelay);
+    this.timer = setInterval(() => this.run(), interval);
+    for (const timer of [this.startupTimer, this.timer]) {
+      if (timer.unref) timer.unref();
+    }
+
+    logger.info(`실행 이력 보존 작업 시작 (보존 ${config.retention.executionHistoryDays}일)`);
+  }
+
+  stop() {
+    clearTimeout(this.startupTimer);
+    clearInterval(this.timer);
+    this.startupTimer = null;
+    this.timer = null;
+  }
+
+  async run() {
+    if (this.isRunning) return;
+    this.isRunning = true;
+
+    const { executionHistoryDays, rollupHourlyDays } = config.retention;
+    const dayMs = 24 * 60 * 60 * 1000;
+
+    try {
+      const before = new Date(Date.now() - executionHistoryDays * dayMs);
+      const archived = await this.archiveExecutionHistory(before);
+      const archivedRuns = await this.archiveExecutionRuns(before);
+      const compacted = await ExecutionRollupModel.compact(sqliteTime(new Date(Date.now() - rollupHourlyDays * dayMs)));
+
+      this.lastRun = {
+        at: new Date().toISOString(),
+        archivedRows: archived.rows,
+        archiveFile: archived.file,
+        archivedRuns: archivedRuns.rows,
+        runArchiveFile: archivedRuns.file,
+        compactedBuckets: compacted
+      };
+      if (archived.rows > 0 || archivedRuns.rows > 0 || compacted > 0) {
+        logger.info(`실행 이력 보존 작업 완료: ${archived.rows}개 보관${archived.file ? ` (${archived.file})` : ''}, 실행 ${archivedRuns.rows}건 보관${archivedRuns.file ? ` (${archivedRuns.file})` : ''}, 집계 ${compacted}개 버킷 합침`);
+      }
+    } catch (error) {
+      logger.error('실행 이력 보존 작업 실패:', error);
+    } finally {
+      this.isRunning = false;
+    }
+  }
+
+  // 기준 시각 이전 이력을 파일로 보관 후 삭제
+  // 파일을 끝까지 쓴 뒤에만 삭제하므로 중간에 실패해도 이력은 남는다 (다음 실행에서 다시 보관)
+  async archiveExecutionHistory(before) {
+    const cutoff = sqliteTime(before);
+    const { batchSize } = config.retention;
+
+    const first = await db.get(
+      'SELECT id FROM execution_history WHERE executed_at < ? ORDER BY id LIMIT 1',
+      [cutoff]
+    );
+    if (!first) {
+      return { rows: 0, file: null };
+    }
+
+    let lastId = 0;
+    const { rows, file } = await this.writeArchive('execution_history', async () => {
+      const batch = await db.all(
+        'SELECT * FROM execution_history WHERE executed_at < ? AND id > ? ORDER BY id LIMIT ?',
+        [cutoff, lastId, batchSize]
+      );
+      if (batch.length > 0) {
+        lastId = batch[batch.length - 1].id;
+      }
+      return batch;
+    });
+
+    // 보관한 범위를 나누어 삭제 (쓰기 잠금을 오래 잡지 않도록)
+    let fromId = first.id - 1;
+    while (fromId < lastId) {
+      const toId = Math.min(lastId, fromId + batchSize);
+      await db.run(
+        'DELETE FROM execution_history WHERE id > ? AND id <= ? AND executed_at < ?',
+        [fromId, toId, cutoff]
+      );
+      fromId = toId;
+    }
+
+    return { rows, file };
+  }
+
+  // 기준 시각 이전에 시작한 실행을 클라이언트별 결과와 함께 한 줄씩 보관 후 삭제
+  async archiveExecutionRuns(before) {
+    // started_at은 ISO 형식으로 기록됨
+    const cutoff = before.toISOString();
+    const { batchSize } = config.retention;
+
+    const first = await db.get('SELECT id FROM execution_runs WHERE started_at < ? LIMIT 1', [cutoff]);
+    if (!first) {
+      return { rows: 0, file: null };
+    }
+
+    let lastId = '';
+    const { rows, file } = await this.writeArchive('execution_runs', async () => {
+      const runs = await db.all(
+        'SELECT * FROM execution_runs WHERE started_at < ? AND id > ? ORDER BY id LIMIT ?',
+        [cutoff, lastId, batchSize]
+      );
+      if (runs.length === 0) {
+        return runs;
+      }
+      lastId = runs[runs.length - 1].id;
+
+      const results = await db.all(
+        `SELECT run_id, client_id, success, error_message, updated_at FROM execution_run_results
+         WHERE run_id IN (SELECT id FROM execution_runs WHERE started_at < ? AND id >= ? AND id <= ?)`,
+        [cutoff, runs[0].id, lastId]
+      );
+      const byRun = new Map(runs.map(run => [run.id, { ...run, results: [] }]));
+      for (const { run_id: runId, ...result } of results) {
+        byRun.get(runId).results.push(result);
+      }
+      return Array.from(byRun.values());
+    });
+
+    // 보관한 실행만 나누어 삭제 (외래 키 CASCADE에 기대지 않고 결과 행부터)
+    for (;;) {
+      const batch = await db.all(
+        'SELECT id FROM execution_runs WHERE started_at < ? AND id <= ? ORDER BY id LIMIT ?',
+        [cutoff, lastId, batchSize]
+      );
+      if (batch.length === 0) break;
+
+      const from = batch[0].id;
+      const to = batch[batch.length - 1].id;
+      await db.transaction(async () => {
+        await db.run(
+          `DELETE FROM execution_run_results
+           WHERE run_id IN (SELECT id FROM execution_runs WHERE started_at < ? AND id >= ? AND id <= ?)`,
+          [cutoff, from, to]
+        );
+        await db.run(
+          'DELETE FROM execution_runs WHERE started_at < ? AND id >= ? AND id <= ?',
+          [cutoff, from, to]
+        );
+      });
+    }
+
+    return { rows, file };
+  }
+
+  // gzip JSONL 보관 파일 작성 - nextBatch()가 빈 배열을 반환할 때까지 기록
+  // 실패하면 쓰던 파일을 지우고 예외를 그대로 전달 (원본은 삭제 전이므로 다음 실행에서 다시 보관)
+  async writeArchive(name, nextBatch) {
+    const { archiveDir } = config.retention;
+    await fs.promises.mkdir(archiveDir, { recursive: true });
+    const stamp = sqliteTime(new Date()).replace(/[-: ]/g, '');
+    const file = path.join(archiveDir, `${name}-${stamp}.jsonl.gz`);
+
+    const gzip = zlib.createGzip();
+    const output = fs.createWriteStream(file);
+    gzip.pipe(output);
+
+    let rows = 0;
+    try {
+      for (;;) {
+        const batch = await nextBatch();
+        if (batch.length === 0) break;
+
+        const lines = batch.map(row => JSON.stringify(row)).join('\n') + '\n';
+        if (!gzip.write(lines)) {
+          await once(gzip, 'drain');
+        }
+        rows += batch.length;
+      }
+
+      gzip.end();
+      await once(output, 'finish');
+    } catch (error) {
+      gzip.destroy();
+      output.destroy();
+      await fs.promises.unlink(file).catch(() => {});
+      throw error;
+    }
+
+    return { rows, file };
+  }
+
+  getStatus() {
+    return {
+      isRunning: this.isRunning,
+      lastRun: this.lastRun
+    };
+  }
+}
+
+module.exports = new RetentionService();
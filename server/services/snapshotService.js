@@ -0,0 +1,105 @@
+const zlib = require('zlib');
+const { promisify } = require('util');
+const ChangeLogModel = require('../models/ChangeLog');
+const logger = require('../utils/logger');
+
+const gzip = promisify(zlib.gzip);
+
+// 대시보드 초기 로드용 전체 상태 문서
+// 변경 로그 번호(seq)가 바뀔 때만 다시 만들고, 만들어 둔 JSON과 gzip 본문을 그대로 재사용한다.
+// 실행 이력은 프리셋 실행/중지 시 프리셋 변경 기록과 함께 쓰이므로 seq로 함께 추적된다.
+class SnapshotService {
+  constructor() {
+    this.current = null;  // { seq, etag, body, gzipBody, builtAt }
+    this.building = null; // { seq, promise }
+    this.stats = { builds: 0, hits: 0, notModified: 0 };
+  }
+
+  async getSnapshot() {
+    const seq = ChangeLogModel.getLatestSeq();
+    if (this.current && this.current.seq === seq) {
+      this.stats.hits++;
+      return this.current;
+    }
+
+    // 같은 seq에 대한 동시 요청은 한 번만 생성
+    if (!this.building || this.building.seq !== seq) {
+      const promise = this.build(seq)
+        .then(snapshot => {
+          if (!this.current || this.current.seq <= snapshot.seq) {
+            this.current = snapshot;
+          }
+          return snapshot;
+        })
+        .finally(() => {
+          if (this.building && this.building.promise === promise) {
+            this.building = null;
+          }
+        });
+      this.building = { seq, promise };
+    }
+    return await this.building.promise;
+  }
+
+  // seq는 조회 전에 읽어 둔 값 - 조회 도중 생긴 변경은 다음 /api/changes에서 다시 받는다
+  async build(seq) {
+    const ClientModel = require('../models/Client');
+    const GroupModel = require('../models/Group');
+    const PresetModel = require('../models/Preset');
+    const ExecutionModel = require('../models/Execution');
+    const ExecutionService = require('./executionService');
+
+    const startTime = Date.now();
+    const [clients, groups, presets, executions] = await Promise.all([
+      ClientModel.findAll(),
+      GroupModel.findAll(),
+      PresetModel.findAll(),
+      ExecutionModel.findAll(50)
+    ]);
+    const presetsWithStatus = await ExecutionService.withStatusMany(presets);
+
+    const body = Buffer.from(JSON.stringify({
+      cursor: seq,
+      clients,
+      groups,
+      presets: presetsWithStatus,
+      executions,
+      timestamp: new Date().toISOString()
+    }));
+    const gzipBody = await gzip(body);
+
+    this.stats.builds++;
+    logger.debug(`스냅샷 생성: seq ${seq}, ${body.length}바이트 (gzip ${gzipBody.length}바이트), ${Date.now() - startTime}ms`);
+
+    return {
+      seq,
+      etag: `"snapshot-${seq}"`,
+      body,
+      gzipBody,
+      builtAt: new Date().toISOString()
+    };
+  }
+
+  // If-None-Match 헤더가 현재 스냅샷과 같은지 확인
+  matches(ifNoneMatch, snapshot) {
+    if (!ifNoneMatch) return false;
+    if (ifNoneMatch.trim() === '*') return true;
+    return ifNoneMatch
+      .split(',')
+      .map(tag => tag.trim().replace(/^W\//, ''))
+      .some(tag => tag === snapshot.etag);
+  }
+
+  getStats() {
+    return {
+      seq: this.current ? this.current.seq : null,
+      bytes: this.current ? this.current.body.length : 0,
+      gzipBytes: this.current ? this.current.gzipBody.length : 0,
+      builds: this.stats.builds,
+      hits: this.stats.hits,
+      notModified: this.stats.notModified
+    };
+  }
+}
+
+module.exports = new SnapshotService();
@@ -2,17 +2,41 @@ const socketIo = require('socket.io');
 const ClientModel = require('../models/Client');
 const config = require('../config/server');
 const db = require('../config/database');
+const broadcastBus = require('./broadcastBus');
+const clockService = require('./clockService');
+const { HEARTBEAT_VERSION, decodeHeartbeat, isNewerSeq } = require('../utils/heartbeatCodec');
+const metrics = require('../utils/metrics');
+
+const eventDuration = metrics.histogram(
+  'uecms_socket_event_duration_seconds',
+  '소켓 이벤트 처리 시간 (비동기 처리 완료까지)',
+  ['event']
+);
+const eventErrors = metrics.counter('uecms_socket_event_errors_total', '처리 중 오류가 난 소켓 이벤트 수', ['event']);
+const dispatchSkew = metrics.histogram(
+  'uecms_dispatch_skew_seconds',
+  '일괄 전송에서 첫 노드와 마지막 노드 전송 사이 시간',
+  ['event']
+);
+const dispatchTargets = metrics.counter('uecms_dispatch_targets_total', '일괄 전송 대상 수', ['event', 'result']);
+const connectedSockets = metrics.gauge('uecms_connected_sockets', '연결된 소켓 수 (종류별)', ['type']);
+const registeredClients = metrics.gauge('uecms_registered_clients', '이름으로 등록된 에이전트 소켓 수');
 
 class SocketService {
   constructor() {
     this.io = null;
     this.connectedClients = new Map();
+    this.clientNamesByIP = new Map(); // IP -> 연결된 클라이언트 이름
+    this.connectionVersion = 0;       // 연결 구성이 바뀔 때마다 증가 (전송 계획 갱신용)
     this.clientTimeouts = new Map();
-    this.clientHeartbeats = new Map(); // 누락된 부분 추가
+    this.pendingCommands = new Map(); // commandId -> { clientName, event, data, sentAt } (응답 전 명령)
+    
+    metrics.onCollect(() => this.collectMetrics());
   }
 
   initialize(server) {
     this.io = socketIo(server, config.socket);
+    broadcastBus.attach(this.io);
     
     this.io.on('connection', (socket) => {
       const clientIP = this.normalizeIP(socket.handshake.address);
@@ -35,13 +59,51 @@ class SocketService {
       this.handleConnection(socket);
     });
     
-    // 주기적인 상태 확인
-    this.startHealthCheck();
-    this.startOfflineCheck();
+    // 생존 확인은 하트비트 서비스의 마감 큐에서 처리 (주기적 전체 스캔 없음)
     
     console.log('[INFO] Socket.IO 서비스 초기화 완료');
   }
 
+  // 소켓 이벤트 핸들러를 감싸 처리 시간 기록 (Promise를 반환하면 완료 시점까지)
+  instrument(event, handler) {
+    return (...args) => {
+      const end = eventDuration.startTimer({ event });
+      let result;
+      try {
+        result = handler(...args);
+      } catch (error) {
+        end();
+        eventErrors.inc({ event });
+        throw error;
+      }
+      
+      if (result && typeof result.then === 'function') {
+        return result.then(
+          (value) => { end(); return value; },
+          (error) => { end(); eventErrors.inc({ event }); throw error; }
+        );
+      }
+      end();
+      return result;
+    };
+  }
+
+  // /metrics 조회 시 연결 수 갱신
+  collectMetrics() {
+    const counts = { web: 0, python: 0 };
+    if (this.io) {
+      for (const socket of this.io.of('/').sockets.values()) {
+        const type = socket.clientType || 'unknown';
+        counts[type] = (counts[type] || 0) + 1;
+      }
+    }
+    connectedSockets.reset();
+    for (const [type, count] of Object.entries(counts)) {
+      connectedSockets.set({ type }, count);
+    }
+    registeredClients.set({}, this.connectedClients.size);
+  }
+
   handleConnection(socket) {
     // 웹 UI와 클라이언트 구분 - User-Agent와 IP를 함께 확인
     const clientIP = this.normalizeIP(socket.handshake.address);
@@ -55,56 +117,92 @@ class SocketService {
       console.log(`[DEBUG] 웹 UI 연결: ${socket.id} (IP: ${clientIP}, UA: ${userAgent.substring(0, 50)})`);
       socket.clientType = 'web';
       socket.isWebUI = true;
+      socket.join(broadcastBus.room);
     } else {
       console.log(`[DEBUG] 클라이언트 연결: ${socket.id} (IP: ${clientIP}, UA: ${userAgent.substring(0, 50)})`);
       socket.clientType = 'python';
       socket.isWebUI = false;
     }
     
+    // 이벤트별 처리 시간 기록
+    const on = (event, handler) => socket.on(event, this.instrument(event, handler));
+    
+    // 웹 UI 구독 (다른 PC의 브라우저는 IP로 구분할 수 없으므로 웹 UI가 직접 요청)
+    on('web_subscribe', () => {
+      socket.clientType = 'web';
+      socket.isWebUI = true;
+      socket.join(broadcastBus.room);
+    });
+    
     // 클라이언트 등록 (웹 UI는 등록하지 않음)
-    socket.on('register_client', (data) => {
+    on('register_client', (data) => {
       if (socket.isWebUI) {
         console.log(`[WARN] 웹 UI에서 클라이언트 등록 요청 - 무시: ${socket.id}`);
         return;
       }
       console.log(`[INFO] 클라이언트 등록 요청 수신: ${socket.id} - ${JSON.stringify(data)}`);
-      this.handleRegister(socket, data);
+      return this.handleRegister(socket, data);
     });
     
     // 하트비트 (웹 UI는 하트비트를 보내지 않음)
-    socket.on('heartbeat', (data) => {
+    on('heartbeat', (data) => {
       if (socket.isWebUI) {
         console.log(`[WARN] 웹 UI에서 하트비트 요청 - 무시: ${socket.id}`);
         return;
       }
       console.log(`[INFO] 하트비트 요청 수신: ${socket.id} - ${JSON.stringify(data)}`);
-      this.handleHeartbeat(socket, data);
+      return this.handleHeartbeat(socket, data);
+    });
+    
+    // 바이너리 하트비트 (client_id + 시퀀스 + 프로세스 digest)
+    on('hb', (frame) => {
+      if (socket.isWebUI) return;
+      return this.handleBinaryHeartbeat(socket, frame);
     });
     
     // 프로세스 상태
-    socket.on('current_process_status', (data) => this.handleProcessStatus(socket, data));
-    socket.on('process_status', (data) => this.handleProcessStatusUpdate(socket, data));
+    on('current_process_status', (data) => this.handleProcessStatus(socket, data));
+    on('process_status', (data) => {
+      // 이후 하트비트의 digest와 비교할 값
+      if (data && data.digest !== undefined) {
+        socket.processDigest = data.digest >>> 0;
+      }
+      return this.handleProcessStatusUpdate(socket, data);
+    });
     
     // 실행 결과
-    socket.on('execution_result', (data) => this.handleExecutionResult(socket, data));
-    socket.on('stop_result', (data) => this.handleStopResult(socket, data));
+    on('execution_result', (data) => this.handleExecutionResult(socket, data));
+    on('stop_result', (data) => this.handleStopResult(socket, data));
+    on('stop_command_completed', (data) => this.acknowledgeCommand(data));
+    
+    // 실행한 프로세스의 준비 확인 결과 (단계별 실행의 다음 단계 진행)
+    on('command_ready', (data) => this.handleCommandReady(socket, data));
     
     // 클라이언트 상태 업데이트
-    socket.on('client_status_update', (data) => this.handleClientStatusUpdate(socket, data));
+    on('client_status_update', (data) => this.handleClientStatusUpdate(socket, data));
     
     // 연결 확인 응답
-    socket.on('connection_check_response', (data) => {
-      this.handleConnectionCheckResponse(socket, data);
+    on('connection_check_response', (data) => {
+      return this.handleConnectionCheckResponse(socket, data);
     });
     
-    // ping 이벤트 (연결 상태 확인용)
-    socket.on('ping', (data) => {
-      console.log(`[DEBUG] ping 수신: ${socket.id}`);
-      socket.emit('pong', { timestamp: new Date().toISOString() });
+    // ping 이벤트 (연결 상태 확인 + 시계 동기화)
+    // 에이전트가 보낸 t0에 서버 수신(t1)/송신(t2) 시각을 붙여 응답하고, 함께 온 시계 차이 추정값 기록
+    on('ping', (data) => {
+      const receivedAt = clockService.now();
+      if (data && socket.clientName) {
+        clockService.record(socket.clientName, data);
+      }
+      socket.emit('pong', {
+        t0: data && data.t0,
+        t1: receivedAt,
+        t2: clockService.now(),
+        timestamp: new Date().toISOString()
+      });
     });
     
     // 연결 해제
-    socket.on('disconnect', (reason) => {
+    on('disconnect', (reason) => {
       const clientIP = this.normalizeIP(socket.handshake.address);
       const userAgent = socket.handshake.headers['user-agent'] || '';
       const isWebUI = (clientIP === '127.0.0.1' || clientIP === '::1') && 
@@ -116,11 +214,11 @@ class SocketService {
         console.log(`[INFO] 클라이언트 연결 해제: ${socket.id} (이유: ${reason})`);
       }
       
-      this.handleDisconnect(socket);
+      return this.handleDisconnect(socket);
     });
     
     // 에러 처리
-    socket.on('error', (error) => {
+    on('error', (error) => {
       console.log(`[ERROR] 소켓 에러: ${socket.id} - ${error}`);
     });
   }
@@ -135,6 +233,8 @@ class SocketService {
       
       socket.clientType = clientType;
       socket.clientName = normalizedName;
+      socket.lastHeartbeatSeq = null;
+      socket.processDigest = null;
       
       // 기존 클라이언트 찾기
       let client = await ClientModel.findByIP(clientIP);
@@ -159,21 +259,33 @@ class SocketService {
       
       // 상태 업데이트
       await ClientModel.updateStatus(client.id, 'online');
+      require('./heartbeatService').touch(client);
       this.emit('client_status_changed', { 
         client_id: client.id, // client_id로 통일
         name: finalClientName,    // 정규화된 이름 사용
         status: 'online' 
       });
       
-      // 클라이언트에게 등록 성공 응답 전송
+      // 바이너리 하트비트에서 client_id로 소켓을 확인
+      socket.clientId = client.id;
+      
+      // 클라이언트에게 등록 성공 응답 전송 (지원하는 하트비트 프로토콜 안내)
       socket.emit('registration_success', {
         clientId: client.id,
         clientName: client.name,
+        heartbeat: {
+          protocol: 'binary',
+          version: HEARTBEAT_VERSION,
+          event: 'hb'
+        },
         message: '클라이언트 등록이 완료되었습니다.'
       });
       
       console.log(`[INFO] 클라이언트 등록 완료 응답 전송: ${client.name}`);
       
+      // 연결이 끊기기 전에 보냈지만 응답을 받지 못한 명령 재전송 (에이전트가 commandId로 중복 실행 방지)
+      this.replayPendingCommands(finalClientName, socket);
+      
     } catch (error) {
       console.log(`[ERROR] 클라이언트 등록 실패:`, error);
       socket.emit('registration_failed', { 
@@ -218,6 +330,34 @@ class SocketService {
     }
   }
 
+  async handleBinaryHeartbeat(socket, frame) {
+    const heartbeat = decodeHeartbeat(frame);
+    if (!heartbeat) {
+      console.log(`[WARN] 잘못된 하트비트 프레임: ${socket.id}`);
+      return;
+    }
+    
+    // 등록된 소켓의 client_id와 일치해야 함
+    if (!socket.clientId || heartbeat.clientId !== socket.clientId) {
+      console.log(`[WARN] 등록되지 않은 하트비트: ${socket.id} (client_id: ${heartbeat.clientId})`);
+      return;
+    }
+    
+    // 중복/순서가 뒤바뀐 프레임은 무시
+    if (!isNewerSeq(heartbeat.seq, socket.lastHeartbeatSeq)) {
+      return;
+    }
+    socket.lastHeartbeatSeq = heartbeat.seq;
+    
+    const heartbeatService = require('./heartbeatService');
+    await heartbeatService.receiveHeartbeatById(heartbeat.clientId);
+    
+    // 서버가 알고 있는 프로세스 목록과 다르면 전체 상태 요청 (서버 재시작 등)
+    if (socket.processDigest !== heartbeat.digest) {
+      socket.emit('process_status_request', { digest: socket.processDigest });
+    }
+  }
+
   async handleProcessStatus(socket, data) {
     const { clientName, running_process_count, running_processes, status } = data;
     console.log(`[INFO] 프로세스 상태: ${clientName} - ${running_process_count}개 실행 중`);
@@ -242,8 +382,15 @@ class SocketService {
   }
 
   async handleExecutionResult(socket, data) {
-    const { clientName, presetId, command, result, timestamp } = data;
-    console.log(`[INFO] 실행 결과: ${clientName} - 프리셋 ${presetId} - 성공: ${result.get('success', false)}`);
+    this.acknowledgeCommand(data);
+    const { clientName, presetId, command, timestamp } = data;
+    const result = data.result || {};
+    if (result.launch) {
+      clockService.reportLaunch(socket.clientName || clientName, data.commandId, result.launch);
+    }
+    require('./stageService').reportResult(data.commandId, result);
+    require('./executionService').recordResult(data.commandId, result);
+    console.log(`[INFO] 실행 결과: ${clientName} - 프리셋 ${presetId} - 성공: ${!!result.success}`);
     
     try {
       // 클라이언트 찾기
@@ -262,7 +409,7 @@ class SocketService {
       }
       
       // 실행 결과에 따라 상태 결정
-      const success = result.get('success', false);
+      const success = !!result.success;
       const newStatus = success ? 'running' : 'stopped';
       
       // 클라이언트 상태 업데이트
@@ -271,16 +418,10 @@ class SocketService {
       // 프리셋 상태 업데이트
       if (success) {
         // 실행 성공 시 current_preset_id 설정
-        await db.run(
-          'UPDATE clients SET current_preset_id = ? WHERE id = ?',
-          [presetId, client.id]
-        );
+        await ClientModel.setCurrentPreset(client.id, presetId);
       } else {
         // 실행 실패 시 current_preset_id 초기화
-        await db.run(
-          'UPDATE clients SET current_preset_id = NULL WHERE id = ?',
-          [client.id]
-        );
+        await ClientModel.setCurrentPreset(client.id, null);
       }
       
       // 프리셋 상태 변경 이벤트 전송
@@ -290,7 +431,7 @@ class SocketService {
         client_id: client.id,
         client_name: client.name,
         status: newStatus,
-        reason: success ? '실행 완료' : `실행 실패: ${result.get('error', '알 수 없는 오류')}`,
+        reason: success ? '실행 완료' : `실행 실패: ${result.error || '알 수 없는 오류'}`,
         running_clients: success ? [client.name] : []
       });
       
@@ -309,6 +450,17 @@ class SocketService {
     }
   }
 
+  handleCommandReady(socket, data) {
+    if (!data) return;
+    const clientName = socket.clientName || data.clientName;
+    if (data.ready) {
+      console.log(`[INFO] 준비 완료: ${clientName} - 프리셋 ${data.presetId} (${data.method}, ${data.elapsedMs}ms)`);
+    } else {
+      console.log(`[WARN] 준비 확인 실패: ${clientName} - 프리셋 ${data.presetId} (${data.error})`);
+    }
+    require('./stageService').reportReady(data);
+  }
+
   async handleProcessStatusUpdate(socket, data) {
     // handleProcessStatus와 동일한 처리
     await this.handleProcessStatus(socket, data);
@@ -404,17 +556,14 @@ class SocketService {
     const { clientName, timestamp } = data;
     console.log(`[DEBUG] 연결 확인 응답: ${clientName} - ${timestamp}`);
     
-    // 클라이언트가 응답했으므로 온라인 상태 유지
+    // 클라이언트가 응답했으므로 생존 마감 시각 연장 (running 상태는 유지)
     if (clientName) {
       const client = await ClientModel.findByName(clientName);
       if (client) {
-        await ClientModel.updateStatus(client.id, 'online');
-        // 하트비트 기록도 업데이트
-        this.clientHeartbeats.set(clientName, {
-          lastHeartbeat: new Date(),
-          consecutiveMisses: 0,
-          clientIP: client.ip_address
-        });
+        require('./heartbeatService').touch(client);
+        if (client.status === 'offline') {
+          await ClientModel.updateStatus(client.id, 'online');
+        }
       }
     }
   }
@@ -427,52 +576,26 @@ class SocketService {
     
     if (socket.clientName && !this.gracefulShutdown) {
       // 정상 종료가 아닌 경우에만 재연결 대기 처리
-      this.handleClientDisconnect(socket.clientName);
+      this.handleClientDisconnect(socket.clientName, socket);
     }
   }
 
-  handleClientDisconnect(clientName) {
+  handleClientDisconnect(clientName, socket) {
     const currentSocket = this.connectedClients.get(clientName);
-    if (currentSocket) {
-      this.connectedClients.delete(clientName);
-      
-      // 재연결 타이머 설정 (더 관대하게) - 문서 2.3 정확히 따름
-      const reconnectTimer = setTimeout(async () => {
-        try {
-          // 재연결되었는지 다시 확인
-          const checkSocket = this.connectedClients.get(clientName);
-          if (!checkSocket || !checkSocket.connected) {
-            
-            // 하트비트 기록 확인
-            const heartbeatRecord = this.clientHeartbeats.get(clientName);
-            if (heartbeatRecord) {
-              const timeSinceLastHeartbeat = Date.now() - heartbeatRecord.lastHeartbeat.getTime();
-              
-              // 하트비트 여유시간 내라면 기다리기
-              if (timeSinceLastHeartbeat < config.monitoring.heartbeatGracePeriod) {
-                console.log(`[INFO] 클라이언트 ${clientName}: 하트비트 여유시간 내 - 오프라인 처리 연기`);
-                return;
-              }
-            }
-            
-            // 정말 오프라인 처리
-            const client = await ClientModel.findByName(clientName);
-            if (client) {
-              await ClientModel.updateStatus(client.id, 'offline');
-              this.emit('client_status_changed', { 
-                name: clientName, 
-                status: 'offline',
-                reason: '재연결 타임아웃'
-              });
-              console.log(`[INFO] 클라이언트 오프라인 처리 완료: ${clientName}`);
-            }
+    // 재등록으로 이미 교체된 이전 소켓의 연결 해제는 무시
+    if (currentSocket && (!socket || currentSocket === socket)) {
+      this.unindexSocket(clientName, currentSocket);
+      
+      // 재연결 여유시간이 지나면 오프라인 처리 (하트비트 서비스의 마감 큐에 등록)
+      ClientModel.findByName(clientName)
+        .then(client => {
+          if (client) {
+            require('./heartbeatService').trackDisconnect(client);
           }
-        } catch (error) {
-          console.log(`[ERROR] 클라이언트 ${clientName} 오프라인 처리 중 오류:`, error);
-        }
-      }, config.monitoring.reconnectionGracePeriod); // 2분 대기
-      
-      this.clientReconnectTimers.set(clientName, reconnectTimer);
+        })
+        .catch(error => {
+          console.log(`[ERROR] 클라이언트 ${clientName} 연결 해제 처리 중 오류:`, error);
+        });
     }
   }
 
@@ -482,6 +605,8 @@ class SocketService {
     
     // 새 소켓 등록
     this.connectedClients.set(clientName, socket);
+    this.clientNamesByIP.set(this.normalizeIP(socket.handshake.address), clientName);
+    this.connectionVersion++;
     socket.clientName = clientName;
     
     // 타임아웃 클리어
@@ -493,7 +618,18 @@ class SocketService {
     if (oldSocket && oldSocket.connected) {
       oldSocket.disconnect();
     }
+    if (oldSocket) {
+      this.unindexSocket(clientName, oldSocket);
+    }
+  }
+
+  unindexSocket(clientName, socket) {
     this.connectedClients.delete(clientName);
+    const ip = this.normalizeIP(socket.handshake.address);
+    if (this.clientNamesByIP.get(ip) === clientName) {
+      this.clientNamesByIP.delete(ip);
+    }
+    this.connectionVersion++;
   }
 
   clearTimeout(clientName) {
@@ -504,22 +640,13 @@ class SocketService {
     }
   }
 
-  // 재연결 타이머 관리 메서드들 추가 (문서 2.4 정확히 따름)
-  clearReconnectTimer(clientName) {
-    const timer = this.clientReconnectTimers.get(clientName);
-    if (timer) {
-      clearTimeout(timer);
-      this.clientReconnectTimers.delete(clientName);
-      console.log(`[DEBUG] 재연결 타이머 클리어: ${clientName}`);
-    }
-  }
-
   // 정상 종료 처리 (문서 2.4 정확히 따름)
   async gracefulShutdown() {
     try {
       this.gracefulShutdown = true;
       
-      // 모든 클라이언트에게 종료 알림
+      // 대기 중인 UI 이벤트를 먼저 보낸 뒤 모든 클라이언트에게 종료 알림
+      broadcastBus.flush();
       this.io.emit('server_shutdown', {
         message: '서버가 종료됩니다.',
         timestamp: new Date().toISOString()
@@ -548,6 +675,7 @@ class SocketService {
   }
 
   // 외부 호출용 메서드 (문서 6번 정확히 따름)
+  // 웹 UI 이벤트는 브로드캐스트 버스에서 모아 web 방에만 state_batch로 전송
   emit(event, data) {
     if (this.io) {
       // 클라이언트 상태 변화는 상세히 로깅
@@ -556,7 +684,7 @@ class SocketService {
         console.log(`[INFO] [STATUS] ${clientName}: ${data.status} (이유: ${data.reason || '없음'})`);
       }
       
-      this.io.emit(event, data);
+      broadcastBus.publish(event, data);
     }
   }
 
@@ -585,6 +713,110 @@ class SocketService {
     }
   }
 
+  // 여러 클라이언트에 한 번에 전송 (명령 팬아웃용)
+  // DB 작업 없이 대상 소켓을 먼저 모두 찾은 뒤 같은 틱 안에서 연달아 전송하므로
+  // 노드 수가 늘어나도 첫 노드와 마지막 노드의 수신 시각 차이가 거의 없음
+  // targets: [{ clientName, event, data }] / 반환: clientName -> 전송 성공 여부
+  emitToClients(targets) {
+    const results = new Map();
+    const ready = [];
+    
+    for (const target of targets) {
+      const socket = this.connectedClients.get(target.clientName);
+      if (socket && socket.connected) {
+        ready.push({ socket, target });
+      } else {
+        console.log(`[DEBUG] 명령 전송 실패: ${target.clientName} - ${socket ? '소켓 연결 안됨' : '소켓 없음'}`);
+        results.set(target.clientName, false);
+      }
+    }
+    
+    const startedAt = process.hrtime.bigint();
+    for (const { socket, target } of ready) {
+      socket.emit(target.event, target.data);
+      results.set(target.clientName, true);
+    }
+    for (const { target } of ready) {
+      this.trackCommand(target);
+    }
+    const elapsedMs = Number(process.hrtime.bigint() - startedAt) / 1e6;
+    
+    if (targets.length > 0) {
+      const event = targets[0].event;
+      dispatchSkew.observe({ event }, elapsedMs / 1000);
+      dispatchTargets.inc({ event, result: 'sent' }, ready.length);
+      dispatchTargets.inc({ event, result: 'not_connected' }, targets.length - ready.length);
+    }
+    
+    console.log(`[INFO] 일괄 전송 완료: ${ready.length}/${targets.length}개 클라이언트, ${elapsedMs.toFixed(2)}ms`);
+    return results;
+  }
+
+  // 응답(execution_result / stop_command_completed)을 기다리는 명령 기록
+  trackCommand(target) {
+    const commandId = target.data && target.data.commandId;
+    if (!commandId) return;
+    
+    this.prunePendingCommands();
+    // 정지 명령을 보내면 같은 클라이언트의 응답 전 실행 명령은 다시 보내지 않음
+    if (target.event === 'stop_command') {
+      for (const [id, pending] of this.pendingCommands) {
+        if (pending.clientName === target.clientName) {
+          this.pendingCommands.delete(id);
+        }
+      }
+    }
+    this.pendingCommands.set(commandId, {
+      clientName: target.clientName,
+      event: target.event,
+      data: target.data,
+      sentAt: Date.now()
+    });
+  }
+  
+  acknowledgeCommand(data) {
+    if (data && data.commandId) {
+      this.pendingCommands.delete(data.commandId);
+    }
+  }
+  
+  // 재전송 허용 시간이 지난 명령 제거 (Map은 추가 순서 = 전송 순서)
+  prunePendingCommands() {
+    const expiredBefore = Date.now() - config.socket.commandReplayWindow;
+    for (const [id, pending] of this.pendingCommands) {
+      if (pending.sentAt >= expiredBefore) break;
+      this.pendingCommands.delete(id);
+    }
+  }
+  
+  replayPendingCommands(clientName, socket) {
+    this.prunePendingCommands();
+    let replayed = 0;
+    for (const pending of this.pendingCommands.values()) {
+      if (pending.clientName !== clientName) continue;
+      socket.emit(pending.event, pending.data);
+      replayed++;
+    }
+    if (replayed > 0) {
+      console.log(`[INFO] 응답 전 명령 재전송: ${clientName} - ${replayed}개`);
+    }
+  }
+
+  // 생존 확인 요청 (하트비트가 끊긴 클라이언트에게만 전송)
+  sendConnectionCheck(clientName, timeoutMs) {
+    const socket = clientName ? this.connectedClients.get(clientName.toUpperCase()) : null;
+    if (!socket || !socket.connected) {
+      return false;
+    }
+    
+    socket.emit('connection_check', {
+      clientName: socket.clientName,
+      timestamp: new Date().toISOString(),
+      expect_response_within: timeoutMs
+    });
+    return true;
+  }
+
   getConnectedClients() {
     return Array.from(this.connectedClients.keys());
   }
@@ -596,99 +828,7 @@ class SocketService {
 
   // IP 주소로 연결된 클라이언트 이름 찾기
   findClientByIP(ipAddress) {
-    for (const [clientName, socket] of this.connectedClients) {
-      const clientIP = this.normalizeIP(socket.handshake.address);
-      if (clientIP === ipAddress) {
-        return clientName;
-      }
-    }
-    return null;
-  }
-
-  // 주기적인 상태 확인 (문서 2.5 정확히 따름)
-  startHealthCheck() {
-    const self = this; // this 컨텍스트 보존
-    
-    const runHealthCheck = async () => {
-      try {
-        const onlineClients = await ClientModel.findOnlineClients();
-        console.log(`[DEBUG] 온라인 클라이언트 수: ${onlineClients.length}`);
-        
-        for (const client of onlineClients) {
-          if (!client.name) {
-            console.warn(`[WARN] 클라이언트 이름이 없음: ID=${client.id}`);
-            continue;
-          }
-          
-          const socket = self.connectedClients.get(client.name);
-          const heartbeatRecord = self.clientHeartbeats.get(client.name);
-          
-          if (socket && socket.connected) {
-            // 연결된 클라이언트에게 연결 확인
-            console.log(`[DEBUG] 연결 확인 전송: ${client.name}`);
-            socket.emit('connection_check', {
-              clientName: client.name,  // client_name → clientName으로 변경
-              timestamp: new Date().toISOString(),
-              expect_response_within: 30000 // 30초 내 응답 기대
-            });
-            
-          } else if (heartbeatRecord) {
-            // 소켓은 없지만 최근 하트비트가 있는 경우
-            const timeSinceLastHeartbeat = Date.now() - heartbeatRecord.lastHeartbeat.getTime();
-            
-            if (timeSinceLastHeartbeat > config.monitoring.offlineTimeout) {
-              // 정말 오래된 경우에만 오프라인 처리
-              console.log(`[INFO] 클라이언트 오프라인 처리: ${client.name} (마지막 하트비트: ${Math.round(timeSinceLastHeartbeat/1000)}초 전)`);
-              await ClientModel.updateStatus(client.id, 'offline');
-              self.emit('client_status_changed', { 
-                name: client.name, 
-                status: 'offline',
-                reason: '하트비트 타임아웃'
-              });
-              self.clientHeartbeats.delete(client.name);
-            }
-            
-          } else {
-            // 소켓도 없고 하트비트 기록도 없는 경우
-            console.log(`[INFO] 클라이언트 오프라인 처리: ${client.name} (연결 기록 없음)`);
-            await ClientModel.updateStatus(client.id, 'offline');
-            self.emit('client_status_changed', { 
-              name: client.name, 
-              status: 'offline',
-              reason: '연결 없음'
-            });
-          }
-        }
-      } catch (error) {
-        console.error('[ERROR] 헬스 체크 중 오류:', error);
-      }
-      
-      // 다음 실행 예약
-      setTimeout(runHealthCheck, config.monitoring.connectionCheckInterval);
-    };
-    
-    // 첫 번째 실행 시작
-    runHealthCheck();
-  }
-
-  // 오프라인 처리
-  startOfflineCheck() {
-    const self = this; // this 컨텍스트 보존
-    
-    const runOfflineCheck = async () => {
-      const offlineCount = await ClientModel.markOfflineByTimeout(config.monitoring.offlineTimeout);
-      
-      if (offlineCount > 0) {
-        console.log(`[INFO] ${offlineCount}개 클라이언트를 오프라인으로 변경`);
-        self.emit('clients_offline_updated');
-      }
-      
-      // 다음 실행 예약
-      setTimeout(runOfflineCheck, config.monitoring.offlineTimeout);
-    };
-    
-    // 첫 번째 실행 시작
-    runOfflineCheck();
+    return this.clientNamesByIP.get(ipAddress) || null;
   }
 
   // 강제 연결 해제 기능 추가
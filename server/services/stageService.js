@@ -0,0 +1,274 @@
+const socketService = require('./socketService');
+const logger = require('../utils/logger');
+const metrics = require('../utils/metrics');
+
+const READY_BUCKETS = [0.5, 1, 2, 5, 10, 15, 20, 30, 45, 60, 90, 120, 180, 300];
+
+const stageReady = metrics.histogram('uecms_preset_stage_ready_seconds', '단계 명령 전송부터 단계의 모든 노드 준비까지 시간', [], READY_BUCKETS);
+const presetReady = metrics.histogram('uecms_preset_ready_seconds', '프리셋 실행 요청부터 마지막 단계 준비까지 시간', ['result'], READY_BUCKETS);
+const commandReady = metrics.histogram('uecms_command_ready_seconds', '노드별 프로세스 실행부터 준비 확인까지 시간 (에이전트 측정)', [], READY_BUCKETS);
+
+// 단계별 프리셋 실행의 준비 대기 (배리어)
+// - 단계의 노드는 한꺼번에 실행하고, 모든 노드가 준비(또는 실패)되면 다음 단계를 바로 실행
+// - 준비 확인 조건(ready)이 있는 단계는 에이전트의 command_ready 보고로, 없는 단계는 execution_result로 판단
+// - 단계 시간 제한이 지나면 보고하지 않은 노드는 timeout, 준비된 노드가 하나도 없는 단계에서는 실행 중단
+class StageService {
+  constructor() {
+    this.runs = new Map(); // presetId -> 마지막 단계 실행
+    this.commands = new Map(); // commandId -> { run, stage, clientName }
+    this.nextRunId = 1;
+  }
+
+  // 단계 실행 시작 - dispatchStage(index, register)는 명령을 보내기 전에 register([{ commandId, clientId, clientName }])를 호출하고
+  // 전송한 명령 목록 [{ commandId, clientId, clientName, sent }]을 반환
+  // onFinish(state)는 단계 실행이 끝나면(취소 제외) 호출 - 실패로 끝나 보내지 못한 단계의 노드를 마감하는 데 사용
+  async begin(preset, stages, dispatchStage, onFinish) {
+    this.cancel(preset.id);
+
+    const run = {
+      id: this.nextRunId++,
+      presetId: preset.id,
+      presetName: preset.name,
+      state: 'running',
+      startedAt: Date.now(),
+      readyAt: null,
+      current: 0,
+      dispatchStage,
+      onFinish,
+      stages: stages.map((stage, index) => ({
+        index,
+        name: stage.name,
+        hasReadyCheck: !!stage.ready,
+        timeout: stage.timeout,
+        state: 'pending',
+        startedAt: null,
+        readyAt: null,
+        timer: null,
+        clients: new Map() // clientName -> { clientId, commandId, state, readyMs, method, error }
+      }))
+    };
+    this.runs.set(preset.id, run);
+
+    logger.info(`🪜 프리셋 ${preset.name} 단계 실행 시작: ${run.stages.map(stage => `${stage.name}(${stages[stage.index].targets.length})`).join(' → ')}`);
+    await this.startStage(run, 0);
+    return this.describe(run);
+  }
+
+  async startStage(run, index) {
+    const stage = run.stages[index];
+    run.current = index;
+    stage.state = 'waiting';
+    stage.startedAt = Date.now();
+
+    // 명령 전송 전에 등록 - 전송 후 DB 기록을 기다리는 동안 도착한 결과/준비 보고도 반영
+    const sent = await run.dispatchStage(index, commands => this.register(run, stage, commands));
+    // 전송 도중 정지/재실행으로 취소된 경우
+    if (run.state !== 'running') return;
+
+    for (const command of sent) {
+      if (command.sent) continue;
+      this.commands.delete(command.commandId);
+      const client = stage.clients.get(command.clientName);
+      if (client) {
+        client.state = 'failed';
+        client.error = '연결되지 않음';
+      }
+    }
+
+    // DB 기록을 기다리는 동안 모든 노드의 결과가 와서 이미 끝난 단계
+    if (stage.state !== 'waiting') return;
+    stage.timer = setTimeout(() => this.expireStage(run, stage), stage.timeout);
+    if (stage.timer.unref) stage.timer.unref();
+    this.checkStage(run, stage);
+  }
+
+  register(run, stage, commands) {
+    for (const command of commands) {
+      stage.clients.set(command.clientName, {
+        clientId: command.clientId,
+        commandId: command.commandId,
+        state: 'launching',
+        readyMs: null,
+        method: null,
+        error: null
+      });
+      this.commands.set(command.commandId, { run, stage, clientName: command.clientName });
+    }
+  }
+
+  // execution_result - 실행 실패는 바로 반영, 준비 확인 조건이 없는 단계는 실행 성공을 준비로 판단
+  reportResult(commandId, result) {
+    const entry = commandId ? this.commands.get(commandId) : null;
+    if (!entry) return;
+
+    const client = entry.stage.clients.get(entry.clientName);
+    if (!result || !result.success) {
+      this.settle(entry, commandId, { state: 'failed', error: (result && result.error) || '실행 실패' });
+    } else if (!entry.stage.hasReadyCheck) {
+      this.settle(entry, commandId, { state: 'ready', method: 'started' });
+    } else if (client && client.state === 'launching') {
+      client.state = 'started';
+      this.publish(entry.run);
+    }
+  }
+
+  // command_ready - 에이전트의 준비 확인 결과
+  reportReady(data) {
+    const commandId = data && data.commandId;
+    const entry = commandId ? this.commands.get(commandId) : null;
+    if (!entry) return;
+
+    if (typeof data.elapsedMs === 'number') {
+      commandReady.observe({}, data.elapsedMs / 1000);
+    }
+    this.settle(entry, commandId, data.ready
+      ? { state: 'ready', method: data.method }
+      : { state: 'failed', error: data.error || '준비 확인 실패' });
+  }
+
+  settle(entry, commandId, outcome) {
+    this.commands.delete(commandId);
+    const { run, stage, clientName } = entry;
+    const client = stage.clients.get(clientName);
+    if (!client || run.state !== 'running') return;
+
+    client.state = outcome.state;
+    client.method = outcome.method || null;
+    client.error = outcome.error || null;
+    if (outcome.state === 'ready') {
+      client.readyMs = Date.now() - stage.startedAt;
+    }
+    this.checkStage(run, stage);
+  }
+
+  checkStage(run, stage) {
+    for (const client of stage.clients.values()) {
+      if (client.state === 'launching' || client.state === 'started') {
+        this.publish(run);
+        return;
+      }
+    }
+    this.finishStage(run, stage);
+  }
+
+  expireStage(run, stage) {
+    for (const client of stage.clients.values()) {
+      if (client.state === 'launching' || client.state === 'started') {
+        client.state = 'timeout';
+        this.commands.delete(client.commandId);
+      }
+    }
+    this.finishStage(run, stage);
+  }
+
+  finishStage(run, stage) {
+    if (stage.state !== 'waiting' || run.state !== 'running') return;
+    clearTimeout(stage.timer);
+    stage.timer = null;
+    stage.readyAt = Date.now();
+
+    const clients = Array.from(stage.clients.values());
+    const ready = clients.filter(client => client.state === 'ready').length;
+    stage.state = ready === clients.length ? 'ready' : 'partial';
+    stageReady.observe({}, (stage.readyAt - stage.startedAt) / 1000);
+    logger.info(`🪜 프리셋 ${run.presetName} ${stage.name}: ${ready}/${clients.length}개 노드 준비 (${stage.readyAt - stage.startedAt}ms)`);
+
+    // 준비된 노드가 하나도 없으면 다음 단계는 실행하지 않음 (빈 단계는 통과)
+    if (clients.length > 0 && ready === 0) {
+      stage.state = 'failed';
+      this.finishRun(run, 'failed');
+      return;
+    }
+
+    const next = run.stages[stage.index + 1];
+    if (!next) {
+      const allReady = run.stages.every(s => s.state === 'ready');
+      this.finishRun(run, allReady ? 'ready' : 'partial');
+      return;
+    }
+
+    this.publish(run);
+    this.startStage(run, next.index).catch((error) => {
+      logger.error(`프리셋 ${run.presetName} ${next.name} 실행 실패:`, error);
+      next.state = 'failed';
+      this.finishRun(run, 'failed');
+    });
+  }
+
+  finishRun(run, state) {
+    run.state = state;
+    run.readyAt = Date.now();
+    const totalMs = run.readyAt - run.startedAt;
+    presetReady.observe({ result: state }, totalMs / 1000);
+
+    if (state === 'ready') {
+      logger.info(`✅ 프리셋 ${run.presetName} 클러스터 준비 완료: ${(totalMs / 1000).toFixed(2)}초`);
+    } else {
+      logger.warn(`⚠️ 프리셋 ${run.presetName} 단계 실행 종료 (${state}): ${(totalMs / 1000).toFixed(2)}초`);
+    }
+    this.publish(run);
+    if (run.onFinish) {
+      Promise.resolve()
+        .then(() => run.onFinish(state))
+        .catch(error => logger.error(`프리셋 ${run.presetName} 단계 실행 마감 실패:`, error));
+    }
+  }
+
+  // 프리셋 정지/재실행 시 남은 단계 취소
+  cancel(presetId) {
+    const run = this.runs.get(Number(presetId));
+    if (!run || run.state !== 'running') return false;
+
+    run.state = 'cancelled';
+    run.readyAt = Date.now();
+    for (const stage of run.stages) {
+      clearTimeout(stage.timer);
+      stage.timer = null;
+      for (const client of stage.clients.values()) {
+        this.commands.delete(client.commandId);
+      }
+    }
+    logger.info(`🪜 프리셋 ${run.presetName} 단계 실행 취소`);
+    this.publish(run);
+    return true;
+  }
+
+  publish(run) {
+    socketService.emit('preset_stage_updated', this.describe(run));
+  }
+
+  describe(run) {
+    return {
+      runId: run.id,
+      presetId: run.presetId,
+      presetName: run.presetName,
+      state: run.state,
+      currentStage: run.current,
+      startedAt: new Date(run.startedAt).toISOString(),
+      readyAt: run.readyAt ? new Date(run.readyAt).toISOString() : null,
+      // 요청부터 클러스터 준비(마지막 단계 완료)까지 시간
+      timeToReadyMs: run.state === 'ready' ? run.readyAt - run.startedAt : null,
+      stages: run.stages.map(stage => ({
+        name: stage.name,
+        state: stage.state,
+        hasReadyCheck: stage.hasReadyCheck,
+        durationMs: stage.readyAt ? stage.readyAt - stage.startedAt : null,
+        clients: Array.from(stage.clients.entries()).map(([clientName, client]) => ({
+          clientId: client.clientId,
+          clientName,
+          state: client.state,
+          readyMs: client.readyMs,
+          method: client.method,
+          error: client.error
+        }))
+      }))
+    };
+  }
+
+  getRun(presetId) {
+    const run = this.runs.get(Number(presetId));
+    return run ? this.describe(run) : null;
+  }
+}
+
+module.exports = new StageService();
@@ -0,0 +1,387 @@
+const dgram = require('dgram');
+const net = require('net');
+const config = require('../config/server');
+const clientRegistry = require('./clientRegistry');
+const socketService = require('./socketService');
+const heartbeatService = require('./heartbeatService');
+const logger = require('../utils/logger');
+const metrics = require('../utils/metrics');
+
+const BOOT_BUCKETS = [5, 10, 20, 30, 45, 60, 90, 120, 180, 240, 300, 600];
+
+const packetsTotal = metrics.counter('uecms_wake_packets_total', 'Wake-on-LAN 매직 패킷 전송 수', ['result']);
+const bootDuration = metrics.histogram('uecms_wake_boot_seconds', '매직 패킷 전송부터 첫 생존 신호까지 시간', [], BOOT_BUCKETS);
+const clusterReady = metrics.histogram('uecms_wake_cluster_ready_seconds', '깨우기 작업 시작부터 모든 대상의 첫 생존 신호까지 시간', [], BOOT_BUCKETS);
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+// 'AA:BB:CC:DD:EE:FF' / 'AA-BB-...' / 'AABBCCDDEEFF' -> 6바이트 (형식이 틀리면 null)
+function parseMac(macAddress) {
+  const hex = String(macAddress || '').replace(/[:\-.\s]/g, '');
+  if (!/^[0-9a-fA-F]{12}$/.test(hex)) return null;
+  return Buffer.from(hex, 'hex');
+}
+
+// 매직 패킷 (6바이트 FF + MAC 주소 16번 반복)
+function buildMagicPacket(macBytes) {
+  return Buffer.concat([Buffer.alloc(6, 0xFF), ...Array(16).fill(macBytes)]);
+}
+
+// IP와 접두사 길이로 서브넷 지정 브로드캐스트 주소 계산 (예: 10.0.3.21/24 -> 10.0.3.255)
+function directedBroadcast(ipAddress, prefixLength) {
+  if (!net.isIPv4(ipAddress) || prefixLength <= 0 || prefixLength >= 32) return null;
+  const ip = ipAddress.split('.').reduce((acc, octet) => ((acc << 8) | Number(octet)) >>> 0, 0);
+  const hostMask = (0xFFFFFFFF >>> prefixLength) >>> 0;
+  const broadcast = (ip | hostMask) >>> 0;
+  return [24, 16, 8, 0].map(shift => (broadcast >>> shift) & 0xFF).join('.');
+}
+
+// Wake-on-LAN 엔진
+// - 브로드캐스트 소켓 하나를 만들어 모든 패킷에 재사용
+// - 대상 IP의 서브넷 지정 브로드캐스트(+ 설정 시 전체 브로드캐스트)로 repeats회 반복 전송
+// - waveSize대씩 waveInterval 간격으로 나누어 보내 한꺼번에 전원이 들어오는 돌입 전류를 분산
+// - 하트비트 서비스의 첫 생존 신호(등록/하트비트)로 대상별 부팅 시간과 전체 준비 시간 측정
+class WakeService {
+  constructor() {
+    this.socket = null;
+    this.socketReady = null;
+    this.jobs = new Map(); // job id -> 작업 (최근 historySize개 유지)
+    this.waiting = new Map(); // client_id -> 부팅 완료를 기다리는 작업
+    this.nextJobId = 1;
+    this.stats = { jobs: 0, packets: 0, sendErrors: 0, booted: 0, timedOut: 0 };
+
+    heartbeatService.on('alive', (client) => this.markReady(client.id));
+  }
+
+  // 브로드캐스트 소켓 (처음 쓸 때 한 번 만들고 오류가 나면 다음 전송 때 다시 만듦)
+  getSocket() {
+    if (this.socketReady) return this.socketReady;
+
+    this.socketReady = new Promise((resolve, reject) => {
+      const socket = dgram.createSocket('udp4');
+      socket.once('error', reject);
+      socket.bind({ address: config.power.wol.bindAddress, port: 0 }, () => {
+        socket.removeListener('error', reject);
+        socket.setBroadcast(true);
+        socket.on('error', (error) => {
+          logger.error('Wake-on-LAN 소켓 오류:', error);
+          this.close();
+        });
+        if (socket.unref) socket.unref();
+        this.socket = socket;
+        resolve(socket);
+      });
+    }).catch((error) => {
+      this.socketReady = null;
+      throw error;
+    });
+
+    return this.socketReady;
+  }
+
+  close() {
+    if (this.socket) {
+      try {
+        this.socket.close();
+      } catch (error) {
+        // 이미 닫힌 소켓
+      }
+    }
+    this.socket = null;
+    this.socketReady = null;
+  }
+
+  // 대상 IP 기준으로 패킷을 보낼 브로드캐스트 주소 목록
+  broadcastAddresses(ipAddress) {
+    const { prefixLength, globalBroadcast, extraBroadcasts } = config.power.wol;
+    const addresses = new Set();
+
+    const directed = ipAddress ? directedBroadcast(ipAddress, prefixLength) : null;
+    if (directed) addresses.add(directed);
+    if (globalBroadcast || !directed) addresses.add('255.255.255.255');
+    for (const address of extraBroadcasts) {
+      addresses.add(address);
+    }
+    return Array.from(addresses);
+  }
+
+  async send(packet, address) {
+    const socket = await this.getSocket();
+    return new Promise((resolve) => {
+      socket.send(packet, config.power.wol.port, address, (error) => {
+        this.stats.packets++;
+        packetsTotal.inc({ result: error ? 'error' : 'sent' });
+        if (error) {
+          this.stats.sendErrors++;
+          logger.warn(`Wake-on-LAN 전송 실패 (${address}): ${error.message}`);
+        }
+        resolve(!error);
+      });
+    });
+  }
+
+  // MAC 하나에 매직 패킷 전송 (주소별로 repeats회, 반복 사이 repeatInterval 대기)
+  // 하나라도 전송되면 true
+  async sendMagicPacket(macAddress, ipAddress = null) {
+    const macBytes = parseMac(macAddress);
+    if (!macBytes) {
+      throw new Error(`잘못된 MAC 주소: ${macAddress}`);
+    }
+
+    const packet = buildMagicPacket(macBytes);
+    const addresses = this.broadcastAddresses(ipAddress);
+    const { repeats, repeatInterval } = config.power.wol;
+    let delivered = false;
+
+    for (let attempt = 0; attempt < repeats; attempt++) {
+      if (attempt > 0) await sleep(repeatInterval);
+      const results = await Promise.all(addresses.map(address => this.send(packet, address)));
+      delivered = delivered || results.some(Boolean);
+    }
+    return delivered;
+  }
+
+  // 깨우기 작업 시작 - 전송은 백그라운드에서 웨이브 단위로 진행하고 작업 요약을 바로 반환
+  // options: { waveSize, waveInterval } (생략 시 설정값)
+  wake(clientIds, options = {}) {
+    const { wol } = config.power;
+    const waveSize = Math.max(1, parseInt(options.waveSize, 10) || wol.waveSize);
+    const waveInterval = Math.max(0, options.waveInterval === undefined ? wol.waveInterval : parseInt(options.waveInterval, 10) || 0);
+    const now = Date.now();
+
+    const job = {
+      id: this.nextJobId++,
+      state: 'sending',
+      waveSize,
+      waveInterval,
+      startedAt: now,
+      sentAt: null,
+      finishedAt: null,
+      clusterReadyMs: null,
+      targets: new Map(),
+      timer: null
+    };
+
+    for (const rawId of new Set(clientIds.map(Number))) {
+      const client = clientRegistry.getById(rawId);
+      const mac = clientRegistry.getMac(rawId);
+      const target = {
+        clientId: rawId,
+        name: client ? client.name : null,
+        ip: client ? client.ip_address : null,
+        mac: mac ? mac.mac_address : null,
+        wave: null,
+        state: 'queued',
+        sentAt: null,
+        readyAt: null,
+        error: null
+      };
+
+      if (!client) {
+        target.state = 'failed';
+        target.error = '클라이언트를 찾을 수 없습니다.';
+      } else if (client.name && socketService.isClientConnected(client.name.toUpperCase())) {
+        // 에이전트가 이미 연결되어 있으면 켜져 있으므로 보내지 않음
+        target.state = 'ready';
+        target.readyAt = now;
+      } else if (!parseMac(target.mac)) {
+        target.state = 'failed';
+        target.error = 'MAC 주소가 설정되지 않았습니다.';
+      }
+      job.targets.set(rawId, target);
+    }
+
+    const queued = Array.from(job.targets.values()).filter(target => target.state === 'queued');
+    queued.forEach((target, i) => {
+      target.wave = Math.floor(i / waveSize);
+      this.waiting.set(target.clientId, job);
+    });
+
+    this.jobs.set(job.id, job);
+    this.stats.jobs++;
+    this.pruneJobs();
+
+    logger.info(`🔌 Wake-on-LAN 작업 #${job.id}: ${queued.length}대를 ${Math.ceil(queued.length / waveSize)}개 웨이브로 전송 (${waveSize}대씩 ${waveInterval}ms 간격)`);
+
+    this.runJob(job, queued).catch((error) => {
+      logger.error(`Wake-on-LAN 작업 #${job.id} 실패:`, error);
+    });
+
+    return this.describe(job);
+  }
+
+  async runJob(job, queued) {
+    for (let i = 0; i < queued.length; i += job.waveSize) {
+      if (i > 0 && job.waveInterval > 0) await sleep(job.waveInterval);
+
+      const wave = queued.slice(i, i + job.waveSize);
+      await Promise.all(wave.map(async (target) => {
+        // 전송 전에 이미 생존 신호가 온 대상은 건너뜀
+        if (target.state !== 'queued') return;
+        try {
+          const delivered = await this.sendMagicPacket(target.mac, target.ip);
+          if (target.state !== 'queued') return;
+          target.sentAt = Date.now();
+          target.state = delivered ? 'sent' : 'failed';
+          if (!delivered) target.error = '패킷 전송 실패';
+        } catch (error) {
+          target.state = 'failed';
+          target.error = error.message;
+        }
+        if (target.state === 'failed') this.release(target.clientId, job);
+      }));
+
+      this.publish(job);
+    }
+
+    job.sentAt = Date.now();
+    if (job.state === 'sending') job.state = 'booting';
+
+    // 부팅 대기 제한 - 남은 대상은 시간 초과 처리
+    job.timer = setTimeout(() => this.expire(job), config.power.wol.bootTimeout);
+    if (job.timer.unref) job.timer.unref();
+    this.checkCompletion(job);
+  }
+
+  // 하트비트 서비스의 생존 신호 (등록/하트비트/connection_check 응답)
+  markReady(clientId) {
+    const job = this.waiting.get(clientId);
+    if (!job) return;
+
+    const target = job.targets.get(clientId);
+    this.waiting.delete(clientId);
+    if (!target || (target.state !== 'sent' && target.state !== 'queued')) return;
+
+    const now = Date.now();
+    if (target.state === 'sent') {
+      bootDuration.observe({}, (now - target.sentAt) / 1000);
+      this.stats.booted++;
+    }
+    target.state = 'ready';
+    target.readyAt = now;
+
+    this.checkCompletion(job);
+  }
+
+  release(clientId, job) {
+    if (this.waiting.get(clientId) === job) {
+      this.waiting.delete(clientId);
+    }
+  }
+
+  checkCompletion(job) {
+    if (job.finishedAt) return;
+    // 전송이 끝나기 전에는 완료로 보지 않음
+    if (job.state === 'sending') {
+      this.publish(job);
+      return;
+    }
+
+    const targets = Array.from(job.targets.values());
+    if (targets.some(target => target.state === 'sent' || target.state === 'queued')) {
+      this.publish(job);
+      return;
+    }
+
+    this.finish(job);
+  }
+
+  expire(job) {
+    if (job.finishedAt) return;
+    for (const target of job.targets.values()) {
+      if (target.state === 'sent' || target.state === 'queued') {
+        target.state = 'timeout';
+        this.stats.timedOut++;
+        this.release(target.clientId, job);
+      }
+    }
+    this.finish(job);
+  }
+
+  finish(job) {
+    clearTimeout(job.timer);
+    job.timer = null;
+    job.finishedAt = Date.now();
+
+    const targets = Array.from(job.targets.values());
+    const ready = targets.filter(target => target.state === 'ready');
+    if (ready.length === targets.length && ready.length > 0) {
+      job.state = 'ready';
+      job.clusterReadyMs = Math.max(...ready.map(target => target.readyAt)) - job.startedAt;
+      clusterReady.observe({}, job.clusterReadyMs / 1000);
+      logger.info(`✅ Wake-on-LAN 작업 #${job.id}: ${ready.length}대 모두 준비 완료 (${(job.clusterReadyMs / 1000).toFixed(1)}초)`);
+    } else {
+      job.state = ready.length > 0 ? 'partial' : 'failed';
+      logger.warn(`⚠️ Wake-on-LAN 작업 #${job.id}: ${targets.length}대 중 ${ready.length}대 준비 완료`);
+    }
+
+    this.publish(job);
+  }
+
+  // 웹 UI로 작업 진행 상황 전송 (대상 목록 없이 요약만)
+  publish(job) {
+    socketService.emit('wake_job_updated', this.describe(job, { targets: false }));
+  }
+
+  pruneJobs() {
+    const { historySize } = config.power.wol;
+    for (const [jobId, job] of this.jobs) {
+      if (this.jobs.size <= historySize) break;
+      if (!job.finishedAt) continue;
+      this.jobs.delete(jobId);
+    }
+  }
+
+  describe(job, { targets = true } = {}) {
+    const counts = { queued: 0, sent: 0, ready: 0, failed: 0, timeout: 0 };
+    for (const target of job.targets.values()) {
+      counts[target.state]++;
+    }
+
+    const summary = {
+      jobId: job.id,
+      state: job.state,
+      waveSize: job.waveSize,
+      waveInterval: job.waveInterval,
+      total: job.targets.size,
+      counts,
+      startedAt: new Date(job.startedAt).toISOString(),
+      sentAt: job.sentAt ? new Date(job.sentAt).toISOString() : null,
+      finishedAt: job.finishedAt ? new Date(job.finishedAt).toISOString() : null,
+      clusterReadyMs: job.clusterReadyMs
+    };
+
+    if (targets) {
+      summary.targets = Array.from(job.targets.values()).map(target => ({
+        clientId: target.clientId,
+        name: target.name,
+        wave: target.wave,
+        state: target.state,
+        sentAt: target.sentAt ? new Date(target.sentAt).toISOString() : null,
+        readyAt: target.readyAt ? new Date(target.readyAt).toISOString() : null,
+        bootMs: target.sentAt && target.readyAt ? target.readyAt - target.sentAt : null,
+        error: target.error
+      }));
+    }
+    return summary;
+  }
+
+  getJob(jobId) {
+    const job = this.jobs.get(Number(jobId));
+    return job ? this.describe(job) : null;
+  }
+
+  getJobs() {
+    return Array.from(this.jobs.values()).map(job => this.describe(job, { targets: false }));
+  }
+
+  getStats() {
+    return {
+      socketOpen: !!this.socket,
+      waiting: this.waiting.size,
+      ...this.stats
+    };
+  }
+}
+
+module.exports = new WakeService();
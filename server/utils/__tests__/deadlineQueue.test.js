@@ -0,0 +1,93 @@
+const DeadlineQueue = require('../deadlineQueue');
+
+describe('DeadlineQueue', () => {
+  let expired;
+  let queue;
+
+  beforeEach(() => {
+    jest.useFakeTimers();
+    jest.setSystemTime(0);
+    expired = [];
+    queue = new DeadlineQueue((key, payload, deadline) => expired.push([key, payload, deadline]));
+  });
+
+  afterEach(() => {
+    queue.clear();
+    jest.useRealTimers();
+  });
+
+  test('expires entries in deadline order regardless of schedule order', () => {
+    queue.schedule('c', 300, 'C');
+    queue.schedule('a', 100, 'A');
+    queue.schedule('b', 200, 'B');
+
+    jest.advanceTimersByTime(150);
+    expect(expired).toEqual([['a', 'A', 100]]);
+
+    jest.advanceTimersByTime(200);
+    expect(expired.map(([key]) => key)).toEqual(['a', 'b', 'c']);
+    expect(queue.size).toBe(0);
+  });
+
+  test('rescheduling a key replaces its deadline and payload', () => {
+    queue.schedule('a', 100, 'old');
+    queue.schedule('b', 200, 'B');
+    queue.schedule('a', 300, 'new');
+
+    expect(queue.size).toBe(2);
+    expect(queue.get('a')).toEqual({ deadline: 300, payload: 'new' });
+
+    jest.advanceTimersByTime(250);
+    expect(expired).toEqual([['b', 'B', 200]]);
+
+    jest.advanceTimersByTime(100);
+    expect(expired).toEqual([['b', 'B', 200], ['a', 'new', 300]]);
+  });
+
+  test('moving a deadline earlier re-arms the timer', () => {
+    queue.schedule('a', 1000, 'A');
+    queue.schedule('a', 50, 'A');
+
+    jest.advanceTimersByTime(60);
+    expect(expired).toEqual([['a', 'A', 50]]);
+  });
+
+  test('cancelled entries never expire', () => {
+    queue.schedule('a', 100, 'A');
+    queue.schedule('b', 200, 'B');
+
+    expect(queue.cancel('a')).toBe(true);
+    expect(queue.cancel('a')).toBe(false);
+    expect(queue.has('a')).toBe(false);
+
+    jest.advanceTimersByTime(300);
+    expect(expired).toEqual([['b', 'B', 200]]);
+  });
+
+  test('compacts stale heap entries left by repeated rescheduling', () => {
+    for (let i = 0; i < 500; i++) {
+      queue.schedule('a', 1000 + i, i);
+    }
+
+    expect(queue.size).toBe(1);
+    expect(queue.heap.length).toBeLessThanOrEqual(queue.size * 2 + 64);
+
+    jest.advanceTimersByTime(2000);
+    expect(expired).toEqual([['a', 499, 1499]]);
+  });
+
+  test('keeps expiring other entries when a callback throws', () => {
+    const errors = jest.spyOn(console, 'error').mockImplementation(() => {});
+    const failing = new DeadlineQueue((key) => {
+      if (key === 'a') throw new Error('boom');
+      expired.push([key]);
+    });
+    failing.schedule('a', 100);
+    failing.schedule('b', 100);
+
+    jest.advanceTimersByTime(100);
+    expect(expired).toEqual([['b']]);
+    expect(errors).toHaveBeenCalledTimes(1);
+    errors.mockRestore();
+  });
+});
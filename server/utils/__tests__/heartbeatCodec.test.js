@@ -0,0 +1,73 @@
+const {
+  HEARTBEAT_SIZE,
+  HEARTBEAT_VERSION,
+  HEARTBEAT_FLAG_RUNNING,
+  encodeHeartbeat,
+  decodeHeartbeat,
+  isNewerSeq
+} = require('../heartbeatCodec');
+
+describe('heartbeat frames', () => {
+  test('round-trips every field', () => {
+    const frame = encodeHeartbeat({ flags: HEARTBEAT_FLAG_RUNNING, clientId: 42, seq: 7, digest: 0xdeadbeef });
+
+    expect(frame.length).toBe(HEARTBEAT_SIZE);
+    expect(decodeHeartbeat(frame)).toEqual({
+      version: HEARTBEAT_VERSION,
+      flags: HEARTBEAT_FLAG_RUNNING,
+      clientId: 42,
+      seq: 7,
+      digest: 0xdeadbeef
+    });
+  });
+
+  test('stores 32-bit fields unsigned', () => {
+    const decoded = decodeHeartbeat(encodeHeartbeat({ clientId: 0xffffffff, seq: -1 }));
+
+    expect(decoded.clientId).toBe(0xffffffff);
+    expect(decoded.seq).toBe(0xffffffff);
+    expect(decoded.digest).toBe(0);
+  });
+
+  test('decodes frames delivered as ArrayBuffer', () => {
+    const frame = encodeHeartbeat({ clientId: 1, seq: 2, digest: 3 });
+    const arrayBuffer = frame.buffer.slice(frame.byteOffset, frame.byteOffset + frame.length);
+
+    expect(decodeHeartbeat(arrayBuffer)).toMatchObject({ clientId: 1, seq: 2, digest: 3 });
+  });
+
+  test('rejects frames with the wrong size or version', () => {
+    const frame = encodeHeartbeat({ clientId: 1, seq: 1 });
+    const wrongVersion = Buffer.from(frame);
+    wrongVersion.writeUInt8(HEARTBEAT_VERSION + 1, 0);
+
+    expect(decodeHeartbeat(frame.subarray(0, HEARTBEAT_SIZE - 1))).toBeNull();
+    expect(decodeHeartbeat(Buffer.concat([frame, Buffer.alloc(1)]))).toBeNull();
+    expect(decodeHeartbeat(wrongVersion)).toBeNull();
+    expect(decodeHeartbeat('not a frame')).toBeNull();
+  });
+});
+
+describe('isNewerSeq', () => {
+  test('accepts anything when there is no previous sequence', () => {
+    expect(isNewerSeq(0, null)).toBe(true);
+    expect(isNewerSeq(123, undefined)).toBe(true);
+  });
+
+  test('orders nearby sequence numbers', () => {
+    expect(isNewerSeq(11, 10)).toBe(true);
+    expect(isNewerSeq(10, 10)).toBe(false);
+    expect(isNewerSeq(9, 10)).toBe(false);
+  });
+
+  test('treats wraparound past 2^32 as newer', () => {
+    expect(isNewerSeq(0, 0xffffffff)).toBe(true);
+    expect(isNewerSeq(5, 0xfffffff0)).toBe(true);
+    expect(isNewerSeq(0xffffffff, 0)).toBe(false);
+  });
+
+  test('treats a jump of half the sequence space or more as older', () => {
+    expect(isNewerSeq(0x7fffffff, 0)).toBe(true);
+    expect(isNewerSeq(0x80000000, 0)).toBe(false);
+  });
+});
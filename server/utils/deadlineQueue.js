@@ -0,0 +1,152 @@
+// 마감 시각 순으로 정렬된 최소 힙 + 타이머 하나
+// 키마다 마감 시각을 등록해 두면 가장 이른 마감 시각에만 깨어나 만료된 항목을 콜백으로 넘긴다.
+// 같은 키를 다시 등록하면 이전 항목은 무효 처리되고(지연 삭제) 힙에서 꺼낼 때 버려진다.
+class DeadlineQueue {
+  constructor(onExpire) {
+    this.onExpire = onExpire;
+    this.heap = [];           // { key, deadline, seq }
+    this.entries = new Map(); // key -> { deadline, seq, payload }
+    this.seq = 0;
+    this.timer = null;
+    this.timerDeadline = Infinity;
+  }
+
+  get size() {
+    return this.entries.size;
+  }
+
+  has(key) {
+    return this.entries.has(key);
+  }
+
+  get(key) {
+    const entry = this.entries.get(key);
+    return entry ? { deadline: entry.deadline, payload: entry.payload } : undefined;
+  }
+
+  // 마감 시각 등록 (기존 항목 교체)
+  schedule(key, deadline, payload) {
+    const seq = ++this.seq;
+    this.entries.set(key, { deadline, seq, payload });
+    this.push({ key, deadline, seq });
+
+    // 무효 항목이 너무 많이 쌓이면 힙 재구성
+    if (this.heap.length > this.entries.size * 2 + 64) {
+      this.compact();
+    }
+
+    if (deadline < this.timerDeadline) {
+      this.arm();
+    }
+  }
+
+  cancel(key) {
+    return this.entries.delete(key);
+  }
+
+  clear() {
+    this.entries.clear();
+    this.heap = [];
+    this.disarm();
+  }
+
+  // 만료된 항목 처리 후 다음 마감 시각에 타이머 예약
+  run() {
+    this.timer = null;
+    this.timerDeadline = Infinity;
+
+    const now = Date.now();
+    const expired = [];
+    while (this.heap.length > 0 && this.heap[0].deadline <= now) {
+      const item = this.pop();
+      const entry = this.entries.get(item.key);
+      if (entry && entry.seq === item.seq) {
+        this.entries.delete(item.key);
+        expired.push({ key: item.key, deadline: item.deadline, payload: entry.payload });
+      }
+    }
+
+    this.arm();
+
+    for (const item of expired) {
+      try {
+        this.onExpire(item.key, item.payload, item.deadline);
+      } catch (error) {
+        console.error(`[ERROR] 마감 처리 중 오류 (${item.key}):`, error);
+      }
+    }
+  }
+
+  arm() {
+    this.discardStale();
+    this.disarm();
+    if (this.heap.length === 0) return;
+
+    const deadline = this.heap[0].deadline;
+    this.timerDeadline = deadline;
+    this.timer = setTimeout(() => this.run(), Math.max(0, deadline - Date.now()));
+    if (this.timer.unref) {
+      this.timer.unref();
+    }
+  }
+
+  disarm() {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+    this.timerDeadline = Infinity;
+  }
+
+  // 힙 맨 앞의 무효 항목 제거
+  discardStale() {
+    while (this.heap.length > 0) {
+      const top = this.heap[0];
+      const entry = this.entries.get(top.key);
+      if (entry && entry.seq === top.seq) break;
+      this.pop();
+    }
+  }
+
+  compact() {
+    this.heap = [];
+    for (const [key, entry] of this.entries) {
+      this.push({ key, deadline: entry.deadline, seq: entry.seq });
+    }
+  }
+
+  push(item) {
+    const heap = this.heap;
+    heap.push(item);
+    let i = heap.length - 1;
+    while (i > 0) {
+      const parent = (i - 1) >> 1;
+      if (heap[parent].deadline <= heap[i].deadline) break;
+      [heap[parent], heap[i]] = [heap[i], heap[parent]];
+      i = parent;
+    }
+  }
+
+  pop() {
+    const heap = this.heap;
+    const top = heap[0];
+    const last = heap.pop();
+    if (heap.length > 0) {
+      heap[0] = last;
+      let i = 0;
+      for (;;) {
+        const left = i * 2 + 1;
+        const right = left + 1;
+        let smallest = i;
+        if (left < heap.length && heap[left].deadline < heap[smallest].deadline) smallest = left;
+        if (right < heap.length && heap[right].deadline < heap[smallest].deadline) smallest = right;
+        if (smallest === i) break;
+        [heap[smallest], heap[i]] = [heap[i], heap[smallest]];
+        i = smallest;
+      }
+    }
+    return top;
+  }
+}
+
+module.exports = DeadlineQueue;
@@ -0,0 +1,60 @@
+// 바이너리 하트비트 프레임 (빅엔디안 14바이트)
+//   0  u8   버전
+//   1  u8   플래그 (bit0: 실행 중인 프로세스 있음)
+//   2  u32  client_id (registration_success에서 받은 값)
+//   6  u32  시퀀스 번호
+//  10  u32  실행 중인 프로세스 목록 digest (CRC32)
+// 프로세스 상세 정보는 digest가 바뀔 때만 process_status 이벤트로 따로 전송된다.
+const HEARTBEAT_VERSION = 1;
+const HEARTBEAT_SIZE = 14;
+const HEARTBEAT_FLAG_RUNNING = 0x01;
+
+function encodeHeartbeat({ flags = 0, clientId, seq, digest = 0 }) {
+  const buf = Buffer.alloc(HEARTBEAT_SIZE);
+  buf.writeUInt8(HEARTBEAT_VERSION, 0);
+  buf.writeUInt8(flags, 1);
+  buf.writeUInt32BE(clientId >>> 0, 2);
+  buf.writeUInt32BE(seq >>> 0, 6);
+  buf.writeUInt32BE(digest >>> 0, 10);
+  return buf;
+}
+
+// 잘못된 프레임이면 null 반환
+function decodeHeartbeat(data) {
+  let buf = data;
+  if (buf instanceof ArrayBuffer) {
+    buf = Buffer.from(buf);
+  }
+  if (!Buffer.isBuffer(buf) || buf.length !== HEARTBEAT_SIZE) {
+    return null;
+  }
+
+  const version = buf.readUInt8(0);
+  if (version !== HEARTBEAT_VERSION) {
+    return null;
+  }
+
+  return {
+    version,
+    flags: buf.readUInt8(1),
+    clientId: buf.readUInt32BE(2),
+    seq: buf.readUInt32BE(6),
+    digest: buf.readUInt32BE(10)
+  };
+}
+
+// 32비트 시퀀스 번호 비교 (랩어라운드 고려)
+function isNewerSeq(seq, lastSeq) {
+  if (lastSeq === null || lastSeq === undefined) return true;
+  const diff = (seq - lastSeq) >>> 0;
+  return diff !== 0 && diff < 0x80000000;
+}
+
+module.exports = {
+  HEARTBEAT_VERSION,
+  HEARTBEAT_SIZE,
+  HEARTBEAT_FLAG_RUNNING,
+  encodeHeartbeat,
+  decodeHeartbeat,
+  isNewerSeq
+};
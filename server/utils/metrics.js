@@ -0,0 +1,252 @@
+// Prometheus 텍스트 형식 메트릭 (외부 라이브러리 없이 카운터/게이지/히스토그램만 구현)
+// - 값은 메모리에만 누적되고 /metrics 조회 시 텍스트로 만든다
+// - 게이지 중 조회 시점에 계산하는 값(연결 수, 하트비트 경과 시간 등)은 onCollect로 등록한 수집 함수에서 채운다
+// - 라벨 조합 수는 메트릭별로 제한 (넘으면 모든 라벨을 'other'로 합침)
+
+// 초 단위 기본 버킷 (0.1ms ~ 10s)
+const DEFAULT_BUCKETS = [0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10];
+const MAX_SERIES = 1000;
+const OVERFLOW_LABEL = 'other';
+
+function escapeLabel(value) {
+  return String(value).replace(/\\/g, '\\\\').replace(/\n/g, '\\n').replace(/"/g, '\\"');
+}
+
+function formatLabels(names, values, extra = '') {
+  const pairs = names.map((name, i) => `${name}="${escapeLabel(values[i])}"`);
+  if (extra) pairs.push(extra);
+  return pairs.length > 0 ? `{${pairs.join(',')}}` : '';
+}
+
+function formatValue(value) {
+  if (value === Infinity) return '+Inf';
+  if (value === -Infinity) return '-Inf';
+  return String(value);
+}
+
+class Metric {
+  constructor(type, name, help, labelNames = []) {
+    this.type = type;
+    this.name = name;
+    this.help = help;
+    this.labelNames = labelNames;
+    this.series = new Map(); // 라벨 값 키 -> { values, ... }
+  }
+
+  // labels: { name: value } (라벨 없는 메트릭은 생략)
+  seriesFor(labels = {}) {
+    let values = this.labelNames.map(name => (labels[name] === undefined || labels[name] === null ? '' : String(labels[name])));
+    let key = values.join('\u0001');
+    let series = this.series.get(key);
+    if (series) return series;
+
+    if (this.series.size >= MAX_SERIES) {
+      values = this.labelNames.map(() => OVERFLOW_LABEL);
+      key = values.join('\u0001');
+      series = this.series.get(key);
+      if (series) return series;
+    }
+
+    series = this.createSeries(values);
+    this.series.set(key, series);
+    return series;
+  }
+
+  reset() {
+    this.series.clear();
+  }
+
+  render() {
+    const lines = [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} ${this.type}`];
+    for (const series of this.series.values()) {
+      this.renderSeries(series, lines);
+    }
+    return lines.join('\n');
+  }
+}
+
+class Counter extends Metric {
+  constructor(name, help, labelNames) {
+    super('counter', name, help, labelNames);
+  }
+
+  createSeries(values) {
+    return { values, value: 0 };
+  }
+
+  inc(labels, amount = 1) {
+    this.seriesFor(labels).value += amount;
+  }
+
+  renderSeries(series, lines) {
+    lines.push(`${this.name}${formatLabels(this.labelNames, series.values)} ${formatValue(series.value)}`);
+  }
+}
+
+class Gauge extends Metric {
+  constructor(name, help, labelNames) {
+    super('gauge', name, help, labelNames);
+  }
+
+  createSeries(values) {
+    return { values, value: 0 };
+  }
+
+  set(labels, value) {
+    this.seriesFor(labels).value = value;
+  }
+
+  inc(labels, amount = 1) {
+    this.seriesFor(labels).value += amount;
+  }
+
+  renderSeries(series, lines) {
+    lines.push(`${this.name}${formatLabels(this.labelNames, series.values)} ${formatValue(series.value)}`);
+  }
+}
+
+class Histogram extends Metric {
+  constructor(name, help, labelNames, buckets = DEFAULT_BUCKETS) {
+    super('histogram', name, help, labelNames);
+    this.buckets = buckets;
+  }
+
+  createSeries(values) {
+    return { values, counts: new Array(this.buckets.length).fill(0), sum: 0, count: 0 };
+  }
+
+  // 초 단위 값 기록
+  observe(labels, seconds) {
+    const series = this.seriesFor(labels);
+    series.sum += seconds;
+    series.count++;
+    for (let i = 0; i < this.buckets.length; i++) {
+      if (seconds <= this.buckets[i]) {
+        series.counts[i]++;
+        break;
+      }
+    }
+  }
+
+  // 경과 시간 측정 시작 - 반환된 함수를 호출하면 기록 (추가 라벨 병합 가능)
+  startTimer(labels) {
+    const startedAt = process.hrtime.bigint();
+    return (extraLabels) => {
+      const seconds = Number(process.hrtime.bigint() - startedAt) / 1e9;
+      this.observe(extraLabels ? { ...labels, ...extraLabels } : labels, seconds);
+      return seconds;
+    };
+  }
+
+  renderSeries(series, lines) {
+    // 버킷은 누적 개수로 출력
+    let cumulative = 0;
+    for (let i = 0; i < this.buckets.length; i++) {
+      cumulative += series.counts[i];
+      lines.push(`${this.name}_bucket${formatLabels(this.labelNames, series.values, `le="${this.buckets[i]}"`)} ${cumulative}`);
+    }
+    lines.push(`${this.name}_bucket${formatLabels(this.labelNames, series.values, 'le="+Inf"')} ${series.count}`);
+    lines.push(`${this.name}_sum${formatLabels(this.labelNames, series.values)} ${series.sum}`);
+    lines.push(`${this.name}_count${formatLabels(this.labelNames, series.values)} ${series.count}`);
+  }
+}
+
+class MetricsRegistry {
+  constructor() {
+    this.metrics = new Map();
+    this.collectors = [];
+    this.loopTimer = null;
+    this.normalizedSql = new Map();
+
+    this.eventLoopLag = this.histogram(
+      'uecms_event_loop_lag_seconds',
+      '이벤트 루프 지연 (예정 시각보다 늦게 실행된 시간)',
+      [],
+      [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5]
+    );
+    this.eventLoopLagLast = this.gauge('uecms_event_loop_lag_last_seconds', '마지막으로 측정한 이벤트 루프 지연');
+  }
+
+  // 같은 이름으로 다시 만들면 기존 메트릭 반환
+  register(metric) {
+    const existing = this.metrics.get(metric.name);
+    if (existing) return existing;
+    this.metrics.set(metric.name, metric);
+    return metric;
+  }
+
+  counter(name, help, labelNames) {
+    return this.register(new Counter(name, help, labelNames));
+  }
+
+  gauge(name, help, labelNames) {
+    return this.register(new Gauge(name, help, labelNames));
+  }
+
+  histogram(name, help, labelNames, buckets) {
+    return this.register(new Histogram(name, help, labelNames, buckets));
+  }
+
+  // 조회 시점에 값을 채우는 수집 함수 등록
+  onCollect(collector) {
+    this.collectors.push(collector);
+  }
+
+  // 이벤트 루프 지연 측정 시작 (interval마다 타이머가 늦게 깨어난 만큼을 기록)
+  start(interval = 500) {
+    if (this.loopTimer) return;
+
+    let expected = Date.now() + interval;
+    this.loopTimer = setInterval(() => {
+      const now = Date.now();
+      const lag = Math.max(0, now - expected) / 1000;
+      expected = now + interval;
+      this.eventLoopLag.observe({}, lag);
+      this.eventLoopLagLast.set({}, lag);
+    }, interval);
+    if (this.loopTimer.unref) this.loopTimer.unref();
+  }
+
+  stop() {
+    clearInterval(this.loopTimer);
+    this.loopTimer = null;
+  }
+
+  // SQL 문을 메트릭 라벨로 쓸 수 있게 정리 (공백 정리, 가변 길이 값 목록/IN 목록을 하나로, 길이 제한)
+  normalizeSql(sql) {
+    const cached = this.normalizedSql.get(sql);
+    if (cached) return cached;
+
+    const normalized = String(sql)
+      .replace(/\s+/g, ' ')
+      .trim()
+      .replace(/\(\s*\?(?:\s*,\s*\?)*\s*\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))*/g, '(?...)')
+      .substring(0, 160);
+
+    if (this.normalizedSql.size >= MAX_SERIES) {
+      this.normalizedSql.clear();
+    }
+    this.normalizedSql.set(sql, normalized);
+    return normalized;
+  }
+
+  render() {
+    for (const collector of this.collectors) {
+      try {
+        collector();
+      } catch (error) {
+        console.error('메트릭 수집 실패:', error);
+      }
+    }
+
+    const blocks = [];
+    for (const metric of this.metrics.values()) {
+      blocks.push(metric.render());
+    }
+    return blocks.join('\n') + '\n';
+  }
+}
+
+const metrics = new MetricsRegistry();
+
+module.exports = metrics;
@@ -0,0 +1,42 @@
+// 비동기 작업용 상호 배제 잠금 (요청 순서대로 획득)
+class Mutex {
+  constructor() {
+    this.locked = false;
+    this.waiters = [];
+  }
+
+  get waiting() {
+    return this.waiters.length;
+  }
+
+  // 잠금 획득 후 해제 함수 반환
+  acquire() {
+    if (!this.locked) {
+      this.locked = true;
+      return Promise.resolve(() => this.release());
+    }
+    return new Promise(resolve => {
+      this.waiters.push(() => resolve(() => this.release()));
+    });
+  }
+
+  release() {
+    const next = this.waiters.shift();
+    if (next) {
+      next();
+    } else {
+      this.locked = false;
+    }
+  }
+
+  async runExclusive(callback) {
+    const release = await this.acquire();
+    try {
+      return await callback();
+    } finally {
+      release();
+    }
+  }
+}
+
+module.exports = Mutex;
@@ -12,6 +12,7 @@ import useToast from './hooks/useToast';
 import useServiceWorker from './hooks/useServiceWorker';
 import useKeyboardNavigation from './hooks/useKeyboardNavigation';
 import useRealtimeSync from './hooks/useRealtimeSync';
+import { mergeById } from './utils/mergeChanges';
 import ErrorBoundary from './components/ErrorBoundary';
 import config from './config/environment';
 import performanceMonitor from './utils/performance';
@@ -33,13 +34,6 @@ function App() {
     cacheInfo, 
     applyUpdate
   } = useServiceWorker();
-  // 실시간 동기화 Hook
-  const { syncError, initializeSync } = useRealtimeSync(API_BASE, {
-    syncInterval: 5000,
-    enableAutoSync: true,
-    enableHeartbeat: true,
-    heartbeatInterval: 10000
-  });
   
   // 데이터 상태
   const [clients, setClients] = useState([]);
@@ -47,6 +41,21 @@ function App() {
   const [presets, setPresets] = useState([]);
   const [executions, setExecutions] = useState([]);
 
+  // 실시간 동기화 Hook (변경된 항목만 id 기준으로 반영)
+  const applyChanges = useCallback(({ clients, groups, presets }) => {
+    setClients(prev => mergeById(prev, clients.changed, clients.deleted));
+    setGroups(prev => mergeById(prev, groups.changed, groups.deleted));
+    setPresets(prev => mergeById(prev, presets.changed, presets.deleted));
+  }, []);
+  const { syncError, initializeSync } = useRealtimeSync(API_BASE, {
+    syncInterval: 5000,
+    enableAutoSync: true,
+    enableHeartbeat: true,
+    heartbeatInterval: 10000,
+    onChanges: applyChanges,
+    onReset: () => loadData()
+  });
+
   // 통계 계산을 useMemo로 최적화
   const stats = useMemo(() => {
     const onlineClients = clients.filter(c => c.status === 'online' || c.status === 'running').length;
@@ -72,22 +81,25 @@ function App() {
   // 데이터 로드 함수들을 useCallback으로 최적화
   const loadData = useCallback(async () => {
     try {
-      const [clientsRes, groupsRes, presetsRes, executionsRes] = await Promise.all([
-        fetch(`${API_BASE}/api/clients`),
-        fetch(`${API_BASE}/api/groups`),
-        fetch(`${API_BASE}/api/presets`),
-        fetch(`${API_BASE}/api/executions`)
-      ]);
-
-      if (clientsRes.ok) setClients(await clientsRes.json());
-      if (groupsRes.ok) setGroups(await groupsRes.json());
-      if (presetsRes.ok) setPresets(await presetsRes.json());
-      if (executionsRes.ok) setExecutions(await executionsRes.json());
+      // 서버가 변경 로그 번호 기준으로 만들어 둔 전체 상태 문서 (변경이 없으면 브라우저 캐시에서 304로 재사용)
+      const response = await fetch(`${API_BASE}/api/snapshot`);
+      if (!response.ok) {
+        throw new Error(`스냅샷 조회 실패 (${response.status})`);
+      }
+      const snapshot = await response.json();
+
+      setClients(snapshot.clients);
+      setGroups(snapshot.groups);
+      setPresets(snapshot.presets);
+      setExecutions(snapshot.executions);
+
+      // 스냅샷 이후의 변경은 cursor부터 증분 동기화
+      initializeSync(snapshot.cursor);
     } catch (error) {
       console.error('데이터 로드 오류:', error);
       showToast('데이터를 불러오는데 실패했습니다.', 'error');
     }
-  }, [showToast]);
+  }, [showToast, initializeSync]);
 
   // 키보드 단축키 정의
   const keyboardShortcuts = {
@@ -195,13 +207,6 @@ function App() {
     }
   }, [isApiConnected, loadData]);
 
-  // 실시간 동기화 초기화
-  useEffect(() => {
-    if (isApiConnected) {
-      initializeSync(new Date().toISOString());
-    }
-  }, [isApiConnected, initializeSync]);
-
   // 동기화 오류 처리
   useEffect(() => {
     if (syncError) {
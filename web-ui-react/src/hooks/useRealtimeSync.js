@@ -13,10 +13,15 @@ const useRealtimeSync = (apiBase, options = {}) => {
   const [syncError, setSyncError] = useState(null);
   const syncTimeoutRef = useRef(null);
   const heartbeatTimeoutRef = useRef(null);
+  // 서버 변경 로그 위치 (마지막으로 반영한 seq)
+  const cursorRef = useRef(null);
+  // 콜백은 렌더링마다 바뀔 수 있으므로 ref로 최신 값을 참조
+  const handlersRef = useRef({});
+  handlersRef.current = { onChanges: options.onChanges, onReset: options.onReset };
 
-  // 변경사항만 가져오는 함수
+  // 변경사항만 가져오는 함수 (cursor 이후 변경분, 남은 변경이 있으면 이어서 요청)
   const syncChanges = useCallback(async () => {
-    if (!lastUpdateTime) {
+    if (cursorRef.current === null) {
       // 첫 로드인 경우 전체 데이터 로드
       return { type: 'full', timestamp: new Date().toISOString() };
     }
@@ -25,22 +30,45 @@ const useRealtimeSync = (apiBase, options = {}) => {
       setIsSyncing(true);
       setSyncError(null);
       
-      const response = await fetch(
-        `${apiBase}/api/changes?since=${encodeURIComponent(lastUpdateTime)}`
-      );
-      
-      if (response.ok) {
-        const { changed, deleted, timestamp } = await response.json();
+      let changeCount = 0;
+      let data = null;
+      do {
+        const response = await fetch(
+          `${apiBase}/api/changes?cursor=${cursorRef.current}`
+        );
+        if (!response.ok) {
+          throw new Error(`변경사항 조회 실패 (${response.status})`);
+        }
+        data = await response.json();
         
-        if (changed.length > 0 || deleted.length > 0) {
-          console.log(`✅ ${changed.length}개 변경, ${deleted.length}개 삭제됨`);
-          setLastUpdateTime(timestamp);
-          return { type: 'partial', changed, deleted, timestamp };
+        if (data.reset) {
+          // 서버 변경 로그와 어긋남 (DB 초기화 등) - 전체 다시 로드
+          console.log('🔄 변경 로그가 초기화되어 전체 데이터를 다시 불러옵니다.');
+          cursorRef.current = null;
+          if (handlersRef.current.onReset) {
+            await handlersRef.current.onReset();
+          }
+          return { type: 'reset', timestamp: data.timestamp };
         }
         
-        setLastUpdateTime(timestamp);
-        return { type: 'no-changes', timestamp };
+        const { clients, groups, presets } = data;
+        const count = [clients, groups, presets].reduce(
+          (sum, entity) => sum + entity.changed.length + entity.deleted.length, 0
+        );
+        if (count > 0 && handlersRef.current.onChanges) {
+          handlersRef.current.onChanges(data);
+        }
+        changeCount += count;
+        cursorRef.current = data.cursor;
+      } while (data.hasMore);
+      
+      setLastUpdateTime(data.timestamp);
+      
+      if (changeCount > 0) {
+        console.log(`✅ ${changeCount}개 항목 변경됨`);
+        return { type: 'partial', cursor: data.cursor, timestamp: data.timestamp };
       }
+      return { type: 'no-changes', timestamp: data.timestamp };
     } catch (error) {
       console.error('동기화 오류:', error);
       setSyncError(error.message);
@@ -48,7 +76,7 @@ const useRealtimeSync = (apiBase, options = {}) => {
     } finally {
       setIsSyncing(false);
     }
-  }, [apiBase, lastUpdateTime]);
+  }, [apiBase]);
 
   // 하트비트 전송
   const sendHeartbeat = useCallback(async () => {
@@ -111,9 +139,10 @@ const useRealtimeSync = (apiBase, options = {}) => {
     return await syncChanges();
   }, [syncChanges]);
 
-  // 초기 타임스탬프 설정
-  const initializeSync = useCallback((timestamp) => {
-    setLastUpdateTime(timestamp);
+  // 동기화 시작 위치 설정 (전체 목록을 받기 전에 조회한 cursor)
+  const initializeSync = useCallback((cursor) => {
+    cursorRef.current = cursor;
+    setLastUpdateTime(new Date().toISOString());
   }, []);
 
   return {
@@ -19,9 +19,24 @@ const useSocket = (url) => {
     newSocket.on('connect', () => {
       setIsConnected(true);
       setReconnectAttempt(0);
+      // 웹 UI 이벤트 구독 (서버는 UI 이벤트를 web 방에만 보냄)
+      newSocket.emit('web_subscribe');
       console.log('✅ Socket.io 연결됨');
     });
 
+    // 묶음 이벤트를 개별 이벤트 리스너로 다시 전달
+    newSocket.on('state_batch', ({ events = [] } = {}) => {
+      for (const { event, data } of events) {
+        for (const handler of newSocket.listeners(event)) {
+          try {
+            handler(data);
+          } catch (error) {
+            console.error(`❌ ${event} 처리 중 오류:`, error);
+          }
+        }
+      }
+    });
+
     // 연결 끊김 이벤트
     newSocket.on('disconnect', (reason) => {
       setIsConnected(false);
@@ -0,0 +1,25 @@
+import { mergeById } from '../mergeChanges';
+
+describe('mergeById', () => {
+  const list = [
+    { id: 1, name: 'A' },
+    { id: 2, name: 'B' },
+    { id: 3, name: 'C' }
+  ];
+
+  test('returns the same array when nothing changed', () => {
+    expect(mergeById(list, [], [])).toBe(list);
+  });
+
+  test('replaces changed items in place and appends new ones', () => {
+    const merged = mergeById(list, [{ id: 2, name: 'B2' }, { id: 4, name: 'D' }], []);
+
+    expect(merged.map(item => item.name)).toEqual(['A', 'B2', 'C', 'D']);
+  });
+
+  test('removes deleted items', () => {
+    const merged = mergeById(list, [], [1, 3]);
+
+    expect(merged).toEqual([{ id: 2, name: 'B' }]);
+  });
+});
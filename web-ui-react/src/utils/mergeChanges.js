@@ -0,0 +1,33 @@
+// /api/changes 응답을 기존 목록에 id 기준으로 반영
+// - changed: 같은 id가 있으면 교체, 없으면 뒤에 추가
+// - deleted: 해당 id 제거
+// 바뀐 것이 없으면 기존 배열을 그대로 반환해 불필요한 리렌더링을 막는다.
+export const mergeById = (list, changed = [], deleted = []) => {
+  if (changed.length === 0 && deleted.length === 0) {
+    return list;
+  }
+
+  const deletedIds = new Set(deleted);
+  const changedById = new Map(changed.map(item => [item.id, item]));
+
+  const merged = [];
+  for (const item of list) {
+    if (deletedIds.has(item.id)) continue;
+    if (changedById.has(item.id)) {
+      merged.push(changedById.get(item.id));
+      changedById.delete(item.id);
+    } else {
+      merged.push(item);
+    }
+  }
+
+  for (const item of changedById.values()) {
+    if (!deletedIds.has(item.id)) {
+      merged.push(item);
+    }
+  }
+
+  return merged;
+};
+
+export default mergeById;